@@ -10,16 +10,166 @@ import json
 import sqlite3
 import hashlib
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import logging
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+# SQLite 3.45+ stores metadata as binary JSONB; json() reads both JSONB and legacy text rows
+_JSONB_SUPPORTED = sqlite3.sqlite_version_info >= (3, 45, 0)
+_METADATA_IN = "jsonb(?)" if _JSONB_SUPPORTED else "?"
+_METADATA_OUT = "json(metadata)" if _JSONB_SUPPORTED else "metadata"
+
+# Hot-path statements, hoisted so each call reuses the connection's prepared-statement cache
+_SQL_GET_MEMORIES = f"""
+    SELECT identifier, concept_summary, content_hash, file_path, file_mtime,
+           memory_timestamp, session_id, validated_at, is_stale, conflict_count, {_METADATA_OUT},
+           memory_timestamp_ns, file_mtime_ns
+    FROM content_memories
+    WHERE identifier = ?
+    ORDER BY memory_timestamp_ns DESC
+"""
+_MEMORY_COLUMNS = (
+    'identifier', 'concept_summary', 'content_hash', 'file_path', 'file_mtime', 'memory_timestamp',
+    'session_id', 'validated_at', 'is_stale', 'conflict_count', 'metadata', 'memory_timestamp_ns', 'file_mtime_ns'
+)
+_SQL_MEMORY_COUNTS = "SELECT COUNT(*), COALESCE(SUM(is_stale), 0) FROM content_memories"
+_SQL_CONFLICT_SUMMARY = """
+    SELECT identifier, COUNT(*) AS memory_count,
+           COUNT(DISTINCT concept_summary) AS unique_concepts,
+           json_group_array(DISTINCT concept_summary) AS concepts
+    FROM content_memories
+    GROUP BY identifier
+    HAVING unique_concepts > 1
+"""
+_SQL_INSERT_MEMORY = f"""
+    INSERT INTO content_memories
+    (identifier, concept_summary, content_hash, file_path, file_mtime,
+     memory_timestamp, session_id, validated_at, is_stale, conflict_count,
+     metadata, created_at, updated_at, memory_timestamp_ns, file_mtime_ns)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_METADATA_IN}, ?, ?, ?, ?)
+"""
+_SQL_UPDATE_STALENESS = """
+    UPDATE content_memories
+    SET is_stale = ?, updated_at = ?
+    WHERE identifier = ?
+"""
+_SQL_INVALIDATE_STALE = """
+    UPDATE content_memories
+    SET is_stale = 1, updated_at = ?
+    WHERE identifier = ? AND memory_timestamp_ns < ?
+"""
+# Audit log rows are keyed (identifier, seq); seq counts up per identifier. Writers hold
+# BEGIN IMMEDIATE, so the MAX(seq) + 1 lookup is serialized across connections and processes
+_SQL_CREATE_CONFLICT_LOG = """
+    CREATE TABLE IF NOT EXISTS conflict_log (
+        identifier TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        detection_time TEXT NOT NULL,
+        conflict_type TEXT NOT NULL,
+        competing_count INTEGER NOT NULL,
+        filesystem_exists INTEGER NOT NULL,
+        resolution_action TEXT,
+        severity TEXT NOT NULL,
+        details TEXT,
+        PRIMARY KEY (identifier, seq)
+    ) WITHOUT ROWID
+"""
+_SQL_CREATE_VALIDATION_AUDIT = """
+    CREATE TABLE IF NOT EXISTS validation_audit (
+        identifier TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        validation_time TEXT NOT NULL,
+        memory_timestamp TEXT NOT NULL,
+        file_mtime TEXT,
+        is_stale INTEGER NOT NULL,
+        action_taken TEXT NOT NULL,
+        details TEXT,
+        PRIMARY KEY (identifier, seq)
+    ) WITHOUT ROWID
+"""
+# table -> (DDL, event time column used to order rows copied from a legacy layout)
+_LOG_TABLES = {
+    "conflict_log": (_SQL_CREATE_CONFLICT_LOG, "detection_time"),
+    "validation_audit": (_SQL_CREATE_VALIDATION_AUDIT, "validation_time"),
+}
+_SQL_INSERT_CONFLICT = """
+    INSERT INTO conflict_log
+    (identifier, seq, detection_time, conflict_type, competing_count,
+     filesystem_exists, resolution_action, severity, details)
+    VALUES (?1, (SELECT COALESCE(MAX(seq), 0) + 1 FROM conflict_log WHERE identifier = ?1),
+            ?2, ?3, ?4, ?5, ?6, ?7, ?8)
+"""
+_SQL_INSERT_VALIDATION = """
+    INSERT INTO validation_audit
+    (identifier, seq, validation_time, memory_timestamp, file_mtime,
+     is_stale, action_taken, details)
+    VALUES (?1, (SELECT COALESCE(MAX(seq), 0) + 1 FROM validation_audit WHERE identifier = ?1),
+            ?2, ?3, ?4, ?5, ?6, ?7)
+"""
+_SQL_COUNT_IDENTIFIER = "SELECT COUNT(*) FROM content_memories WHERE identifier = ?"
+_SQL_IDENTIFIER_EXISTS = "SELECT 1 FROM content_memories WHERE identifier = ? LIMIT 1"
+
+
+def _sha256_file(path: str) -> str:
+    """SHA256 hex digest of a file, streamed without materializing its content"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _ns_to_iso(timestamp_ns: int) -> str:
+    """Epoch nanoseconds to a naive local ISO timestamp (display format)"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()
+
+
+def _iso_to_ns(timestamp: str) -> int:
+    """Naive local ISO timestamp to epoch nanoseconds"""
+    return int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+
+
+class _IdentifierBloom:
+    """Fixed-size Bloom filter over identifiers seen by this instance; only a hint, since other writers share the db"""
+
+    def __init__(self, num_bits: int = 2 ** 16, num_hashes: int = 3):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self._bits = bytearray(num_bits // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "little")
+        h2 = int.from_bytes(digest[4:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
 
 
 @dataclass
 class ContentMemory:
     """Content memory entry with validation metadata"""
+    __slots__ = (
+        'identifier', 'concept_summary', 'content_hash', 'file_path', 'file_mtime', 'memory_timestamp',
+        'session_id', 'validated_at', 'is_stale', 'conflict_count', 'metadata',
+        'memory_timestamp_ns', 'file_mtime_ns'
+    )
+
     identifier: str  # e.g., "TICKET-030"
     concept_summary: str  # e.g., "CLOUDSQL03 Optimization"
     content_hash: str  # SHA256 of content for change detection
@@ -31,6 +181,8 @@ class ContentMemory:
     is_stale: bool  # Is memory stale (file newer than memory)
     conflict_count: int  # How many competing memories exist
     metadata: Dict[str, Any]  # Additional context
+    memory_timestamp_ns: int  # memory_timestamp as epoch nanoseconds (used for comparisons)
+    file_mtime_ns: Optional[int]  # file_mtime as epoch nanoseconds
 
 
 @dataclass
@@ -46,26 +198,175 @@ class MemoryConflict:
 class ContentMemoryValidator:
     """Validates content memory against filesystem truth"""
 
+    MEMORY_CACHE_SIZE = 256
+    OPTIMIZE_INTERVAL_SECONDS = 4 * 60 * 60  # re-run PRAGMA optimize at most this often
+    ANALYZE_AFTER_INSERTS = 1000  # one-off ANALYZE once this many rows have been written
+    VALIDATION_FLUSH_SIZE = 128  # buffered validation_audit rows per bulk insert
+    READ_POOL_SIZE = 8  # max reader connections; WAL lets them run alongside the writer
+
     def __init__(self, db_path: str = "content_memory.db"):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+
+        # identifier -> memory rows, invalidated once a write touching the identifier commits.
+        # Each invalidation bumps the identifier's generation so a read that overlapped the
+        # write can tell its rows may predate it and skip caching them.
+        self._mem_cache: "OrderedDict[str, List[tuple]]" = OrderedDict()
+        self._cache_generation: Dict[str, int] = {}
+        # Identifiers written by the open transaction, invalidated after COMMIT
+        self._written: Set[str] = set()
+
+        # Planner statistics upkeep, checked opportunistically after writes
+        self._inserts_since_start = 0
+        self._analyzed = False
+        self._last_optimize = time.monotonic()
+
+        # Pending validation_audit rows, flushed in bulk
+        self._validation_buffer: List[tuple] = []
+
+        # Writes serialize on one long-lived connection; reads borrow pooled connections
+        self._write_lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self.READ_POOL_SIZE)
+        self._read_pool_lock = threading.Lock()
+        self._read_conns_opened = 0
+
+        self.conn = self._open_connection()
         self.init_database()
 
+        # Identifiers known to have rows; a miss is re-checked against the db (see _has_memories)
+        self._id_bloom = _IdentifierBloom()
+        for (identifier,) in self.conn.execute("SELECT DISTINCT identifier FROM content_memories"):
+            self._id_bloom.add(identifier)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a tuned connection; autocommit mode so transactions are explicit"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, cached_statements=64)
+        self._configure_connection(conn)
+        return conn
+
+    @contextmanager
+    def _get_conn(self):
+        """Borrow a reader connection from the pool, opening one lazily up to READ_POOL_SIZE"""
+        if self.db_path == ":memory:":
+            # Every connection to :memory: is a separate database
+            with self._write_lock:
+                yield self.conn
+            return
+
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                can_open = self._read_conns_opened < self.READ_POOL_SIZE
+                if can_open:
+                    self._read_conns_opened += 1
+            conn = self._open_connection() if can_open else self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    @contextmanager
+    def _write_transaction(self):
+        """Yield a cursor inside BEGIN IMMEDIATE ... COMMIT on the writer connection"""
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                self._written.clear()
+                raise
+            # Invalidate only once readers can see the new rows, still under the write lock
+            self._invalidate_cache(self._written)
+            self._written.clear()
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection):
+        """Apply WAL journaling and performance PRAGMAs to a connection"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=30000000000")
+        conn.execute("PRAGMA busy_timeout=5000")
+
+    def optimize(self):
+        """Refresh query planner statistics (no-op when SQLite finds nothing to do)"""
+        try:
+            with self._write_lock:
+                self.conn.execute("PRAGMA optimize")
+        except sqlite3.Error as e:
+            self.logger.warning(f"PRAGMA optimize failed: {e}")
+        self._last_optimize = time.monotonic()
+
+    def _maybe_optimize(self, inserted: int):
+        """Run ANALYZE after the first bulk of inserts and PRAGMA optimize on an interval"""
+        self._inserts_since_start += inserted
+        try:
+            if not self._analyzed and self._inserts_since_start >= self.ANALYZE_AFTER_INSERTS:
+                with self._write_lock:
+                    self.conn.execute("ANALYZE content_memories")
+                self._analyzed = True
+        except sqlite3.Error as e:
+            self.logger.warning(f"ANALYZE failed: {e}")
+        if time.monotonic() - self._last_optimize >= self.OPTIMIZE_INTERVAL_SECONDS:
+            self.optimize()
+
+    def close(self):
+        """Optimize query planner statistics and close all connections"""
+        if self.conn is None:
+            return
+        try:
+            self.flush_validation_log()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to flush validation log: {e}")
+        self.optimize()
+
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self.conn.close()
+        self.conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def init_database(self):
         """Initialize SQLite database for content memory"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # One transaction, so a concurrent opener never sees a half-migrated schema
+        with self._write_transaction() as cursor:
+            self._create_schema(cursor)
+
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create tables and indexes"""
 
         # Content memories table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS content_memories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 identifier TEXT NOT NULL,
                 concept_summary TEXT NOT NULL,
                 content_hash TEXT NOT NULL,
                 file_path TEXT,
                 file_mtime TEXT,
                 memory_timestamp TEXT NOT NULL,
+                memory_timestamp_ns INTEGER,
+                file_mtime_ns INTEGER,
                 session_id TEXT NOT NULL,
                 validated_at TEXT,
                 is_stale INTEGER DEFAULT 0,
@@ -76,49 +377,65 @@ class ContentMemoryValidator:
             )
         """)
 
-        # Conflict detection log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conflict_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                identifier TEXT NOT NULL,
-                detection_time TEXT NOT NULL,
-                conflict_type TEXT NOT NULL,
-                competing_count INTEGER NOT NULL,
-                filesystem_exists INTEGER NOT NULL,
-                resolution_action TEXT,
-                severity TEXT NOT NULL,
-                details TEXT
-            )
-        """)
+        # Conflict detection and validation audit logs (append-only)
+        self._create_log_tables(cursor)
 
-        # Validation audit log
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS validation_audit (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                identifier TEXT NOT NULL,
-                validation_time TEXT NOT NULL,
-                memory_timestamp TEXT NOT NULL,
-                file_mtime TEXT,
-                is_stale INTEGER NOT NULL,
-                action_taken TEXT NOT NULL,
-                details TEXT
-            )
-        """)
+        self._migrate_epoch_columns(cursor)
 
         # Indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_identifier ON content_memories(identifier)")
+        # (identifier, memory_timestamp_ns DESC, ...) serves get_memories without a sort step
+        # and keeps conflict scans index-only; a bare prefix index would only add write cost
+        legacy_indexes = ("idx_identifier", "idx_stale", "idx_ident_ts", "idx_ident_ts_covering", "idx_ident_tsns")
+        for legacy_index in legacy_indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {legacy_index}")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ident_tsns_covering
+            ON content_memories(identifier, memory_timestamp_ns DESC, concept_summary, content_hash, is_stale)
+        """)
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_session ON content_memories(session_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stale ON content_memories(is_stale)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_conflict_identifier ON conflict_log(identifier)")
-
-        conn.commit()
-        conn.close()
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stale_ident ON content_memories(is_stale, identifier)")
+
+    def _create_log_tables(self, cursor: sqlite3.Cursor):
+        """Create the audit log tables, rebuilding ones left by an older layout without seq"""
+        for table, (ddl, time_column) in _LOG_TABLES.items():
+            columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+            legacy = bool(columns) and "seq" not in columns
+            if legacy:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+            cursor.execute(ddl)
+            if legacy:
+                # Rowid-era tables kept insertion order in id; later ones only have the event time
+                copied = ", ".join(column for column in columns if column != "id")
+                order = "id" if "id" in columns else time_column
+                cursor.execute(f"""
+                    INSERT INTO {table} (seq, {copied})
+                    SELECT ROW_NUMBER() OVER (PARTITION BY identifier ORDER BY {order}), {copied}
+                    FROM {table}_legacy
+                """)
+                cursor.execute(f"DROP TABLE {table}_legacy")
+
+    def _migrate_epoch_columns(self, cursor: sqlite3.Cursor):
+        """Add and backfill epoch-ns columns on databases created before they existed"""
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(content_memories)")}
+        for column in ("memory_timestamp_ns", "file_mtime_ns"):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE content_memories ADD COLUMN {column} INTEGER")
+
+        # ISO values are naive local time, so convert in Python rather than with julianday()
+        rows = cursor.execute("""
+            SELECT id, memory_timestamp, file_mtime FROM content_memories WHERE memory_timestamp_ns IS NULL
+        """).fetchall()
+        cursor.executemany(
+            "UPDATE content_memories SET memory_timestamp_ns = ?, file_mtime_ns = ? WHERE id = ?",
+            [(_iso_to_ns(memory_ts), _iso_to_ns(file_mtime) if file_mtime else None, row_id)
+             for row_id, memory_ts, file_mtime in rows]
+        )
 
     def store_memory(
         self,
         identifier: str,
         concept_summary: str,
-        content: str,
+        content: Union[str, bytes],
         file_path: Optional[str] = None,
         session_id: str = "default",
         metadata: Optional[Dict[str, Any]] = None
@@ -126,49 +443,132 @@ class ContentMemoryValidator:
         """Store or update content memory with conflict detection"""
 
         # Check for existing memories
-        existing_memories = self.get_memories(identifier)
+        existing_memories = self.get_memories(identifier) if self._has_memories(identifier) else []
+
+        memory = self._build_memory(
+            identifier, concept_summary, content, file_path, session_id, metadata, len(existing_memories)
+        )
+
+        # Conflict logging, insert and invalidation commit as one transaction
+        with self._write_transaction() as cursor:
+            # Detect conflicts with existing memories
+            if existing_memories:
+                for existing in existing_memories:
+                    if existing.concept_summary != concept_summary:
+                        self.logger.warning(
+                            f"⚠️ CONFLICT DETECTED: {identifier}\n"
+                            f"   Existing: {existing.concept_summary}\n"
+                            f"   New: {concept_summary}"
+                        )
+                        self._log_conflict_tx(cursor, identifier, existing_memories + [memory])
+
+            # Store in database
+            self._save_memory_tx(cursor, memory)
+
+            # Invalidate stale memories for this identifier
+            self._invalidate_stale_memories_tx(cursor, identifier, memory.memory_timestamp_ns)
+
+        self._maybe_optimize(1)
+
+        return memory
+
+    def store_memories(self, items: Iterable[Tuple]) -> List[ContentMemory]:
+        """
+        Bulk-store memories in a single transaction
+
+        Each item is a tuple in store_memory argument order:
+        (identifier, concept_summary, content[, file_path[, session_id[, metadata]]]).
+        Conflicts are not logged per item; they surface on retrieve_memory/health_check.
+        """
+
+        items = list(items)
+        if not items:
+            return []
+
+        # Hash content and stat files before BEGIN so the write lock is held briefly
+        counts: Dict[str, int] = {}
+        memories = []
+        with self._get_conn() as conn:
+            for item in items:
+                identifier = item[0]
+                if identifier not in counts:
+                    counts[identifier] = conn.execute(_SQL_COUNT_IDENTIFIER, (identifier,)).fetchone()[0]
+                memories.append(self._build_memory(*item, conflict_count=counts[identifier]))
+                counts[identifier] += 1
+
+        latest: Dict[str, int] = {}
+        for memory in memories:
+            if memory.memory_timestamp_ns > latest.get(memory.identifier, 0):
+                latest[memory.identifier] = memory.memory_timestamp_ns
 
-        # Calculate content hash
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        with self._write_transaction() as cursor:
+            self._save_memories_tx(cursor, memories)
+            self._invalidate_stale_memories_many_tx(cursor, latest.items())
+
+        self._maybe_optimize(len(memories))
+
+        return memories
+
+    def _has_memories(self, identifier: str) -> bool:
+        """
+        Whether any memory exists for identifier
+
+        A Bloom hit is trusted (a false positive only costs an empty get_memories). A miss
+        falls back to an index-only lookup, because other validators and processes writing
+        the same database never touch this instance's filter.
+        """
+        if identifier in self._id_bloom:
+            return True
+        with self._get_conn() as conn:
+            found = conn.execute(_SQL_IDENTIFIER_EXISTS, (identifier,)).fetchone() is not None
+        if found:
+            self._id_bloom.add(identifier)
+        return found
+
+    def _build_memory(
+        self,
+        identifier: str,
+        concept_summary: str,
+        content: Union[str, bytes],
+        file_path: Optional[str] = None,
+        session_id: str = "default",
+        metadata: Optional[Dict[str, Any]] = None,
+        conflict_count: int = 0
+    ) -> ContentMemory:
+        """Build a new memory entry, hashing content and reading file metadata"""
+
+        # Calculate content hash (bytes are hashed as-is, skipping the encode copy)
+        if isinstance(content, str):
+            content = content.encode()
+        content_hash = hashlib.sha256(content).hexdigest()
 
         # Get file metadata if path provided
         file_mtime = None
+        file_mtime_ns = None
         if file_path and os.path.exists(file_path):
-            file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat()
+            file_mtime_ns = os.stat(file_path).st_mtime_ns
+            file_mtime = _ns_to_iso(file_mtime_ns)
 
-        memory = ContentMemory(
+        # One clock read per memory; stored, validated and created times all derive from it
+        memory_timestamp_ns = time.time_ns()
+        memory_timestamp = _ns_to_iso(memory_timestamp_ns)
+
+        return ContentMemory(
             identifier=identifier,
             concept_summary=concept_summary,
             content_hash=content_hash,
             file_path=file_path,
             file_mtime=file_mtime,
-            memory_timestamp=datetime.now().isoformat(),
+            memory_timestamp=memory_timestamp,
             session_id=session_id,
-            validated_at=datetime.now().isoformat(),
+            validated_at=memory_timestamp,
             is_stale=False,
-            conflict_count=len(existing_memories),
-            metadata=metadata or {}
+            conflict_count=conflict_count,
+            metadata=metadata or {},
+            memory_timestamp_ns=memory_timestamp_ns,
+            file_mtime_ns=file_mtime_ns
         )
 
-        # Detect conflicts with existing memories
-        if existing_memories:
-            for existing in existing_memories:
-                if existing.concept_summary != concept_summary:
-                    self.logger.warning(
-                        f"⚠️ CONFLICT DETECTED: {identifier}\n"
-                        f"   Existing: {existing.concept_summary}\n"
-                        f"   New: {concept_summary}"
-                    )
-                    self._log_conflict(identifier, existing_memories + [memory])
-
-        # Store in database
-        self._save_memory(memory)
-
-        # Invalidate stale memories for this identifier
-        self._invalidate_stale_memories(identifier, memory.memory_timestamp)
-
-        return memory
-
     def retrieve_memory(
         self,
         identifier: str,
@@ -182,21 +582,22 @@ class ContentMemoryValidator:
         - conflict: Detected conflict if any
         """
 
-        memories = self.get_memories(identifier)
+        soa = self.get_memories_soa(identifier)
+        timestamps = soa['memory_timestamp_ns']
 
-        if not memories:
+        if not timestamps:
             return None, None
 
         # Check for conflicts (multiple competing memories)
         conflict = None
-        if len(memories) > 1:
-            different_concepts = len(set(m.concept_summary for m in memories)) > 1
+        if len(timestamps) > 1:
+            different_concepts = len(set(soa['concept_summary'])) > 1
             if different_concepts:
-                conflict = self._detect_conflict(identifier, memories)
+                conflict = self._detect_conflict(identifier, self.get_memories(identifier))
 
-        # Get most recent memory
-        memories.sort(key=lambda m: m.memory_timestamp, reverse=True)
-        memory = memories[0]
+        # Get most recent memory, building only that one object
+        latest = max(range(len(timestamps)), key=timestamps.__getitem__)
+        memory = self._memory_from_row(tuple(soa[column][latest] for column in _MEMORY_COLUMNS))
 
         # Validate against filesystem if requested
         if validate_filesystem and memory.file_path:
@@ -226,13 +627,15 @@ class ContentMemoryValidator:
             return memory, None
 
         # Get current file modification time
-        current_mtime = datetime.fromtimestamp(os.path.getmtime(memory.file_path)).isoformat()
+        current_mtime_ns = os.stat(memory.file_path).st_mtime_ns
 
-        # Compare file mtime with memory timestamp
-        memory_time = datetime.fromisoformat(memory.memory_timestamp)
-        file_time = datetime.fromisoformat(current_mtime)
+        # Unchanged since the memory was stored - skip reading and hashing
+        if current_mtime_ns == memory.file_mtime_ns:
+            return memory, None
 
-        if file_time > memory_time:
+        # Compare file mtime with memory timestamp
+        if current_mtime_ns > memory.memory_timestamp_ns:
+            current_mtime = _ns_to_iso(current_mtime_ns)
             # File is newer than memory = STALE MEMORY
             self.logger.warning(
                 f"🔴 STALE MEMORY DETECTED: {memory.identifier}\n"
@@ -243,28 +646,27 @@ class ContentMemoryValidator:
 
             memory.is_stale = True
             memory.file_mtime = current_mtime
+            memory.file_mtime_ns = current_mtime_ns
             self._update_memory_staleness(memory.identifier, True)
 
             # Read current file content for conflict detection
             try:
-                with open(memory.file_path, 'r', encoding='utf-8') as f:
-                    current_content = f.read()
-                    current_hash = hashlib.sha256(current_content.encode()).hexdigest()
-
-                    if current_hash != memory.content_hash:
-                        # Content has changed - create conflict
-                        conflict = MemoryConflict(
-                            identifier=memory.identifier,
-                            competing_memories=[memory],
-                            filesystem_state={
-                                'path': memory.file_path,
-                                'mtime': current_mtime,
-                                'content_hash': current_hash
-                            },
-                            recommended_action="UPDATE_MEMORY_FROM_FILESYSTEM",
-                            severity="critical"
-                        )
-                        return memory, conflict
+                current_hash = _sha256_file(memory.file_path)
+
+                if current_hash != memory.content_hash:
+                    # Content has changed - create conflict
+                    conflict = MemoryConflict(
+                        identifier=memory.identifier,
+                        competing_memories=[memory],
+                        filesystem_state={
+                            'path': memory.file_path,
+                            'mtime': current_mtime,
+                            'content_hash': current_hash
+                        },
+                        recommended_action="UPDATE_MEMORY_FROM_FILESYSTEM",
+                        severity="critical"
+                    )
+                    return memory, conflict
             except Exception as e:
                 self.logger.error(f"Error reading file {memory.file_path}: {e}")
 
@@ -283,13 +685,11 @@ class ContentMemoryValidator:
 
         if file_path and os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    filesystem_state = {
-                        'path': file_path,
-                        'mtime': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
-                        'content_hash': hashlib.sha256(content.encode()).hexdigest()
-                    }
+                filesystem_state = {
+                    'path': file_path,
+                    'mtime': datetime.fromtimestamp(os.path.getmtime(file_path)).isoformat(),
+                    'content_hash': _sha256_file(file_path)
+                }
             except Exception as e:
                 self.logger.error(f"Error reading file {file_path}: {e}")
 
@@ -320,77 +720,98 @@ class ContentMemoryValidator:
 
         return conflict
 
-    def get_memories(self, identifier: str) -> List[ContentMemory]:
-        """Get all memories for an identifier"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_memories(self, identifier: str, cache: bool = True) -> List[ContentMemory]:
+        """
+        Get all memories for an identifier, newest first
 
-        cursor.execute("""
-            SELECT identifier, concept_summary, content_hash, file_path, file_mtime,
-                   memory_timestamp, session_id, validated_at, is_stale, conflict_count, metadata
-            FROM content_memories
-            WHERE identifier = ?
-            ORDER BY memory_timestamp DESC
-        """, (identifier,))
+        Rows are served from an LRU cache invalidated on write; pass
+        cache=False to force a database read.
+        """
+        return [self._memory_from_row(row) for row in self._fetch_rows(identifier, cache)]
 
-        memories = []
-        for row in cursor.fetchall():
-            metadata = json.loads(row[10]) if row[10] else {}
-            memory = ContentMemory(
-                identifier=row[0],
-                concept_summary=row[1],
-                content_hash=row[2],
-                file_path=row[3],
-                file_mtime=row[4],
-                memory_timestamp=row[5],
-                session_id=row[6],
-                validated_at=row[7],
-                is_stale=bool(row[8]),
-                conflict_count=row[9],
-                metadata=metadata
-            )
-            memories.append(memory)
+    def get_memories_soa(self, identifier: str, cache: bool = True) -> Dict[str, List[Any]]:
+        """
+        Get all memories for an identifier as parallel column lists, newest first
 
-        conn.close()
-        return memories
+        Column-wise access avoids building ContentMemory objects for aggregate
+        checks. Values are raw database values (is_stale as int, metadata as JSON text).
+        """
+        rows = self._fetch_rows(identifier, cache)
+        if not rows:
+            return {column: [] for column in _MEMORY_COLUMNS}
+        return {column: list(values) for column, values in zip(_MEMORY_COLUMNS, zip(*rows))}
+
+    def _fetch_rows(self, identifier: str, cache: bool = True) -> List[tuple]:
+        """Memory rows for an identifier, via the LRU row cache"""
+        with self._cache_lock:
+            if cache:
+                cached = self._mem_cache.get(identifier)
+                if cached is not None:
+                    self._mem_cache.move_to_end(identifier)
+                    return cached
+            generation = self._cache_generation.get(identifier, 0)
+
+        with self._get_conn() as conn:
+            rows = conn.execute(_SQL_GET_MEMORIES, (identifier,)).fetchall()
+
+        with self._cache_lock:
+            # A write committed since the read began; these rows may predate it
+            if self._cache_generation.get(identifier, 0) != generation:
+                return rows
+            self._mem_cache[identifier] = rows
+            self._mem_cache.move_to_end(identifier)
+            if len(self._mem_cache) > self.MEMORY_CACHE_SIZE:
+                self._mem_cache.popitem(last=False)
+
+        return rows
+
+    def _memory_from_row(self, row: tuple) -> ContentMemory:
+        """Build a ContentMemory from a _SQL_GET_MEMORIES row"""
+        return ContentMemory(
+            identifier=row[0],
+            concept_summary=row[1],
+            content_hash=row[2],
+            file_path=row[3],
+            file_mtime=row[4],
+            memory_timestamp=row[5],
+            session_id=row[6],
+            validated_at=row[7],
+            is_stale=bool(row[8]),
+            conflict_count=row[9],
+            metadata=json.loads(row[10]) if row[10] else {},
+            memory_timestamp_ns=row[11],
+            file_mtime_ns=row[12]
+        )
+
+    def _invalidate_cache(self, identifiers: Iterable[str]):
+        """Drop cached memories for identifiers after a committed write"""
+        with self._cache_lock:
+            for identifier in identifiers:
+                self._cache_generation[identifier] = self._cache_generation.get(identifier, 0) + 1
+                self._mem_cache.pop(identifier, None)
 
     def health_check(self) -> Dict[str, Any]:
         """Perform memory health check"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
 
-        # Count total memories
-        cursor.execute("SELECT COUNT(*) FROM content_memories")
-        total_memories = cursor.fetchone()[0]
+            # Count total and stale memories in one round trip
+            cursor.execute(_SQL_MEMORY_COUNTS)
+            total_memories, stale_count = cursor.fetchone()
 
-        # Count stale memories
-        cursor.execute("SELECT COUNT(*) FROM content_memories WHERE is_stale = 1")
-        stale_count = cursor.fetchone()[0]
+            # Find identifiers with competing concepts in a single aggregate pass
+            cursor.execute(_SQL_CONFLICT_SUMMARY)
 
-        # Find identifiers with multiple memories
-        cursor.execute("""
-            SELECT identifier, COUNT(*) as count
-            FROM content_memories
-            GROUP BY identifier
-            HAVING COUNT(*) > 1
-        """)
-        multi_memory_identifiers = cursor.fetchall()
-
-        # Get conflicts
-        conflicts = []
-        for identifier, count in multi_memory_identifiers:
-            memories = self.get_memories(identifier)
-            unique_concepts = len(set(m.concept_summary for m in memories))
-            if unique_concepts > 1:
+            # Get conflicts, streaming rows from the cursor
+            conflicts = []
+            for identifier, count, unique_concepts, concepts in cursor:
                 conflicts.append({
                     'identifier': identifier,
                     'memory_count': count,
                     'unique_concepts': unique_concepts,
-                    'concepts': list(set(m.concept_summary for m in memories))
+                    'concepts': json.loads(concepts)
                 })
 
-        conn.close()
-
         return {
             'total_memories': total_memories,
             'stale_memories': stale_count,
@@ -411,61 +832,69 @@ class ContentMemoryValidator:
 
     def _save_memory(self, memory: ContentMemory):
         """Save memory to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        metadata_json = json.dumps(memory.metadata)
-
-        cursor.execute("""
-            INSERT INTO content_memories
-            (identifier, concept_summary, content_hash, file_path, file_mtime,
-             memory_timestamp, session_id, validated_at, is_stale, conflict_count,
-             metadata, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            memory.identifier, memory.concept_summary, memory.content_hash,
-            memory.file_path, memory.file_mtime, memory.memory_timestamp,
-            memory.session_id, memory.validated_at, int(memory.is_stale),
-            memory.conflict_count, metadata_json,
-            datetime.now().isoformat(), datetime.now().isoformat()
-        ))
-
-        conn.commit()
-        conn.close()
+        with self._write_transaction() as cursor:
+            self._save_memory_tx(cursor, memory)
+
+    def _save_memory_tx(self, cursor: sqlite3.Cursor, memory: ContentMemory):
+        """Insert memory using the caller's cursor/transaction"""
+        self._save_memories_tx(cursor, [memory])
+
+    def _save_memories_tx(self, cursor: sqlite3.Cursor, memories: List[ContentMemory]):
+        """Insert memories with executemany using the caller's cursor/transaction"""
+        for memory in memories:
+            self._written.add(memory.identifier)
+            self._id_bloom.add(memory.identifier)
+
+        cursor.executemany(_SQL_INSERT_MEMORY, [
+            (
+                memory.identifier, memory.concept_summary, memory.content_hash,
+                memory.file_path, memory.file_mtime, memory.memory_timestamp,
+                memory.session_id, memory.validated_at, int(memory.is_stale),
+                memory.conflict_count, json.dumps(memory.metadata),
+                memory.memory_timestamp, memory.memory_timestamp,
+                memory.memory_timestamp_ns, memory.file_mtime_ns
+            )
+            for memory in memories
+        ])
 
     def _update_memory_staleness(self, identifier: str, is_stale: bool):
         """Update staleness flag for all memories of identifier"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            UPDATE content_memories
-            SET is_stale = ?, updated_at = ?
-            WHERE identifier = ?
-        """, (int(is_stale), datetime.now().isoformat(), identifier))
+        with self._write_transaction() as cursor:
+            self._written.add(identifier)
+            cursor.execute(_SQL_UPDATE_STALENESS, (int(is_stale), datetime.now().isoformat(), identifier))
 
-        conn.commit()
-        conn.close()
-
-    def _invalidate_stale_memories(self, identifier: str, current_timestamp: str):
+    def _invalidate_stale_memories(self, identifier: str, current_timestamp_ns: int):
         """Mark older memories as stale when new memory is stored"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_transaction() as cursor:
+            self._invalidate_stale_memories_tx(cursor, identifier, current_timestamp_ns)
 
-        cursor.execute("""
-            UPDATE content_memories
-            SET is_stale = 1, updated_at = ?
-            WHERE identifier = ? AND memory_timestamp < ?
-        """, (datetime.now().isoformat(), identifier, current_timestamp))
+    def _invalidate_stale_memories_tx(self, cursor: sqlite3.Cursor, identifier: str, current_timestamp_ns: int):
+        """Mark older memories as stale using the caller's cursor/transaction"""
+        self._invalidate_stale_memories_many_tx(cursor, [(identifier, current_timestamp_ns)])
 
-        conn.commit()
-        conn.close()
+    def _invalidate_stale_memories_many_tx(self, cursor: sqlite3.Cursor, pairs: Iterable[Tuple[str, int]]):
+        """Mark older memories as stale for each (identifier, current_timestamp_ns) pair"""
+        pairs = list(pairs)
+        self._written.update(identifier for identifier, _ in pairs)
+
+        updated_at = datetime.now().isoformat()
+        cursor.executemany(
+            _SQL_INVALIDATE_STALE, [(updated_at, identifier, timestamp_ns) for identifier, timestamp_ns in pairs]
+        )
 
     def _log_conflict(self, identifier: str, memories: List[ContentMemory], conflict: Optional[MemoryConflict] = None):
         """Log conflict to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_transaction() as cursor:
+            self._log_conflict_tx(cursor, identifier, memories, conflict)
 
+    def _log_conflict_tx(
+        self,
+        cursor: sqlite3.Cursor,
+        identifier: str,
+        memories: List[ContentMemory],
+        conflict: Optional[MemoryConflict] = None
+    ):
+        """Log conflict using the caller's cursor/transaction"""
         filesystem_exists = any(
             m.file_path and os.path.exists(m.file_path) for m in memories
         )
@@ -476,12 +905,7 @@ class ContentMemoryValidator:
             'timestamps': [m.memory_timestamp for m in memories]
         }
 
-        cursor.execute("""
-            INSERT INTO conflict_log
-            (identifier, detection_time, conflict_type, competing_count,
-             filesystem_exists, resolution_action, severity, details)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        cursor.execute(_SQL_INSERT_CONFLICT, (
             identifier,
             datetime.now().isoformat(),
             "MULTIPLE_CONCEPTS",
@@ -492,22 +916,11 @@ class ContentMemoryValidator:
             json.dumps(details)
         ))
 
-        conn.commit()
-        conn.close()
-
     def _log_validation(self, memory: ContentMemory):
-        """Log validation event"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
+        """Buffer a validation event; reads only write once the buffer fills"""
         action_taken = "VALIDATED" if not memory.is_stale else "MARKED_STALE"
 
-        cursor.execute("""
-            INSERT INTO validation_audit
-            (identifier, validation_time, memory_timestamp, file_mtime,
-             is_stale, action_taken, details)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+        row = (
             memory.identifier,
             datetime.now().isoformat(),
             memory.memory_timestamp,
@@ -515,10 +928,21 @@ class ContentMemoryValidator:
             int(memory.is_stale),
             action_taken,
             json.dumps({'concept': memory.concept_summary})
-        ))
+        )
 
-        conn.commit()
-        conn.close()
+        with self._write_lock:
+            self._validation_buffer.append(row)
+            if len(self._validation_buffer) >= self.VALIDATION_FLUSH_SIZE:
+                self.flush_validation_log()
+
+    def flush_validation_log(self):
+        """Write buffered validation events in one transaction"""
+        if not self._validation_buffer:
+            return
+
+        with self._write_transaction() as cursor:
+            rows, self._validation_buffer = self._validation_buffer, []
+            cursor.executemany(_SQL_INSERT_VALIDATION, rows)
 
 
 def test_content_memory_validator():
@@ -595,6 +1019,8 @@ def test_content_memory_validator():
             for concept in conf['concepts']:
                 print(f"     * {concept}")
 
+    validator.close()
+
     print("\n✅ Test complete!")
     print("🔒 Bug fix validated: System detects triple collision and warns user")
 
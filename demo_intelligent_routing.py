@@ -10,8 +10,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from routing import IntelligentRouter
-from utils.analytics import ZenAnalytics
+# Routing/analytics imports live inside each demo so importing this module stays cheap
 
 
 def demo_basic_routing():
@@ -20,6 +19,8 @@ def demo_basic_routing():
     print("DEMO 1: Basic Routing (No Analytics)")
     print("=" * 70)
     
+    from routing import IntelligentRouter
+
     router = IntelligentRouter()
     
     queries = [
@@ -56,60 +57,64 @@ def demo_routing_with_analytics():
     print("DEMO 2: Routing with Analytics")
     print("=" * 70)
     
+    from routing import IntelligentRouter
+    from utils.analytics import ZenAnalytics
+
     # Initialize analytics
     analytics = ZenAnalytics()
-    
-    # Add some historical data
-    print("\n📊 Adding historical data...")
-    
-    # Simulate successful code review executions
-    for _ in range(5):
-        analytics.log_tool_execution(
-            tool_name="codereview",
-            model="gpt-5",
-            tokens_used=2000,
-            execution_time_ms=3000,
-            success=True
+    try:
+        # Add some historical data
+        print("\n📊 Adding historical data...")
+
+        # Simulate successful code review executions
+        for _ in range(5):
+            analytics.log_tool_execution(
+                tool_name="codereview",
+                model="gpt-5",
+                tokens_used=2000,
+                execution_time_ms=3000,
+                success=True
+            )
+
+        # Log routing decisions
+        analytics.log_routing_decision(
+            user_intent="Review code for issues",
+            chosen_tool="codereview",
+            chosen_strategy="SOLO",
+            detected_complexity=5,
+            detected_risk=4,
+            outcome="success"
         )
-    
-    # Log routing decisions
-    analytics.log_routing_decision(
-        user_intent="Review code for issues",
-        chosen_tool="codereview",
-        chosen_strategy="SOLO",
-        detected_complexity=5,
-        detected_risk=4,
-        outcome="success"
-    )
-    
-    print("   ✅ Historical data added")
-    
-    # Create router with analytics
-    router = IntelligentRouter(analytics=analytics)
-    
-    # Test routing with historical data
-    query = "Review my code for potential bugs"
-    print(f"\n{'─' * 70}")
-    print(f"Query: {query}")
-    print(f"{'─' * 70}")
-    
-    decision = router.route_request(query)
-    
-    print(f"🎯 Recommended Tool: {decision.tool}")
-    print(f"📋 Strategy: {decision.strategy.value}")
-    print(f"📊 Complexity: {decision.complexity}/10")
-    print(f"⚠️  Risk: {decision.risk}/10")
-    print(f"🎲 Confidence: {decision.confidence:.0%}")
-    print(f"💡 Reasoning: {decision.reasoning}")
-    
-    # Show analytics summary
-    print(f"\n📈 Analytics Summary:")
-    summary = analytics.get_summary_stats(days=7)
-    print(f"   Total executions: {summary['total_executions']}")
-    print(f"   Success rate: {summary['success_rate']:.1%}")
-    print(f"   Most used tool: {summary['most_used_tool']}")
-    
-    analytics.close()
+
+        print("   ✅ Historical data added")
+
+        # Create router with analytics
+        router = IntelligentRouter(analytics=analytics)
+
+        # Test routing with historical data
+        query = "Review my code for potential bugs"
+        print(f"\n{'─' * 70}")
+        print(f"Query: {query}")
+        print(f"{'─' * 70}")
+
+        decision = router.route_request(query)
+
+        print(f"🎯 Recommended Tool: {decision.tool}")
+        print(f"📋 Strategy: {decision.strategy.value}")
+        print(f"📊 Complexity: {decision.complexity}/10")
+        print(f"⚠️  Risk: {decision.risk}/10")
+        print(f"🎲 Confidence: {decision.confidence:.0%}")
+        print(f"💡 Reasoning: {decision.reasoning}")
+
+        # Show analytics summary
+        print(f"\n📈 Analytics Summary:")
+        summary = analytics.get_summary_stats(days=7)
+        print(f"   Total executions: {summary['total_executions']}")
+        print(f"   Success rate: {summary['success_rate']:.1%}")
+        print(f"   Most used tool: {summary['most_used_tool']}")
+
+    finally:
+        analytics.close()
 
 
 def demo_routing_suggestions():
@@ -118,6 +123,8 @@ def demo_routing_suggestions():
     print("DEMO 3: Routing Suggestions")
     print("=" * 70)
     
+    from routing import IntelligentRouter
+
     router = IntelligentRouter()
     
     queries = [
@@ -141,6 +148,8 @@ def demo_context_and_files():
     print("DEMO 4: Routing with Context and Files")
     print("=" * 70)
     
+    from routing import IntelligentRouter
+
     router = IntelligentRouter()
     
     # Test with files
@@ -175,6 +184,8 @@ def demo_manual_overrides():
     print("DEMO 5: Manual Overrides")
     print("=" * 70)
     
+    from routing import IntelligentRouter
+
     router = IntelligentRouter()
     
     query = "What is Python?"
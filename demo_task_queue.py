@@ -4,16 +4,49 @@ Demo script for Task Queue in Zen MCP Server.
 Shows how to use the persistent task queue for multi-window coordination.
 """
 
+import os
 import sys
 import time
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
 
+from demo_utils import buffered_output
 from utils.task_queue import TaskQueue, TaskStatus, TaskType
 
 
+# ZEN_DEMO_FAST=1 skips the cosmetic pauses, e.g. when the demo runs as a CI smoke test
+_FAST = os.environ.get("ZEN_DEMO_FAST") == "1"
+
+
+def _pause(seconds):
+    """Sleep for a visible demo pause unless fast mode is on"""
+    if not _FAST:
+        time.sleep(seconds)
+
+
+# Static usage snippet printed at the end of the demo
+_USAGE_EXAMPLE = """
+📚 Usage Example:
+   
+   from utils.task_queue import TaskQueue, TaskType
+   
+   with TaskQueue() as queue:
+       # Enqueue task
+       task_id = queue.enqueue(
+           task_type=TaskType.CHAT.value,
+           data={'prompt': 'Your question'},
+           priority=7
+       )
+       
+       # Dequeue task
+       tasks = queue.dequeue(limit=1)
+       
+       # Process and complete
+       queue.claim_task(task_id, 'window-1')
+       queue.update_task_status(task_id, 'completed')
+
+"""
+
+
+@buffered_output
 def demo_basic_queue_operations():
     """Demo basic queue operations"""
     print("\n" + "=" * 70)
@@ -23,26 +56,26 @@ def demo_basic_queue_operations():
     with TaskQueue() as queue:
         print("\n📝 Enqueueing tasks...")
         
-        # Enqueue various tasks
-        task1 = queue.enqueue(
-            task_type=TaskType.CHAT.value,
-            data={"prompt": "Explain Python decorators", "model": "gpt-5"},
-            priority=5
-        )
+        # Enqueue various tasks in one transaction
+        queue.enqueue_many([
+            {
+                "task_type": TaskType.CHAT.value,
+                "data": {"prompt": "Explain Python decorators", "model": "gpt-5"},
+                "priority": 5,
+            },
+            {
+                "task_type": TaskType.DEBUG.value,
+                "data": {"issue": "Memory leak in server", "severity": "high"},
+                "priority": 8,
+            },
+            {
+                "task_type": TaskType.CODEREVIEW.value,
+                "data": {"files": ["auth.py", "api.py"], "focus": "security"},
+                "priority": 10,
+            },
+        ])
         print(f"   ✅ Task 1: Chat (priority 5)")
-        
-        task2 = queue.enqueue(
-            task_type=TaskType.DEBUG.value,
-            data={"issue": "Memory leak in server", "severity": "high"},
-            priority=8
-        )
         print(f"   ✅ Task 2: Debug (priority 8)")
-        
-        task3 = queue.enqueue(
-            task_type=TaskType.CODEREVIEW.value,
-            data={"files": ["auth.py", "api.py"], "focus": "security"},
-            priority=10
-        )
         print(f"   ✅ Task 3: Code Review (priority 10)")
         
         print("\n📥 Dequeueing tasks (priority order)...")
@@ -57,10 +90,10 @@ def demo_basic_queue_operations():
             print(f"   - Data: {task.data}")
         
         # Clean up
-        for task in tasks:
-            queue.cancel_task(task.id)
+        queue.cancel_many([task.id for task in tasks])
 
 
+@buffered_output
 def demo_multi_window_coordination():
     """Demo multi-window coordination"""
     print("\n" + "=" * 70)
@@ -110,8 +143,7 @@ def demo_multi_window_coordination():
         print("\n💡 Key insight: Unassigned tasks visible to all windows!")
         
         # Clean up
-        for task_id in [task1, task2, task3]:
-            queue.cancel_task(task_id)
+        queue.cancel_many([task1, task2, task3])
 
 
 def demo_task_lifecycle():
@@ -147,9 +179,11 @@ def demo_task_lifecycle():
             print(f"   Assigned to: {task.assigned_to}")
         
         print("\n3️⃣  Simulating work...")
-        time.sleep(1)
+        sys.stdout.flush()
+        _pause(1)
         print(f"   ... analyzing performance ...")
-        time.sleep(1)
+        sys.stdout.flush()
+        _pause(1)
         print(f"   ... found bottleneck ...")
         
         print("\n4️⃣  Completing task...")
@@ -177,21 +211,19 @@ def demo_task_persistence():
     print("=" * 70)
     
     # Create tasks
-    task_ids = []
     print("\n1️⃣  Creating tasks...")
     
     with TaskQueue() as queue:
-        for i in range(3):
-            task_id = queue.enqueue(
-                task_type=TaskType.CHAT.value,
-                data={"task_number": i + 1},
-                priority=5 + i
-            )
-            task_ids.append(task_id)
+        task_ids = queue.enqueue_many([
+            {"task_type": TaskType.CHAT.value, "data": {"task_number": i + 1}, "priority": 5 + i}
+            for i in range(3)
+        ])
+        for i in range(len(task_ids)):
             print(f"   ✅ Task {i+1} created")
     
     print(f"\n   🔄 Closing queue (simulating server restart)...")
-    time.sleep(1)
+    sys.stdout.flush()
+    _pause(1)
     
     # Reopen and verify
     print(f"\n2️⃣  Reopening queue (after restart)...")
@@ -212,10 +244,10 @@ def demo_task_persistence():
         print(f"\n💡 All tasks survived the restart!")
         
         # Clean up
-        for task_id in task_ids:
-            queue.cancel_task(task_id)
+        queue.cancel_many(task_ids)
 
 
+@buffered_output
 def demo_priority_and_stats():
     """Demo priority queuing and statistics"""
     print("\n" + "=" * 70)
@@ -233,14 +265,11 @@ def demo_priority_and_stats():
             (TaskType.THINKDEEP.value, 9, "Urgent investigation"),
         ]
         
-        task_ids = []
+        task_ids = queue.enqueue_many([
+            {"task_type": task_type, "data": {"description": description}, "priority": priority}
+            for task_type, priority, description in priorities
+        ])
         for task_type, priority, description in priorities:
-            task_id = queue.enqueue(
-                task_type=task_type,
-                data={"description": description},
-                priority=priority
-            )
-            task_ids.append(task_id)
             print(f"   - {task_type} (priority {priority}): {description}")
         
         print("\n📊 Task Statistics:")
@@ -262,10 +291,10 @@ def demo_priority_and_stats():
         print("\n💡 Higher priority tasks dequeued first!")
         
         # Clean up
-        for task_id in task_ids:
-            queue.cancel_task(task_id)
+        queue.cancel_many(task_ids)
 
 
+@buffered_output
 def demo_practical_workflow():
     """Demo a practical multi-step workflow"""
     print("\n" + "=" * 70)
@@ -284,16 +313,16 @@ def demo_practical_workflow():
             (TaskType.CHAT.value, 7, "Step 5: Generate deployment docs", "window-2"),
         ]
         
-        task_ids = []
-        for task_type, priority, description, assigned_to in workflow_tasks:
-            task_id = queue.enqueue(
-                task_type=task_type,
-                data={"workflow_step": description},
-                assigned_to=assigned_to,
-                priority=priority
-            )
-            task_ids.append(task_id)
-            
+        task_ids = queue.enqueue_many([
+            {
+                "task_type": task_type,
+                "data": {"workflow_step": description},
+                "assigned_to": assigned_to,
+                "priority": priority,
+            }
+            for task_type, priority, description, assigned_to in workflow_tasks
+        ])
+        for _, _, description, assigned_to in workflow_tasks:
             assignment = f"→ {assigned_to}" if assigned_to else "→ any window"
             print(f"   ✅ {description} {assignment}")
         
@@ -309,15 +338,14 @@ def demo_practical_workflow():
             print(f"   - {task.data['workflow_step']}")
         
         print("\n   Shared tasks (any window can take):")
-        shared_tasks = [t for t in queue.get_pending_tasks() if not t.assigned_to]
+        shared_tasks = queue.get_pending_tasks(unassigned_only=True)
         for task in shared_tasks:
             print(f"   - {task.data['workflow_step']}")
         
         print("\n💡 Tasks can be distributed across multiple windows for parallel work!")
         
         # Clean up
-        for task_id in task_ids:
-            queue.cancel_task(task_id)
+        queue.cancel_many(task_ids)
 
 
 def main():
@@ -347,25 +375,7 @@ def main():
         print("   ✅ Atomic task claiming")
         print("   ✅ Statistics and monitoring")
         
-        print("\n📚 Usage Example:")
-        print("   ")
-        print("   from utils.task_queue import TaskQueue, TaskType")
-        print("   ")
-        print("   with TaskQueue() as queue:")
-        print("       # Enqueue task")
-        print("       task_id = queue.enqueue(")
-        print("           task_type=TaskType.CHAT.value,")
-        print("           data={'prompt': 'Your question'},")
-        print("           priority=7")
-        print("       )")
-        print("       ")
-        print("       # Dequeue task")
-        print("       tasks = queue.dequeue(limit=1)")
-        print("       ")
-        print("       # Process and complete")
-        print("       queue.claim_task(task_id, 'window-1')")
-        print("       queue.update_task_status(task_id, 'completed')")
-        print("")
+        sys.stdout.write(_USAGE_EXAMPLE)
         
         return 0
         
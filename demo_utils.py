@@ -0,0 +1,24 @@
+"""
+Shared helpers for the demo scripts.
+"""
+
+import contextlib
+import functools
+import io
+import sys
+
+
+def buffered_output(func):
+    """Collect a demo's prints and emit them with a single stdout write"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+
+    return wrapper
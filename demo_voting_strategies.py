@@ -4,184 +4,249 @@ Demo script for Voting Strategies in Consensus Tool.
 Shows how different voting strategies produce different outcomes.
 """
 
+import functools
 import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+import types
 
+from demo_utils import buffered_output
 from utils.voting_strategies import ConsensusVoter, VotingStrategy
 
+# Model verdicts for the demo scenarios, built once at import
+_SCENARIO_1_VERDICT_GPT5 = (
+    "Strong recommendation to upgrade. Python 3.12 offers significant performance "
+    "improvements (10-60% faster), better error messages, and enhanced type hints. "
+    "The migration path is straightforward with comprehensive documentation. "
+    "Risks are minimal as we're already on 3.11."
+)
+_SCENARIO_1_VERDICT_CLAUDE = (
+    "I recommend proceeding with the upgrade. The benefits include improved "
+    "performance and new language features. Migration should be straightforward."
+)
+_SCENARIO_1_VERDICT_GEMINI = (
+    "Approve this upgrade. Python 3.12 is production-ready and widely adopted. "
+    "The performance gains alone justify the upgrade effort."
+)
+_SCENARIO_2_VERDICT_GPT5 = (
+    "I advise against a full rewrite at this time. First, the current Python API "
+    "is stable and well-tested. Second, team expertise is primarily in Python. "
+    "Third, a rewrite would take 6-9 months with high risk of introducing bugs. "
+    "Fourth, the performance gains (2-3x) don't justify the cost and risk. "
+    "Instead, I recommend: 1) Profile and optimize hot paths in Python, "
+    "2) Consider Rust for specific performance-critical microservices, "
+    "3) Gradually introduce Rust where it provides clear value. "
+    "Evidence: Similar projects that did full rewrites experienced 40% schedule "
+    "overruns and 3-6 month feature freezes."
+)
+_SCENARIO_2_VERDICT_GEMINI = (
+    "The performance benefits of Rust make this worthwhile. We should proceed."
+)
+_SCENARIO_2_VERDICT_CLAUDE = (
+    "A full rewrite is too risky. The Python API works well and is maintainable. "
+    "Consider incremental improvements instead."
+)
+_SCENARIO_2_VERDICT_O3_PRO = "Rust is faster. Do it."
+_SCENARIO_3_VERDICT_GPT5 = (
+    "I strongly recommend implementing two-factor authentication (2FA) for your application. "
+    "Here's a comprehensive analysis of why this is crucial:\n\n"
+    "**Security Benefits:**\n"
+    "1. Reduces account takeover risk by 99.9% according to Microsoft research\n"
+    "2. Protects against password breaches and credential stuffing attacks\n"
+    "3. Adds defense-in-depth layer following security best practices\n"
+    "4. Meets compliance requirements for SOC 2, ISO 27001, and GDPR\n\n"
+    "**Implementation Considerations:**\n"
+    "- Use TOTP (Time-based One-Time Passwords) as primary method\n"
+    "- Offer SMS as backup (despite known vulnerabilities)\n"
+    "- Provide recovery codes for account access\n"
+    "- Consider hardware tokens for high-privilege accounts\n\n"
+    "**User Experience:**\n"
+    "- Initial friction offset by long-term security benefits\n"
+    "- Remember-me options for trusted devices\n"
+    "- Clear onboarding flow reduces support tickets\n\n"
+    "**Cost Analysis:**\n"
+    "Implementation: $5,000-10,000\n"
+    "Maintenance: $500/month\n"
+    "ROI: Prevention of single breach ($50,000+ average) justifies investment\n\n"
+    "This is a high-priority security enhancement with proven effectiveness."
+)
+_SCENARIO_3_VERDICT_CLAUDE = (
+    "Implement 2FA immediately. It's a security requirement that prevents 99.9% of "
+    "automated attacks. Use TOTP with SMS backup. Low cost, high value."
+)
+_SCENARIO_3_VERDICT_GEMINI = (
+    "Yes, enable 2FA. Critical security feature, industry standard, easy to implement."
+)
+_SCENARIO_4_VERDICT_GPT5 = (
+    "Kubernetes provides excellent scalability and is industry standard for "
+    "container orchestration. I recommend proceeding with migration."
+)
+_SCENARIO_4_VERDICT_CLAUDE = (
+    "The current infrastructure is stable. Kubernetes adds significant complexity. "
+    "Consider whether the benefits justify the operational overhead."
+)
+
+# Closing strategy guide printed after the scenarios
+_SUMMARY = """
+======================================================================
+SUMMARY: Choosing the Right Voting Strategy
+======================================================================
+
+📋 Strategy Guide:
+
+1. DEMOCRATIC VOTING (one model, one vote)
+   ✓ Use when: All models are equally trusted
+   ✓ Use when: Simple majority is desired
+   ✓ Pros: Simple, transparent, fair
+   ✓ Cons: Ignores reasoning quality
+
+2. QUALITY-WEIGHTED VOTING (weighted by reasoning quality)
+   ✓ Use when: Reasoning depth matters more than vote count
+   ✓ Use when: Some models provide better analysis
+   ✓ Pros: Rewards thorough, evidence-based arguments
+   ✓ Cons: Quality assessment is heuristic-based
+
+3. TOKEN-OPTIMIZED VOTING (quality per token)
+   ✓ Use when: Token costs are a concern
+   ✓ Use when: Conciseness is valued
+   ✓ Pros: Rewards efficient, high-quality responses
+   ✓ Cons: May undervalue comprehensive analysis
+
+💡 General Recommendations:
+   • Use democratic for straightforward decisions
+   • Use quality-weighted for complex technical decisions
+   • Use token-optimized when managing API costs
+   • Compare all three when the decision is critical
+
+🎯 Integration:
+   These voting strategies can be used independently or
+   integrated into the consensus tool workflow to automatically
+   synthesize final decisions from multi-model consultations.
+
+======================================================================
+✅ Demo Complete!
+======================================================================
+"""
+
+
+def _freeze_scenario(scenario):
+    """Read-only view of a scenario, so the cached copy can be shared by every caller"""
+    responses = tuple(types.MappingProxyType(response) for response in scenario["responses"])
+    return types.MappingProxyType({**scenario, "responses": responses})
 
+
+@functools.cache
 def create_scenario_1():
     """Scenario 1: Clear consensus across all models"""
-    return {
+    return _freeze_scenario({
         "title": "Clear Consensus - All Models Agree",
         "question": "Should we upgrade to Python 3.12?",
         "responses": [
             {
                 "model": "gpt-5",
                 "stance": "for",
-                "verdict": (
-                    "Strong recommendation to upgrade. Python 3.12 offers significant performance "
-                    "improvements (10-60% faster), better error messages, and enhanced type hints. "
-                    "The migration path is straightforward with comprehensive documentation. "
-                    "Risks are minimal as we're already on 3.11."
-                ),
+                "verdict": _SCENARIO_1_VERDICT_GPT5,
                 "tokens_used": 100,
             },
             {
                 "model": "claude-3.5-sonnet",
                 "stance": "for",
-                "verdict": (
-                    "I recommend proceeding with the upgrade. The benefits include improved "
-                    "performance and new language features. Migration should be straightforward."
-                ),
+                "verdict": _SCENARIO_1_VERDICT_CLAUDE,
                 "tokens_used": 60,
             },
             {
                 "model": "gemini-2.5-pro",
                 "stance": "for",
-                "verdict": (
-                    "Approve this upgrade. Python 3.12 is production-ready and widely adopted. "
-                    "The performance gains alone justify the upgrade effort."
-                ),
+                "verdict": _SCENARIO_1_VERDICT_GEMINI,
                 "tokens_used": 50,
             },
         ]
-    }
+    })
 
 
+@functools.cache
 def create_scenario_2():
     """Scenario 2: Split decision with quality difference"""
-    return {
+    return _freeze_scenario({
         "title": "Split Decision - Quality Matters",
         "question": "Should we rewrite our API in Rust?",
         "responses": [
             {
                 "model": "gpt-5",
                 "stance": "against",
-                "verdict": (
-                    "I advise against a full rewrite at this time. First, the current Python API "
-                    "is stable and well-tested. Second, team expertise is primarily in Python. "
-                    "Third, a rewrite would take 6-9 months with high risk of introducing bugs. "
-                    "Fourth, the performance gains (2-3x) don't justify the cost and risk. "
-                    "Instead, I recommend: 1) Profile and optimize hot paths in Python, "
-                    "2) Consider Rust for specific performance-critical microservices, "
-                    "3) Gradually introduce Rust where it provides clear value. "
-                    "Evidence: Similar projects that did full rewrites experienced 40% schedule "
-                    "overruns and 3-6 month feature freezes."
-                ),
+                "verdict": _SCENARIO_2_VERDICT_GPT5,
                 "tokens_used": 200,
             },
             {
                 "model": "gemini-2.5-pro",
                 "stance": "for",
-                "verdict": (
-                    "The performance benefits of Rust make this worthwhile. We should proceed."
-                ),
+                "verdict": _SCENARIO_2_VERDICT_GEMINI,
                 "tokens_used": 30,
             },
             {
                 "model": "claude-3.5-sonnet",
                 "stance": "against",
-                "verdict": (
-                    "A full rewrite is too risky. The Python API works well and is maintainable. "
-                    "Consider incremental improvements instead."
-                ),
+                "verdict": _SCENARIO_2_VERDICT_CLAUDE,
                 "tokens_used": 50,
             },
             {
                 "model": "o3-pro",
                 "stance": "for",
-                "verdict": "Rust is faster. Do it.",
+                "verdict": _SCENARIO_2_VERDICT_O3_PRO,
                 "tokens_used": 15,
             },
         ]
-    }
+    })
 
 
+@functools.cache
 def create_scenario_3():
     """Scenario 3: Token optimization matters"""
-    return {
+    return _freeze_scenario({
         "title": "Token Efficiency - Conciseness Wins",
         "question": "Should we enable two-factor authentication?",
         "responses": [
             {
                 "model": "gpt-5",
                 "stance": "for",
-                "verdict": (
-                    "I strongly recommend implementing two-factor authentication (2FA) for your application. "
-                    "Here's a comprehensive analysis of why this is crucial:\n\n"
-                    "**Security Benefits:**\n"
-                    "1. Reduces account takeover risk by 99.9% according to Microsoft research\n"
-                    "2. Protects against password breaches and credential stuffing attacks\n"
-                    "3. Adds defense-in-depth layer following security best practices\n"
-                    "4. Meets compliance requirements for SOC 2, ISO 27001, and GDPR\n\n"
-                    "**Implementation Considerations:**\n"
-                    "- Use TOTP (Time-based One-Time Passwords) as primary method\n"
-                    "- Offer SMS as backup (despite known vulnerabilities)\n"
-                    "- Provide recovery codes for account access\n"
-                    "- Consider hardware tokens for high-privilege accounts\n\n"
-                    "**User Experience:**\n"
-                    "- Initial friction offset by long-term security benefits\n"
-                    "- Remember-me options for trusted devices\n"
-                    "- Clear onboarding flow reduces support tickets\n\n"
-                    "**Cost Analysis:**\n"
-                    "Implementation: $5,000-10,000\n"
-                    "Maintenance: $500/month\n"
-                    "ROI: Prevention of single breach ($50,000+ average) justifies investment\n\n"
-                    "This is a high-priority security enhancement with proven effectiveness."
-                ),
+                "verdict": _SCENARIO_3_VERDICT_GPT5,
                 "tokens_used": 350,
             },
             {
                 "model": "claude-3.5-sonnet",
                 "stance": "for",
-                "verdict": (
-                    "Implement 2FA immediately. It's a security requirement that prevents 99.9% of "
-                    "automated attacks. Use TOTP with SMS backup. Low cost, high value."
-                ),
+                "verdict": _SCENARIO_3_VERDICT_CLAUDE,
                 "tokens_used": 60,
             },
             {
                 "model": "gemini-2.5-pro",
                 "stance": "for",
-                "verdict": (
-                    "Yes, enable 2FA. Critical security feature, industry standard, easy to implement."
-                ),
+                "verdict": _SCENARIO_3_VERDICT_GEMINI,
                 "tokens_used": 30,
             },
         ]
-    }
+    })
 
 
+@functools.cache
 def create_scenario_4():
     """Scenario 4: Tie-breaking scenario"""
-    return {
+    return _freeze_scenario({
         "title": "Tie Situation - Default to Conditional",
         "question": "Should we migrate to Kubernetes now?",
         "responses": [
             {
                 "model": "gpt-5",
                 "stance": "for",
-                "verdict": (
-                    "Kubernetes provides excellent scalability and is industry standard for "
-                    "container orchestration. I recommend proceeding with migration."
-                ),
+                "verdict": _SCENARIO_4_VERDICT_GPT5,
                 "tokens_used": 80,
             },
             {
                 "model": "claude-3.5-sonnet",
                 "stance": "against",
-                "verdict": (
-                    "The current infrastructure is stable. Kubernetes adds significant complexity. "
-                    "Consider whether the benefits justify the operational overhead."
-                ),
+                "verdict": _SCENARIO_4_VERDICT_CLAUDE,
                 "tokens_used": 70,
             },
         ]
-    }
+    })
 
 
 def print_header(text):
@@ -197,8 +262,9 @@ def print_subheader(text):
     print("-" * 70)
 
 
-def run_scenario(scenario_data):
-    """Run a voting scenario and display results"""
+@buffered_output
+def run_scenario(scenario_data, results):
+    """Run a voting scenario and display results precomputed by compare_strategies_batch"""
     print_header(f"SCENARIO: {scenario_data['title']}")
     print(f"\nQuestion: {scenario_data['question']}")
     print(f"Models consulted: {len(scenario_data['responses'])}")
@@ -211,10 +277,6 @@ def run_scenario(scenario_data):
         print(f"   {verdict_preview}")
         print(f"   Tokens: {response['tokens_used']}")
     
-    # Compare voting strategies
-    voter = ConsensusVoter()
-    results = voter.compare_strategies(scenario_data['responses'])
-    
     print_subheader("Voting Results Comparison")
     
     print(f"\n{'Strategy':<25} {'Decision':<15} {'Confidence':<12} {'Key Insight'}")
@@ -237,14 +299,15 @@ def run_scenario(scenario_data):
     # Check for agreement
     print_subheader("Analysis")
     
-    decisions = set(r.winning_decision for r in results.values())
-    confidences = {name: r.confidence for name, r in results.items()}
+    first = next(iter(results.values())).winning_decision
+    all_same = all(r.winning_decision == first for r in results.values())
     
-    if len(decisions) == 1:
-        decision = decisions.pop()
-        print(f"\n✅ All strategies agree: {decision}")
+    if all_same:
+        print(f"\n✅ All strategies agree: {first}")
         print(f"   This indicates strong consensus regardless of weighting method.")
     else:
+        decisions = {r.winning_decision for r in results.values()}
+        confidences = {name: r.confidence for name, r in results.items()}
         print(f"\n📊 Strategies produce different results: {decisions}")
         print(f"   This highlights how voting method affects outcomes!")
         
@@ -292,53 +355,18 @@ def main():
         create_scenario_4(),
     ]
     
-    for i, scenario in enumerate(scenarios, 1):
-        run_scenario(scenario)
+    # Score every scenario's responses up front in one batch
+    all_results = ConsensusVoter().compare_strategies_batch([scenario['responses'] for scenario in scenarios])
+    
+    for i, (scenario, results) in enumerate(zip(scenarios, all_results), 1):
+        run_scenario(scenario, results)
         
-        if i < len(scenarios):
+        # Only pause for a human; piped or CI runs would block or hit EOF
+        if i < len(scenarios) and sys.stdin.isatty():
             input("\n\nPress Enter to continue to next scenario...")
     
     # Final summary
-    print_header("SUMMARY: Choosing the Right Voting Strategy")
-    
-    print("\n📋 Strategy Guide:\n")
-    
-    print("1. DEMOCRATIC VOTING (one model, one vote)")
-    print("   ✓ Use when: All models are equally trusted")
-    print("   ✓ Use when: Simple majority is desired")
-    print("   ✓ Pros: Simple, transparent, fair")
-    print("   ✓ Cons: Ignores reasoning quality")
-    print()
-    
-    print("2. QUALITY-WEIGHTED VOTING (weighted by reasoning quality)")
-    print("   ✓ Use when: Reasoning depth matters more than vote count")
-    print("   ✓ Use when: Some models provide better analysis")
-    print("   ✓ Pros: Rewards thorough, evidence-based arguments")
-    print("   ✓ Cons: Quality assessment is heuristic-based")
-    print()
-    
-    print("3. TOKEN-OPTIMIZED VOTING (quality per token)")
-    print("   ✓ Use when: Token costs are a concern")
-    print("   ✓ Use when: Conciseness is valued")
-    print("   ✓ Pros: Rewards efficient, high-quality responses")
-    print("   ✓ Cons: May undervalue comprehensive analysis")
-    print()
-    
-    print("💡 General Recommendations:")
-    print("   • Use democratic for straightforward decisions")
-    print("   • Use quality-weighted for complex technical decisions")
-    print("   • Use token-optimized when managing API costs")
-    print("   • Compare all three when the decision is critical")
-    print()
-    
-    print("🎯 Integration:")
-    print("   These voting strategies can be used independently or")
-    print("   integrated into the consensus tool workflow to automatically")
-    print("   synthesize final decisions from multi-model consultations.")
-    
-    print("\n" + "=" * 70)
-    print("✅ Demo Complete!")
-    print("=" * 70)
+    sys.stdout.write(_SUMMARY)
     
     return 0
 
@@ -1,29 +1,43 @@
 """
 HTTP Bridge for Zen-MCP Server
 Provides REST API access to zen-mcp tools for external applications like voice-QC
+
+Response token counts use tiktoken when it is installed (requirements.txt, or
+pip install "zen-mcp-server[tokens]"); otherwise they are approximate estimates.
 """
 
 import asyncio
+import functools
+import hashlib
+import inspect
+import json
 import logging
 import os
-import sys
-from pathlib import Path
-from typing import Any, Dict, Optional
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import uvicorn
 
-# Add zen-mcp to path
-sys.path.insert(0, str(Path(__file__).parent))
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
 
 from routing.intelligent_router import IntelligentRouter
 from utils.analytics import ZenAnalytics
+from utils.http_client import close_async_client
+from utils.token_utils import estimate_tokens
 from tools import ChatTool, ThinkDeepTool, DebugIssueTool, CLinkTool, ConsensusTool, PlannerTool
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Setup logging (LOG_LEVEL, as in server.py; hot-path messages are only formatted when emitted)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI
@@ -42,11 +56,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Access log records queued by RequestLogMiddleware and written in batches by
+# _request_log_writer(); both are created in startup()
+_request_log: Optional[asyncio.Queue] = None
+_request_log_task: Optional[asyncio.Task] = None
+_REQUEST_LOG_FLUSH_SECONDS = 0.1
+_REQUEST_LOG_MAX_BATCH = 1000
+access_logger = logging.getLogger(f"{__name__}.access")
+
+
+class RequestLogMiddleware:
+    """Queue (method, path, status, duration_ms) per request instead of logging inline"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _request_log is None:
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            try:
+                _request_log.put_nowait((scope["method"], scope["path"], status, _elapsed_ms(started)))
+            except asyncio.QueueFull:
+                pass  # Dropping access records beats stalling requests behind the log writer
+
+
+app.add_middleware(RequestLogMiddleware)
+
 # Global instances
 router: Optional[IntelligentRouter] = None
 analytics: Optional[ZenAnalytics] = None
 
-# Tool registry for HTTP bridge
+# Threads for tools whose execute() is synchronous, so they don't block the event loop
+_TOOL_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("TOOL_POOL", "16")), thread_name_prefix="bridge-tool")
+
+# Tool registry for HTTP bridge (classes; instantiated once in startup())
 TOOLS = {
     "chat": ChatTool,
     "thinkdeep": ThinkDeepTool,
@@ -56,42 +113,314 @@ TOOLS = {
     "planner": PlannerTool,
 }
 
+# Accepted tool_override values, derived from TOOLS so the two cannot drift apart
+ToolName = Enum("ToolName", {name.upper(): name for name in TOOLS}, type=str)
+
+# Tool name -> shared instance, reused by every request
+tool_instances: Dict[str, Any] = {}
+
+# Serialized ToolsResponse for /tools, built once in startup()
+_tools_json = b'{"tools":[]}'
+
+# Serialized HealthResponse and its ETag, rebuilt by _refresh_health() when availability changes
+_health_json = b""
+_health_etag = ""
+
+# Tool name -> cap on concurrent executions (LIMIT_<TOOL>, default 8); requests
+# waiting longer than TOOL_QUEUE_TIMEOUT seconds for a slot get a 429
+tool_semaphores: Dict[str, asyncio.Semaphore] = {}
+_TOOL_QUEUE_TIMEOUT = float(os.getenv("TOOL_QUEUE_TIMEOUT", "30"))
+
+# Last get_tool_performance() result as (monotonic time, stats), reused for ROUTER_STATS_TTL seconds.
+# The refresh lock is created in startup() so it belongs to the serving loop (Python 3.9 binds
+# asyncio primitives to the loop current at construction)
+_stats_cache: Optional[Tuple[float, list]] = None
+_STATS_TTL = float(os.getenv("ROUTER_STATS_TTL", "30"))
+_stats_lock: Optional[asyncio.Lock] = None
+
+# Responses shorter than this use the character heuristic; encoding them isn't worth the hop
+_TOKENIZE_MIN_CHARS = 128
+
+# Distinct client-supplied model names whose tiktoken encoding is remembered
+_ENCODER_CACHE_SIZE = 64
+
+# Recent /chat responses keyed by request digest, least recently used first
+_CHAT_CACHE: "OrderedDict[bytes, Tuple[float, ChatResponse]]" = OrderedDict()
+_CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "1024"))
+_CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "300"))
+
+# Request digest -> future resolved by the request currently executing it
+_CHAT_INFLIGHT: Dict[bytes, asyncio.Future] = {}
+
+
+class ToolContext(BaseModel):
+    """Tool settings and routing hints carried in ChatRequest.context"""
+    # Only declared fields reach the tools; anything else is dropped
+    model_config = ConfigDict(extra="ignore")
+
+    # Common tool arguments
+    temperature: Optional[float] = Field(None, ge=0.0, le=1.0, description="Response temperature")
+    thinking_mode: Optional[str] = Field(None, description="Thinking depth (minimal, low, medium, high, max)")
+    continuation_id: Optional[str] = Field(None, description="Thread ID to continue a previous conversation")
+    working_directory: Optional[str] = Field(None, description="Directory where tools may save generated code")
+    images: Optional[list[str]] = Field(None, description="Image paths or data URLs")
+
+    # Workflow step arguments (thinkdeep, debug, consensus, planner); each tool validates its own
+    step: Optional[str] = Field(None, description="Current work step content")
+    step_number: Optional[int] = Field(None, ge=1, description="Current step number (starts at 1)")
+    total_steps: Optional[int] = Field(None, ge=1, description="Estimated total steps")
+    next_step_required: Optional[bool] = Field(None, description="Whether another step follows")
+    findings: Optional[str] = Field(None, description="Findings from this step")
+    files_checked: Optional[list[str]] = Field(None, description="Files examined so far")
+    relevant_files: Optional[list[str]] = Field(None, description="Files relevant to the task")
+    relevant_context: Optional[list[str]] = Field(None, description="Relevant methods or functions")
+    issues_found: Optional[list[dict]] = Field(None, description="Issues identified so far")
+    confidence: Optional[str] = Field(None, description="Confidence in the findings")
+    hypothesis: Optional[str] = Field(None, description="Current hypothesis")
+    backtrack_from_step: Optional[int] = Field(None, ge=1, description="Step to restart from")
+    use_assistant_model: Optional[bool] = Field(None, description="Whether to call the expert model")
+    problem_context: Optional[str] = Field(None, description="Additional problem context (thinkdeep)")
+    focus_areas: Optional[list[str]] = Field(None, description="Areas to focus on (thinkdeep)")
+    models: Optional[list[dict]] = Field(None, description="Models to consult (consensus)")
+    current_model_index: Optional[int] = Field(None, description="Index of the next model to consult (consensus)")
+    model_responses: Optional[list[dict]] = Field(None, description="Responses gathered so far (consensus)")
+    is_step_revision: Optional[bool] = Field(None, description="Step revises an earlier one (planner)")
+    revises_step_number: Optional[int] = Field(None, description="Step being revised (planner)")
+    is_branch_point: Optional[bool] = Field(None, description="Step starts a branch (planner)")
+    branch_from_step: Optional[int] = Field(None, description="Step the branch starts from (planner)")
+    branch_id: Optional[str] = Field(None, description="Branch identifier (planner)")
+    more_steps_needed: Optional[bool] = Field(None, description="More steps are needed (planner)")
+
+    # Routing hints read by IntelligentRouter; never forwarded to tools
+    environment: Optional[str] = Field(None, description="Target environment (production, staging, ...)")
+    multi_step: Optional[bool] = Field(None, description="Task spans multiple steps")
+    dependencies: Optional[Any] = Field(None, description="Dependencies the task touches")
+
+
+# ToolContext fields only the router reads
+_ROUTING_HINTS = frozenset({"environment", "multi_step", "dependencies"})
+
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint"""
+    # Build the validator at import and drop unknown fields instead of rejecting the request
+    model_config = ConfigDict(extra="ignore", defer_build=False)
+
     transcript: str = Field(..., description="User transcript from voice input")
-    context: Dict[str, Any] = Field(default_factory=dict, description="Additional context")
+    context: ToolContext = Field(default_factory=ToolContext, description="Tool settings and routing hints")
     auto_route: bool = Field(default=True, description="Use intelligent routing")
-    tool_override: Optional[str] = Field(None, description="Force specific tool (chat, thinkdeep, debug, etc.)")
+    tool_override: Optional[ToolName] = Field(None, description="Force specific tool (chat, thinkdeep, debug, etc.)")
     model: Optional[str] = Field(None, description="Specific model to use")
     files: list[str] = Field(default_factory=list, description="File paths for context")
     
     # CLI Agent Selection (for clink)
     use_cli_agent: bool = Field(default=False, description="Route to CLI agent (cursor, gemini, etc.) via clink")
     cli_name: Optional[str] = Field(default="cursor", description="CLI agent to use (cursor, gemini, codex)")
-    cli_role: Optional[str] = Field(default="default", description="CLI role preset (default, codereviewer, planner, etc.)")
+    cli_role: Optional[str] = Field(
+        default="default", description="CLI role preset (default, codereviewer, planner, etc.)"
+    )
+    
+    # Opt-in NDJSON streaming: one header line, then one line per response chunk
+    stream: bool = Field(default=False, description="Stream the response as NDJSON chunks instead of one JSON body")
 
 
 class ChatResponse(BaseModel):
     """Response model for chat endpoint"""
+    model_config = ConfigDict(extra="ignore", defer_build=False)
+
     success: bool
     response: str
     tool_used: str
     strategy: str
     complexity: Optional[int] = None
     risk: Optional[int] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+# Every endpoint declares a response_model so FastAPI serializes responses
+# straight to JSON bytes with Pydantic's compiled serializer
+class HealthResponse(BaseModel):
+    """Response model for health endpoint"""
+    status: str
+    router_available: bool
+    analytics_available: bool
+    tools_count: int
+
+
+class ToolInfo(BaseModel):
+    """Name and description of one bridge tool"""
+    name: str
+    description: str
+
+
+class ToolsResponse(BaseModel):
+    """Response model for tools endpoint"""
+    tools: list[ToolInfo]
+
+
+class RouterStatsResponse(BaseModel):
+    """Response model for router stats endpoint"""
+    stats: list[dict[str, Any]]
+
+
+class CacheClearResponse(BaseModel):
+    """Response model for chat cache clear endpoint"""
+    cleared: int
+
+
+async def _execute_tool(tool, tool_args: Dict[str, Any]):
+    """Await async tools directly; run sync ones on the tool threadpool"""
+    if inspect.iscoroutinefunction(tool.execute):
+        return await tool.execute(tool_args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_TOOL_POOL, tool.execute, tool_args)
+
+
+@functools.lru_cache(maxsize=_ENCODER_CACHE_SIZE)
+def _get_encoder(model: str):
+    """
+    Return the tiktoken encoding for a model, falling back to cl100k_base.
+    
+    The first load of an encoding downloads and parses its BPE file, so this
+    must run off the event loop. tiktoken shares one object per encoding, so
+    the bounded per-model cache only holds references.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _encoded_length(text: str, model: str) -> int:
+    """Token count of text under the model's encoding; blocking, run on the tool threadpool"""
+    return len(_get_encoder(model).encode_ordinary(text))
+
+
+async def _count_tokens(text: str, model: str) -> int:
+    """Count response tokens with tiktoken on the tool threadpool, or estimate when unavailable"""
+    if tiktoken is None or len(text) < _TOKENIZE_MIN_CHARS:
+        return estimate_tokens(text)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_TOOL_POOL, _encoded_length, text, model)
+    except Exception as e:
+        logger.debug("Token counting failed for %s: %s", model, e)
+        return estimate_tokens(text)
+
+
+def _chat_cache_key(request: ChatRequest) -> bytes:
+    """Digest of every request field that can change the response"""
+    payload = json.dumps(request.model_dump(), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+def _chat_cache_get(key: bytes) -> Optional[ChatResponse]:
+    """Return a cached response that is still within its TTL"""
+    entry = _CHAT_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, response = entry
+    if time.monotonic() - stored_at > _CHAT_CACHE_TTL:
+        del _CHAT_CACHE[key]
+        return None
+    _CHAT_CACHE.move_to_end(key)
+    return response
+
+
+def _chat_cache_put(key: bytes, response: ChatResponse):
+    """Store a response, evicting the least recently used entry when full"""
+    _CHAT_CACHE[key] = (time.monotonic(), response)
+    _CHAT_CACHE.move_to_end(key)
+    if len(_CHAT_CACHE) > _CHAT_CACHE_SIZE:
+        _CHAT_CACHE.popitem(last=False)
+
+
+def _elapsed_ms(started: float) -> int:
+    """Milliseconds since a time.perf_counter() reading"""
+    return int((time.perf_counter() - started) * 1000)
+
+
+def _log_execution(
+    tool_name: str, model: str, duration_ms: int, tokens: Optional[int] = None, error: Optional[str] = None
+):
+    """Record a /chat tool run in analytics"""
+    if not analytics:
+        return
+    try:
+        analytics.log_tool_execution(
+            tool_name=tool_name,
+            model=model,
+            tokens_used=tokens,
+            execution_time_ms=duration_ms,
+            success=error is None,
+            error_message=error,
+            status="completed" if error is None else "failed",
+        )
+    except Exception as e:
+        logger.warning("Analytics logging failed: %s", e)
+
+
+def _write_request_log(entries: list):
+    """Emit one access log record for a batch of requests"""
+    access_logger.info(
+        "%d request(s):\n%s",
+        len(entries),
+        "\n".join(f"{method} {path} {status} {duration_ms}ms" for method, path, status, duration_ms in entries),
+    )
+
+
+async def _request_log_writer(queue: asyncio.Queue):
+    """Flush queued access records every _REQUEST_LOG_FLUSH_SECONDS or _REQUEST_LOG_MAX_BATCH entries"""
+    while True:
+        entries = [await queue.get()]
+        try:
+            await asyncio.sleep(_REQUEST_LOG_FLUSH_SECONDS)
+        finally:
+            # Also runs on cancellation at shutdown, so dequeued entries are not lost
+            while len(entries) < _REQUEST_LOG_MAX_BATCH and not queue.empty():
+                entries.append(queue.get_nowait())
+            _write_request_log(entries)
+
+
+def _refresh_health():
+    """Rebuild the /health body and ETag from current router/analytics availability"""
+    global _health_json, _health_etag
+    _health_json = HealthResponse(
+        status="healthy",
+        router_available=router is not None,
+        analytics_available=analytics is not None,
+        tools_count=len(TOOLS),
+    ).model_dump_json().encode()
+    _health_etag = f'"{hashlib.blake2b(_health_json, digest_size=8).hexdigest()}"'
 
 
 @app.on_event("startup")
 async def startup():
     """Initialize zen-mcp components"""
-    global router, analytics
+    global router, analytics, _tools_json, _request_log, _request_log_task, _stats_lock
     
     logger.info("🚀 Starting Zen-MCP HTTP Bridge...")
     
+    _stats_lock = asyncio.Lock()
+    _request_log = asyncio.Queue(maxsize=10 * _REQUEST_LOG_MAX_BATCH)
+    _request_log_task = asyncio.create_task(_request_log_writer(_request_log))
+    
     # Note: Model providers are configured by individual tools as needed
     
+    # Build each tool once instead of per request
+    for name, tool_class in TOOLS.items():
+        try:
+            tool_instances[name] = tool_class()
+            tool_semaphores[name] = asyncio.Semaphore(int(os.getenv(f"LIMIT_{name.upper()}", "8")))
+        except Exception as e:
+            logger.warning(f"⚠️  Tool '{name}' unavailable: {e}")
+    logger.info(f"✅ {len(tool_instances)} tools initialized")
+    
+    # Tool descriptions are static, so /tools serves this body as-is
+    _tools_json = ToolsResponse(
+        tools=[ToolInfo(name=name, description=tool.description) for name, tool in tool_instances.items()]
+    ).model_dump_json().encode()
+    
     # Initialize analytics
     try:
         analytics = ZenAnalytics()
@@ -108,18 +437,40 @@ async def startup():
         logger.error(f"❌ Router initialization failed: {e}")
         router = None
     
+    _refresh_health()
     logger.info("✅ Zen-MCP HTTP Bridge ready!")
 
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "router_available": router is not None,
-        "analytics_available": analytics is not None,
-        "tools_count": len(TOOLS)
-    }
+@app.on_event("shutdown")
+async def shutdown():
+    """Close the shared HTTP client, stop the access log writer, and flush what it had not written"""
+    global _request_log, _request_log_task
+    
+    await close_async_client()
+    
+    if _request_log_task is not None:
+        _request_log_task.cancel()
+        try:
+            await _request_log_task
+        except asyncio.CancelledError:
+            pass
+    
+    if _request_log is not None and not _request_log.empty():
+        entries = []
+        while not _request_log.empty():
+            entries.append(_request_log.get_nowait())
+        _write_request_log(entries)
+    
+    _request_log = None
+    _request_log_task = None
+
+
+@app.get("/health", response_model=HealthResponse)
+async def health_check(if_none_match: Optional[str] = Header(None)):
+    """Health check endpoint; answers 304 when the client's ETag is current"""
+    if if_none_match == _health_etag:
+        return Response(status_code=304, headers={"ETag": _health_etag})
+    return Response(content=_health_json, media_type="application/json", headers={"ETag": _health_etag})
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -132,9 +483,88 @@ async def chat(request: ChatRequest):
     2. Uses IntelligentRouter to select best tool (if auto_route=True)
     3. Executes the tool
     4. Returns structured response
+    
+    Identical requests within CHAT_CACHE_TTL seconds are answered from cache, and
+    identical requests arriving while one is still running wait for its result
+    instead of executing the tool again. CLI agent requests always run, since the
+    agent may act on the workspace, and so do streamed (stream=True) requests.
     """
+    cache_key = None if request.use_cli_agent or request.stream or _CHAT_CACHE_SIZE <= 0 else _chat_cache_key(request)
+    if cache_key is None:
+        return await _run_chat(request)
+    
+    cached = _chat_cache_get(cache_key)
+    if cached is not None:
+        logger.info("⚡ Cache hit: %.100s...", request.transcript)
+        return cached.model_copy(update={"metadata": {**cached.metadata, "cached": True}})
+    
+    pending = _CHAT_INFLIGHT.get(cache_key)
+    if pending is not None:
+        logger.info("🔗 Joining in-flight request: %.100s...", request.transcript)
+        return await asyncio.shield(pending)
+    
+    pending = asyncio.get_running_loop().create_future()
+    _CHAT_INFLIGHT[cache_key] = pending
     try:
-        logger.info(f"📥 Received chat request: {request.transcript[:100]}...")
+        chat_response = await _run_chat(request)
+    except asyncio.CancelledError:
+        pending.cancel()
+        raise
+    except Exception as e:
+        pending.set_exception(e)
+        pending.exception()  # Mark retrieved; waiters (if any) re-raise it themselves
+        raise
+    else:
+        pending.set_result(chat_response)
+        _chat_cache_put(cache_key, chat_response)
+        return chat_response
+    finally:
+        del _CHAT_INFLIGHT[cache_key]
+
+
+async def _aiter(items):
+    """Async iterator over an in-memory sequence"""
+    for item in items:
+        yield item
+
+
+async def _stream_chat_result(header: dict, result: Any, model: str, started: float) -> AsyncIterator[bytes]:
+    """Yield the header and each response chunk as NDJSON lines, logging analytics once the stream ends"""
+    yield json.dumps(header).encode() + b"\n"
+    
+    if hasattr(result, "__aiter__"):
+        chunks = result
+    elif isinstance(result, list):
+        chunks = _aiter(result)
+    elif isinstance(result, dict):
+        chunks = _aiter([result.get("response", str(result))])
+    else:
+        chunks = _aiter([str(result)])
+    
+    tool_name = header["tool_used"]
+    tokens = 0
+    try:
+        async for item in chunks:
+            text = item if isinstance(item, str) else getattr(item, "text", None)
+            if text is not None:
+                tokens += await _count_tokens(text, model)
+                yield json.dumps({"response": text}).encode() + b"\n"
+    except Exception as e:
+        logger.error("❌ Streaming %s failed: %s", tool_name, e, exc_info=True)
+        _log_execution(tool_name, model, _elapsed_ms(started), error=str(e))
+        yield json.dumps({"success": False, "error": str(e)}).encode() + b"\n"
+        return
+    
+    _log_execution(tool_name, model, _elapsed_ms(started), tokens=tokens)
+
+
+async def _run_chat(request: ChatRequest) -> Union[ChatResponse, StreamingResponse]:
+    """Route the request, execute the chosen tool, and log the run to analytics"""
+    started = time.perf_counter()
+    tool_name = None
+    try:
+        logger.info("📥 Received chat request: %.100s...", request.transcript)
+        context = request.context.model_dump(exclude_none=True)
         
         # Check if user wants CLI agent (cursor, gemini, etc.)
         if request.use_cli_agent:
@@ -142,22 +572,32 @@ async def chat(request: ChatRequest):
             strategy = "CLI_AGENT"
             complexity = None
             risk = None
-            logger.info(f"🔗 Routing to CLI agent: {request.cli_name} (role: {request.cli_role})")
+            logger.info("🔗 Routing to CLI agent: %s (role: %s)", request.cli_name, request.cli_role)
         # Determine which tool to use
         elif request.tool_override:
-            tool_name = request.tool_override
+            tool_name = request.tool_override.value
             strategy = "MANUAL"
             complexity = None
             risk = None
-            logger.info(f"🎯 Manual tool selection: {tool_name}")
+            logger.info("🎯 Manual tool selection: %s", tool_name)
         elif request.auto_route and router:
-            tool_name, strategy = router.route_request(
+            # route_request already scores complexity and risk; reuse them instead of re-analyzing
+            decision = router.route_request(
                 user_query=request.transcript,
-                context=request.context
+                context=context,
+                files=request.files
+            )
+            tool_name = decision.tool
+            strategy = decision.strategy.value
+            complexity = decision.complexity
+            risk = decision.risk
+            logger.info(
+                "🤖 Auto-routed to: %s (strategy: %s, complexity: %s, risk: %s)",
+                tool_name,
+                strategy,
+                complexity,
+                risk,
             )
-            complexity = router._analyze_complexity(request.transcript)
-            risk = router._assess_risk(request.transcript, request.context)
-            logger.info(f"🤖 Auto-routed to: {tool_name} (strategy: {strategy}, complexity: {complexity}, risk: {risk})")
         else:
             # Default to chat if no routing available
             tool_name = "chat"
@@ -167,11 +607,10 @@ async def chat(request: ChatRequest):
             logger.info("🔄 Fallback to chat tool")
         
         # Get the tool
-        if tool_name not in TOOLS:
+        tool = tool_instances.get(tool_name)
+        if tool is None:
             raise HTTPException(status_code=400, detail=f"Tool '{tool_name}' not found")
         
-        tool = TOOLS[tool_name]
-        
         # Prepare tool arguments
         if tool_name == "clink":
             # Special args for clink (CLI agent routing)
@@ -182,40 +621,58 @@ async def chat(request: ChatRequest):
                 "files": request.files
             }
         else:
-            # Standard tool args
-            tool_args = {
-                "prompt": request.transcript,
-                "model": request.model or "auto",
-                "files": request.files,
-                **request.context
-            }
+            # Standard tool args; set after the context so it cannot override them
+            tool_args = {key: value for key, value in context.items() if key not in _ROUTING_HINTS}
+            tool_args["prompt"] = request.transcript
+            tool_args["model"] = request.model or "auto"
+            tool_args["files"] = request.files
         
         # Execute tool
-        logger.info(f"⚙️  Executing {tool_name} with model: {tool_args.get('model')}")
-        result = await tool.execute(tool_args)
+        logger.info("⚙️  Executing %s with model: %s", tool_name, tool_args.get("model"))
+        semaphore = tool_semaphores.get(tool_name)
+        if semaphore is None:
+            result = await _execute_tool(tool, tool_args)
+        else:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=_TOOL_QUEUE_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=429, detail=f"Tool '{tool_name}' is at capacity, retry later") from None
+            try:
+                result = await _execute_tool(tool, tool_args)
+            finally:
+                semaphore.release()
+        
+        if request.stream:
+            header = {
+                "success": True,
+                "tool_used": tool_name,
+                "strategy": strategy,
+                "complexity": complexity,
+                "risk": risk,
+                "metadata": {"model": request.model or "auto", "auto_routed": request.auto_route},
+            }
+            return StreamingResponse(
+                _stream_chat_result(header, result, request.model or "auto", started),
+                media_type="application/x-ndjson",
+            )
         
         # Extract response text
         if isinstance(result, list):
-            response_text = "\n".join([item.text for item in result if hasattr(item, 'text')])
+            response_text = "\n".join(
+                text for text in (getattr(item, "text", None) for item in result) if text is not None
+            )
         elif isinstance(result, dict):
             response_text = result.get("response", str(result))
         else:
             response_text = str(result)
         
-        logger.info(f"✅ Response generated: {len(response_text)} chars")
+        duration_ms = _elapsed_ms(started)
+        logger.info("✅ Response generated: %d chars in %dms", len(response_text), duration_ms)
         
         # Log to analytics
         if analytics:
-            try:
-                analytics.log_tool_execution(
-                    tool=tool_name,
-                    model=request.model or "auto",
-                    tokens=len(response_text) // 4,  # Rough estimate
-                    duration=0,  # TODO: Track actual duration
-                    success=True
-                )
-            except Exception as e:
-                logger.warning(f"Analytics logging failed: {e}")
+            model = request.model or "auto"
+            _log_execution(tool_name, model, duration_ms, tokens=await _count_tokens(response_text, model))
         
         return ChatResponse(
             success=True,
@@ -230,51 +687,81 @@ async def chat(request: ChatRequest):
             }
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ Chat request failed: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("❌ Chat request failed: %s", e, exc_info=True)
+        if tool_name is not None:
+            _log_execution(tool_name, request.model or "auto", _elapsed_ms(started), error=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
 
+@app.post("/chat/cache/clear", response_model=CacheClearResponse)
+async def clear_chat_cache():
+    """Drop all cached /chat responses"""
+    cleared = len(_CHAT_CACHE)
+    _CHAT_CACHE.clear()
+    return {"cleared": cleared}
 
-@app.get("/tools")
+
+@app.get("/tools", response_model=ToolsResponse)
 async def list_tools():
     """List available zen-mcp tools"""
-    return {
-        "tools": [
-            {
-                "name": name,
-                "description": tool.description
-            }
-            for name, tool in TOOLS.items()
-        ]
-    }
+    return Response(content=_tools_json, media_type="application/json")
+
+
+async def _get_tool_performance() -> list:
+    """Return 7-day tool stats, querying analytics at most once per ROUTER_STATS_TTL"""
+    global _stats_cache
+    if _stats_cache is not None and time.monotonic() - _stats_cache[0] < _STATS_TTL:
+        return _stats_cache[1]
+    async with _stats_lock:
+        # Another request may have refreshed the cache while this one waited
+        if _stats_cache is not None and time.monotonic() - _stats_cache[0] < _STATS_TTL:
+            return _stats_cache[1]
+        # The analytics query blocks on SQLite, so it runs on the tool threadpool
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(_TOOL_POOL, functools.partial(analytics.get_tool_performance, days=7))
+        _stats_cache = (time.monotonic(), stats)
+        return stats
 
 
-@app.get("/router/stats")
+@app.get("/router/stats", response_model=RouterStatsResponse)
 async def router_stats():
     """Get router statistics"""
     if not analytics:
         raise HTTPException(status_code=503, detail="Analytics not available")
     
     try:
-        stats = analytics.get_tool_performance(days=7)
+        stats = await _get_tool_performance()
         return {"stats": stats}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 def main():
-    """Run the HTTP bridge server"""
+    """
+    Run the HTTP bridge server
+    
+    HTTP_BRIDGE_WORKERS sets the number of worker processes (default 1). Each worker
+    runs its own startup(), so router and analytics are initialized per process;
+    the DuckDB analytics file admits a single writer, so extra workers run without
+    analytics unless it points at separate databases.
+    """
     port = int(os.getenv("HTTP_BRIDGE_PORT", "8766"))
     host = os.getenv("HTTP_BRIDGE_HOST", "0.0.0.0")
+    workers = int(os.getenv("HTTP_BRIDGE_WORKERS", "1"))
     
-    logger.info(f"🌐 Starting HTTP Bridge on {host}:{port}")
+    logger.info(f"🌐 Starting HTTP Bridge on {host}:{port} ({workers} worker(s))")
     
     uvicorn.run(
-        app,
+        # Workers are separate processes, so uvicorn needs an import string rather than the app object
+        "http_bridge:app" if workers > 1 else app,
         host=host,
         port=port,
+        workers=workers,
         log_level="info",
-        access_log=True
+        access_log=False  # RequestLogMiddleware batches access records instead
     )
 
 
@@ -17,8 +17,100 @@ from pathlib import Path
 import os
 import atexit
 import logging
+import operator
+from contextlib import contextmanager
 
-@dataclass
+# Applied to every connection: WAL lets readers run alongside the checkpoint
+# writer, and synchronous=NORMAL (safe under WAL) drops the per-commit fsync.
+# The 1 GB mmap cap covers the whole file, so recovery scans read pages
+# straight from the mapping instead of a pread per page.
+_SQL_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=1073741824;
+"""
+
+# The read-only connection can't change the journal mode; it just inherits WAL
+_SQL_READ_CONNECTION_PRAGMAS = """
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=1073741824;
+"""
+
+# Keyed lookups by session_id only, so the table is clustered on it directly
+# rather than on a rowid with a second B-tree for the unique index
+_SQL_CREATE_EXECUTIONS = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        session_id TEXT PRIMARY KEY,
+        todo_id TEXT NOT NULL,
+        todo_text TEXT NOT NULL,
+        status TEXT NOT NULL,
+        platform TEXT NOT NULL,
+        agent TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        last_activity TEXT NOT NULL,
+        progress_percent INTEGER DEFAULT 0,
+        current_action TEXT,
+        context TEXT,
+        completed_at TEXT,
+        duration_seconds INTEGER,
+        crash_recovery_count INTEGER DEFAULT 0,
+        last_checkpoint TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    ) WITHOUT ROWID
+"""
+
+# PersistentExecution fields in declaration order
+_EXECUTION_FIELDS = (
+    "todo_id", "todo_text", "status", "platform", "agent", "provider", "started_at", "last_activity",
+    "progress_percent", "current_action", "context", "session_id", "completed_at", "duration_seconds",
+    "crash_recovery_count", "last_checkpoint",
+)
+_EXECUTION_COLUMNS = ", ".join(_EXECUTION_FIELDS)
+
+# Reads every field of an execution into a tuple in one C-level call
+_EXECUTION_VALUES = operator.attrgetter(*_EXECUTION_FIELDS)
+
+# Insert-or-update in one statement; created_at is kept from the first insert.
+# Hoisted so every save reuses the connection's cached prepared statement.
+_SQL_UPSERT_EXECUTION = """
+    INSERT INTO persistent_executions
+    ({columns}, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        todo_id = excluded.todo_id, todo_text = excluded.todo_text, status = excluded.status,
+        platform = excluded.platform, agent = excluded.agent, provider = excluded.provider,
+        started_at = excluded.started_at, last_activity = excluded.last_activity,
+        progress_percent = excluded.progress_percent, current_action = excluded.current_action,
+        context = excluded.context, completed_at = excluded.completed_at,
+        duration_seconds = excluded.duration_seconds, crash_recovery_count = excluded.crash_recovery_count,
+        last_checkpoint = excluded.last_checkpoint, updated_at = excluded.updated_at
+""".format(columns=_EXECUTION_COLUMNS)
+
+# Status markers are appended to context at most once, so a session that goes
+# through many restarts doesn't rewrite an ever-longer string on each one
+_CRASH_RECOVERY_MARKER = " [CRASH RECOVERY - Auto-paused due to server restart]"
+_SHUTDOWN_MARKER = " [SHUTDOWN - Auto-paused due to server shutdown]"
+_SQL_APPEND_CONTEXT_MARKER = (
+    "CASE WHEN instr(COALESCE(context, ''), :marker) THEN context ELSE COALESCE(context, '') || :marker END"
+)
+
+_SQL_INSERT_CHECKPOINT = """
+    INSERT INTO execution_checkpoints
+    (session_id, checkpoint_time, progress_percent, current_action, context, last_activity)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# slots=True needs Python 3.10; explicit __slots__ can't coexist with field defaults
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class PersistentExecution:
     """Persistent execution data that survives crashes"""
     todo_id: str
@@ -37,8 +129,10 @@ class PersistentExecution:
     duration_seconds: Optional[int] = None
     crash_recovery_count: int = 0
     last_checkpoint: str = ""
+    # Epoch twin of started_at for the duration; in memory only, started_at is what's stored
+    started_at_epoch: float = 0.0
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class CrashRecoveryInfo:
     """Information about crash recovery"""
     crash_time: str
@@ -52,12 +146,23 @@ class PersistentMemoryManager:
     """Manages persistent memory that survives crashes and restarts"""
     
     def __init__(self, db_path: str = "persistent_todo_execution.db"):
+        # ":memory:" keeps everything in process for tests and throwaway runs
         self.db_path = db_path
+        self.in_memory = db_path == ":memory:"
         self.active_sessions: Dict[str, PersistentExecution] = {}
         self.crash_recovery_info: Optional[CrashRecoveryInfo] = None
         self.checkpoint_interval = 30  # seconds
         self.last_checkpoint = time.time()
-        self.is_running = True
+        self.wal_checkpoint_interval = 60  # seconds
+        self.checkpoint_retention = timedelta(hours=24)
+        self.last_wal_checkpoint = time.time()
+        # Set on shutdown; wakes the checkpoint thread immediately instead of on its next poll
+        self._stop_event = threading.Event()
+        # _cleanup runs from atexit and may also be called directly; only the first call does the work
+        self._cleaned_up = False
+        # Sessions updated in memory but not yet written; flushed by the next checkpoint
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         
         # Setup signal handlers for graceful shutdown
@@ -65,9 +170,21 @@ class PersistentMemoryManager:
         signal.signal(signal.SIGTERM, self._signal_handler)
         atexit.register(self._cleanup)
         
+        # One long-lived connection shared by callers and the checkpoint thread
+        self._conn = self._connect()
+        self._db_lock = threading.Lock()
+        
         # Initialize database
         self.init_database()
         
+        # Separate read-only connection so recovery scans never wait on the writer.
+        # A private in-memory database is only reachable through its one connection.
+        if self.in_memory:
+            self._read_conn, self._read_lock = self._conn, self._db_lock
+        else:
+            self._read_conn = self._connect_readonly()
+            self._read_lock = threading.Lock()
+        
         # Start checkpoint thread
         self.checkpoint_thread = threading.Thread(target=self._checkpoint_loop, daemon=True)
         self.checkpoint_thread.start()
@@ -75,35 +192,53 @@ class PersistentMemoryManager:
         # Attempt crash recovery
         self._attempt_crash_recovery()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection (transactions are explicit) with WAL and performance PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.executescript(_SQL_CONNECTION_PRAGMAS)
+        return conn
+    
+    def _connect_readonly(self) -> sqlite3.Connection:
+        """Open a read-only connection to the (already initialized) database"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.executescript(_SQL_READ_CONNECTION_PRAGMAS)
+        return conn
+    
+    @contextmanager
+    def _read_cursor(self):
+        """Yield a sqlite3.Row cursor on the read-only connection"""
+        with self._read_lock:
+            cursor = self._read_conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            yield cursor
+    
+    @contextmanager
+    def _write_transaction(self):
+        """Yield a cursor inside BEGIN IMMEDIATE ... COMMIT on the shared connection"""
+        with self._db_lock:
+            cursor = self._conn.cursor()
+            # Take the write lock up front rather than upgrading mid-transaction, which can fail with SQLITE_BUSY
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                # Includes the SystemExit a shutdown signal raises mid-write, so the connection is left usable
+                cursor.execute("ROLLBACK")
+                raise
+    
     def init_database(self):
         """Initialize SQLite database for persistent storage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_transaction() as cursor:
+            self._create_schema(cursor)
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create tables and indexes"""
         
         # Main executions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS persistent_executions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                todo_id TEXT NOT NULL,
-                todo_text TEXT NOT NULL,
-                status TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                agent TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                started_at TEXT NOT NULL,
-                last_activity TEXT NOT NULL,
-                progress_percent INTEGER DEFAULT 0,
-                current_action TEXT,
-                context TEXT,
-                session_id TEXT NOT NULL UNIQUE,
-                completed_at TEXT,
-                duration_seconds INTEGER,
-                crash_recovery_count INTEGER DEFAULT 0,
-                last_checkpoint TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
+        cursor.execute(_SQL_CREATE_EXECUTIONS.format(table="persistent_executions"))
+        self._migrate_rowid_executions(cursor)
         
         # Crash recovery log
         cursor.execute("""
@@ -134,79 +269,103 @@ class PersistentMemoryManager:
         """)
         
         # Indexes for performance
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_session_id ON persistent_executions(session_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON persistent_executions(status)")
+        # session_id is the primary key now, so its old secondary index is redundant
+        cursor.execute("DROP INDEX IF EXISTS idx_session_id")
+        # Serves the stale-execution scan in crash recovery as a single range probe;
+        # status alone is a prefix of it, so the old single-column index is dropped
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_status_checkpoint ON persistent_executions(status, last_checkpoint)"
+        )
+        cursor.execute("DROP INDEX IF EXISTS idx_status")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_todo_id ON persistent_executions(todo_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_checkpoint_session ON execution_checkpoints(session_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_checkpoint_time ON execution_checkpoints(checkpoint_time)")
+    
+    def _migrate_rowid_executions(self, cursor: sqlite3.Cursor):
+        """Rebuild a persistent_executions table from before the WITHOUT ROWID layout"""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'persistent_executions'")
+        if "WITHOUT ROWID" in cursor.fetchone()[0].upper():
+            return
         
-        conn.commit()
-        conn.close()
+        # Build the new table alongside and rename it into place, so the
+        # checkpoint table's foreign key keeps naming persistent_executions
+        cursor.execute(_SQL_CREATE_EXECUTIONS.format(table="persistent_executions_new"))
+        cursor.execute(f"""
+            INSERT INTO persistent_executions_new ({_EXECUTION_COLUMNS}, created_at, updated_at)
+            SELECT {_EXECUTION_COLUMNS}, created_at, updated_at FROM persistent_executions
+        """)
+        cursor.execute("DROP TABLE persistent_executions")
+        cursor.execute("ALTER TABLE persistent_executions_new RENAME TO persistent_executions")
+        self.logger.info("Migrated persistent_executions to a WITHOUT ROWID table keyed on session_id")
     
     def _attempt_crash_recovery(self):
         """Attempt to recover from a previous crash"""
         start_time = time.time()
         crash_time = None
+        # Bound in the same local isoformat() the rows are written with, so the
+        # string comparison against last_checkpoint orders correctly
+        now = datetime.now()
+        now_iso = now.isoformat()
+        stale_cutoff = (now - timedelta(minutes=5)).isoformat()
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if there are any active executions from before crash
-            cursor.execute("""
-                SELECT COUNT(*) FROM persistent_executions 
-                WHERE status IN ('executing', 'paused') 
-                AND last_checkpoint < datetime('now', '-5 minutes')
-            """)
-            stale_executions = cursor.fetchone()[0]
-            
-            if stale_executions > 0:
-                # Get the last checkpoint time to estimate crash time
+            # Count active executions from before the crash and take the last
+            # checkpoint time to estimate the crash time, in one pass
+            with self._read_cursor() as cursor:
                 cursor.execute("""
-                    SELECT MAX(last_checkpoint) FROM persistent_executions 
+                    SELECT COALESCE(SUM(last_checkpoint < ?), 0),
+                           MAX(last_checkpoint)
+                    FROM persistent_executions 
                     WHERE status IN ('executing', 'paused')
-                """)
-                last_checkpoint = cursor.fetchone()[0]
+                """, (stale_cutoff,))
+                stale_executions, last_checkpoint = cursor.fetchone()
+            
+            if stale_executions > 0:
                 crash_time = last_checkpoint
                 
                 # Mark stale executions as paused for recovery
-                cursor.execute("""
-                    UPDATE persistent_executions 
-                    SET status = 'paused', 
-                        context = context || ' [CRASH RECOVERY - Auto-paused due to server restart]',
-                        crash_recovery_count = crash_recovery_count + 1,
-                        last_checkpoint = datetime('now')
-                    WHERE status IN ('executing', 'paused') 
-                    AND last_checkpoint < datetime('now', '-5 minutes')
-                """)
-                
-                recovered_count = cursor.rowcount
+                with self._write_transaction() as cursor:
+                    cursor.execute(f"""
+                        UPDATE persistent_executions 
+                        SET status = 'paused', 
+                            context = {_SQL_APPEND_CONTEXT_MARKER},
+                            crash_recovery_count = crash_recovery_count + 1,
+                            last_checkpoint = :now
+                        WHERE status IN ('executing', 'paused') 
+                        AND last_checkpoint < :cutoff
+                    """, {"marker": _CRASH_RECOVERY_MARKER, "now": now_iso, "cutoff": stale_cutoff})
+                    
+                    recovered_count = cursor.rowcount
                 
                 # Load recovered executions into memory
-                cursor.execute("""
-                    SELECT * FROM persistent_executions 
-                    WHERE status = 'paused' 
-                    AND crash_recovery_count > 0
-                """)
+                with self._read_cursor() as cursor:
+                    cursor.execute(f"""
+                        SELECT {_EXECUTION_COLUMNS} FROM persistent_executions 
+                        WHERE status = 'paused' 
+                        AND crash_recovery_count > 0
+                    """)
+                    rows = cursor.fetchall()
                 
                 recovered_executions = []
-                for row in cursor.fetchall():
+                for row in rows:
                     execution = PersistentExecution(
-                        todo_id=row[1],
-                        todo_text=row[2],
-                        status=row[3],
-                        platform=row[4],
-                        agent=row[5],
-                        provider=row[6],
-                        started_at=row[7],
-                        last_activity=row[8],
-                        progress_percent=row[9],
-                        current_action=row[10],
-                        context=row[11],
-                        session_id=row[12],
-                        completed_at=row[13],
-                        duration_seconds=row[14],
-                        crash_recovery_count=row[15],
-                        last_checkpoint=row[16]
+                        todo_id=row["todo_id"],
+                        todo_text=row["todo_text"],
+                        status=row["status"],
+                        platform=row["platform"],
+                        agent=row["agent"],
+                        provider=row["provider"],
+                        started_at=row["started_at"],
+                        last_activity=row["last_activity"],
+                        progress_percent=row["progress_percent"],
+                        current_action=row["current_action"],
+                        context=row["context"],
+                        session_id=row["session_id"],
+                        completed_at=row["completed_at"],
+                        duration_seconds=row["duration_seconds"],
+                        crash_recovery_count=row["crash_recovery_count"],
+                        last_checkpoint=row["last_checkpoint"],
+                        started_at_epoch=datetime.fromisoformat(row["started_at"]).timestamp()
                     )
                     self.active_sessions[execution.session_id] = execution
                     recovered_executions.append(execution)
@@ -214,10 +373,11 @@ class PersistentMemoryManager:
                 # Log recovery information
                 recovery_time = time.time()
                 recovery_duration = recovery_time - start_time
+                recovery_iso = datetime.now().isoformat()
                 
                 self.crash_recovery_info = CrashRecoveryInfo(
                     crash_time=crash_time or "unknown",
-                    recovery_time=datetime.now().isoformat(),
+                    recovery_time=recovery_iso,
                     active_executions=stale_executions,
                     recovered_executions=recovered_count,
                     lost_executions=stale_executions - recovered_count,
@@ -225,22 +385,21 @@ class PersistentMemoryManager:
                 )
                 
                 # Log to database
-                cursor.execute("""
-                    INSERT INTO crash_recovery_log 
-                    (crash_time, recovery_time, active_executions, recovered_executions, 
-                     lost_executions, recovery_duration_seconds, recovery_details)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    crash_time or "unknown",
-                    datetime.now().isoformat(),
-                    stale_executions,
-                    recovered_count,
-                    stale_executions - recovered_count,
-                    recovery_duration,
-                    f"Recovered {len(recovered_executions)} executions from crash"
-                ))
-                
-                conn.commit()
+                with self._write_transaction() as cursor:
+                    cursor.execute("""
+                        INSERT INTO crash_recovery_log 
+                        (crash_time, recovery_time, active_executions, recovered_executions, 
+                         lost_executions, recovery_duration_seconds, recovery_details)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        crash_time or "unknown",
+                        recovery_iso,
+                        stale_executions,
+                        recovered_count,
+                        stale_executions - recovered_count,
+                        recovery_duration,
+                        f"Recovered {len(recovered_executions)} executions from crash"
+                    ))
                 
                 self.logger.info(f"🔄 Crash recovery completed: {recovered_count} executions recovered")
                 self.logger.info(f"⏱️ Recovery duration: {recovery_duration:.2f} seconds")
@@ -248,16 +407,15 @@ class PersistentMemoryManager:
             else:
                 self.logger.info("✅ No crash recovery needed - clean startup")
             
-            conn.close()
-            
         except Exception as e:
             self.logger.error(f"❌ Crash recovery failed: {e}")
     
     def start_execution(self, todo_id: str, todo_text: str, platform: str, 
                        agent: str, provider: str, context: str = "") -> str:
         """Start tracking a todo execution with persistent storage"""
-        session_id = f"{todo_id}_{int(time.time())}"
-        current_time = datetime.now().isoformat()
+        started_at_epoch = time.time()
+        session_id = f"{todo_id}_{int(started_at_epoch)}"
+        current_time = datetime.fromtimestamp(started_at_epoch).isoformat()
         
         execution = PersistentExecution(
             todo_id=todo_id,
@@ -272,14 +430,15 @@ class PersistentMemoryManager:
             current_action="Starting execution",
             context=context,
             session_id=session_id,
-            last_checkpoint=current_time
+            last_checkpoint=current_time,
+            started_at_epoch=started_at_epoch
         )
         
         # Store in memory
         self.active_sessions[session_id] = execution
         
         # Store in database
-        self._save_execution(execution)
+        self._save_execution(execution, current_time)
         
         return session_id
     
@@ -300,8 +459,8 @@ class PersistentMemoryManager:
         
         execution.last_activity = datetime.now().isoformat()
         
-        # Update database
-        self._save_execution(execution)
+        # Persisted by the next checkpoint
+        self._mark_dirty(session_id)
         
         return True
     
@@ -316,8 +475,8 @@ class PersistentMemoryManager:
         if context:
             execution.context = context
         
-        # Update database
-        self._save_execution(execution)
+        # Persisted by the next checkpoint
+        self._mark_dirty(session_id)
         
         return True
     
@@ -329,114 +488,105 @@ class PersistentMemoryManager:
         execution = self.active_sessions[session_id]
         execution.status = "completed"
         execution.progress_percent = 100
-        execution.last_activity = datetime.now().isoformat()
-        execution.completed_at = datetime.now().isoformat()
+        completed_at = time.time()
+        now_iso = datetime.fromtimestamp(completed_at).isoformat()
+        execution.last_activity = now_iso
+        execution.completed_at = now_iso
         if context:
             execution.context = context
         
         # Calculate duration
-        started_at = datetime.fromisoformat(execution.started_at)
-        completed_at = datetime.now()
-        execution.duration_seconds = int((completed_at - started_at).total_seconds())
+        execution.duration_seconds = int(completed_at - execution.started_at_epoch)
         
         # Update database
-        self._save_execution(execution)
+        self._save_execution(execution, now_iso)
         
-        # Remove from active sessions
+        # Remove from active sessions; the write above already covers any pending update
         del self.active_sessions[session_id]
+        with self._dirty_lock:
+            self._dirty.discard(session_id)
         
         return True
     
-    def _save_execution(self, execution: PersistentExecution):
-        """Save execution to database"""
+    def _mark_dirty(self, session_id: str):
+        """Queue a session for the next checkpoint's batched write"""
+        with self._dirty_lock:
+            self._dirty.add(session_id)
+    
+    @staticmethod
+    def _execution_params(execution: PersistentExecution, now_iso: str) -> tuple:
+        """Parameters for _SQL_UPSERT_EXECUTION"""
+        return _EXECUTION_VALUES(execution) + (now_iso, now_iso)
+    
+    def _save_execution(self, execution: PersistentExecution, now_iso: Optional[str] = None):
+        """Save execution to database, stamping it with the caller's timestamp when given"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Check if execution exists
-            cursor.execute("SELECT id FROM persistent_executions WHERE session_id = ?", (execution.session_id,))
-            exists = cursor.fetchone()
-            
-            if exists:
-                # Update existing execution
-                cursor.execute("""
-                    UPDATE persistent_executions 
-                    SET todo_id = ?, todo_text = ?, status = ?, platform = ?, agent = ?, provider = ?,
-                        started_at = ?, last_activity = ?, progress_percent = ?, current_action = ?,
-                        context = ?, completed_at = ?, duration_seconds = ?, 
-                        crash_recovery_count = ?, last_checkpoint = ?, updated_at = ?
-                    WHERE session_id = ?
-                """, (
-                    execution.todo_id, execution.todo_text, execution.status, execution.platform,
-                    execution.agent, execution.provider, execution.started_at, execution.last_activity,
-                    execution.progress_percent, execution.current_action, execution.context,
-                    execution.completed_at, execution.duration_seconds, execution.crash_recovery_count,
-                    execution.last_checkpoint, datetime.now().isoformat(), execution.session_id
-                ))
-            else:
-                # Insert new execution
-                cursor.execute("""
-                    INSERT INTO persistent_executions 
-                    (todo_id, todo_text, status, platform, agent, provider, started_at, 
-                     last_activity, progress_percent, current_action, context, session_id,
-                     completed_at, duration_seconds, crash_recovery_count, last_checkpoint,
-                     created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    execution.todo_id, execution.todo_text, execution.status, execution.platform,
-                    execution.agent, execution.provider, execution.started_at, execution.last_activity,
-                    execution.progress_percent, execution.current_action, execution.context,
-                    execution.session_id, execution.completed_at, execution.duration_seconds,
-                    execution.crash_recovery_count, execution.last_checkpoint,
-                    datetime.now().isoformat(), datetime.now().isoformat()
-                ))
-            
-            conn.commit()
-            conn.close()
+            with self._write_transaction() as cursor:
+                params = self._execution_params(execution, now_iso or datetime.now().isoformat())
+                cursor.execute(_SQL_UPSERT_EXECUTION, params)
             
         except Exception as e:
             self.logger.error(f"Failed to save execution {execution.session_id}: {e}")
     
     def _checkpoint_loop(self):
         """Background thread for periodic checkpoints"""
-        while self.is_running:
+        while not self._stop_event.wait(self.checkpoint_interval):
             try:
-                current_time = time.time()
-                if current_time - self.last_checkpoint >= self.checkpoint_interval:
-                    self._create_checkpoint()
-                    self.last_checkpoint = current_time
-                time.sleep(5)  # Check every 5 seconds
+                self._create_checkpoint()
+                self.last_checkpoint = time.time()
+                if self.last_checkpoint - self.last_wal_checkpoint >= self.wal_checkpoint_interval:
+                    self._checkpoint_wal()
+                    self.last_wal_checkpoint = self.last_checkpoint
             except Exception as e:
                 self.logger.error(f"Checkpoint loop error: {e}")
-                time.sleep(10)
+    
+    def _checkpoint_wal(self):
+        """Fold the WAL back into the database from the background thread"""
+        # PASSIVE gives up on pages still in use instead of blocking readers or
+        # writers, and keeps the WAL small enough that the commit-triggered
+        # auto-checkpoint rarely lands on a caller's write
+        with self._db_lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
     
     def _create_checkpoint(self):
-        """Create a checkpoint of current execution state"""
+        """Create a checkpoint of current execution state and flush dirty sessions"""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # One timestamp for every row in the batch
+            now = datetime.now()
+            checkpoint_time = now.isoformat()
+            retention_cutoff = (now - self.checkpoint_retention).isoformat()
             
-            checkpoint_time = datetime.now().isoformat()
-            
-            for session_id, execution in self.active_sessions.items():
-                # Update last checkpoint
-                execution.last_checkpoint = checkpoint_time
+            # One statement per table and one commit for the whole batch
+            with self._write_transaction() as cursor:
+                # Snapshot under the write lock: a complete_execution() write that lands
+                # before this point is already in the object, and one that lands after
+                # it is ordered after this batch, so an older state can't overwrite it
+                rows = []
+                for session_id, execution in list(self.active_sessions.items()):
+                    execution.last_checkpoint = checkpoint_time
+                    rows.append((
+                        session_id, checkpoint_time, execution.progress_percent,
+                        execution.current_action, execution.context, execution.last_activity
+                    ))
                 
-                # Create checkpoint record
-                cursor.execute("""
-                    INSERT INTO execution_checkpoints 
-                    (session_id, checkpoint_time, progress_percent, current_action, 
-                     context, last_activity)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    session_id, checkpoint_time, execution.progress_percent,
-                    execution.current_action, execution.context, execution.last_activity
-                ))
-            
-            conn.commit()
-            conn.close()
+                # Sessions completed since they were marked dirty are already written
+                executions = [self.active_sessions.get(session_id) for session_id in dirty]
+                upserts = [
+                    self._execution_params(execution, checkpoint_time) for execution in executions if execution
+                ]
+                
+                cursor.executemany(_SQL_UPSERT_EXECUTION, upserts)
+                cursor.executemany(_SQL_INSERT_CHECKPOINT, rows)
+                # Drop history past the retention window so the table and its indexes stay small
+                cursor.execute("DELETE FROM execution_checkpoints WHERE checkpoint_time < ?", (retention_cutoff,))
             
         except Exception as e:
+            # Keep the unwritten updates for the next attempt
+            with self._dirty_lock:
+                self._dirty |= dirty
             self.logger.error(f"Checkpoint creation failed: {e}")
     
     def get_crash_recovery_info(self) -> Optional[CrashRecoveryInfo]:
@@ -450,33 +600,47 @@ class PersistentMemoryManager:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         self.logger.info(f"🛑 Received signal {signum}, shutting down gracefully...")
-        self.is_running = False
-        self._cleanup()
+        self._stop_event.set()
+        # The signal may interrupt the main thread inside _write_transaction, holding
+        # the non-reentrant locks _cleanup needs; exiting unwinds those blocks first
+        # and the atexit hook then runs _cleanup
         sys.exit(0)
     
     def _cleanup(self):
         """Cleanup on shutdown"""
+        # Stop the checkpoint thread before the final checkpoint so it can't race the close below
+        self._stop_event.set()
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
+        
         try:
             self.logger.info("🧹 Performing cleanup...")
             
+            if self.checkpoint_thread is not threading.current_thread():
+                self.checkpoint_thread.join(timeout=5)
+            
             # Create final checkpoint
             self._create_checkpoint()
             
-            # Mark all active executions as paused
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for session_id in self.active_sessions:
-                cursor.execute("""
+            # Mark all active executions as paused, one statement and one commit for the lot
+            now_iso = datetime.now().isoformat()
+            params = [{"marker": _SHUTDOWN_MARKER, "now": now_iso, "session_id": session_id}
+                      for session_id in list(self.active_sessions)]
+            with self._write_transaction() as cursor:
+                cursor.executemany(f"""
                     UPDATE persistent_executions 
                     SET status = 'paused', 
-                        context = context || ' [SHUTDOWN - Auto-paused due to server shutdown]',
-                        last_checkpoint = datetime('now')
-                    WHERE session_id = ?
-                """, (session_id,))
+                        context = {_SQL_APPEND_CONTEXT_MARKER},
+                        last_checkpoint = :now
+                    WHERE session_id = :session_id
+                """, params)
             
-            conn.commit()
-            conn.close()
+            with self._db_lock:
+                self._conn.close()
+            if not self.in_memory:
+                with self._read_lock:
+                    self._read_conn.close()
             
             self.logger.info("✅ Cleanup completed")
             
@@ -8,14 +8,25 @@ Automatically selects optimal tools based on:
 - Natural language intent detection
 """
 
+import functools
 import logging
 import re
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Distinct queries whose keyword analysis is memoized per router
+_QUERY_CACHE_SIZE = 1024
+
+# Words (with apostrophes, for "don't") in a lowercased query
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Question marks and numbered list items ("1.", "2.") in a query, found in one scan
+_Q_OR_NUMLIST = re.compile(r"\?|\d+\.")
+
 
 class RoutingStrategy(Enum):
     """Routing strategies inspired by Agent-Fusion"""
@@ -125,6 +136,10 @@ class IntelligentRouter:
         "deployment": 2,            # Deployment changes
     }
     
+    # Whole words that signal urgency (+2 risk) or a problem (+1 risk), matched once per group
+    URGENCY_WORDS = frozenset({"urgent", "critical", "asap", "emergency"})
+    NEGATION_WORDS = frozenset({"don't", "doesn't", "won't", "can't"})
+    
     # Intent categories with keywords
     INTENT_PATTERNS = {
         "review": [
@@ -161,15 +176,21 @@ class IntelligentRouter:
         ],
     }
 
-    def __init__(self, analytics=None):
+    def __init__(self, analytics=None, analytics_provider: Optional[Callable[[], Any]] = None):
         """
         Initialize intelligent router.
         
         Args:
             analytics: Optional ZenAnalytics instance for historical patterns
+            analytics_provider: Optional callable returning the ZenAnalytics instance (or None),
+                called only when historical patterns are consulted so callers can open it lazily
         """
-        self.analytics = analytics
+        self._analytics = analytics
+        self._analytics_provider = analytics_provider
         self._setup_logging()
+        # Query-only analysis is deterministic, so repeated prompts (retries, replays) skip the scans.
+        # Historical lookups, context and file factors still run on every request.
+        self._analyze_query = functools.lru_cache(maxsize=_QUERY_CACHE_SIZE)(self._analyze_query_uncached)
     
     def _setup_logging(self):
         """Setup logging for router"""
@@ -182,6 +203,22 @@ class IntelligentRouter:
             logger.addHandler(handler)
             logger.setLevel(logging.INFO)
     
+    @property
+    def analytics(self):
+        """ZenAnalytics used for historical patterns, resolved through analytics_provider if one was given"""
+        if self._analytics_provider is not None:
+            return self._analytics_provider()
+        return self._analytics
+    
+    @analytics.setter
+    def analytics(self, analytics):
+        self._analytics = analytics
+        self._analytics_provider = None
+    
+    def cache_clear(self):
+        """Drop memoized query analysis"""
+        self._analyze_query.cache_clear()
+    
     def route_request(
         self,
         user_query: str,
@@ -207,9 +244,9 @@ class IntelligentRouter:
         files = files or []
         
         # Analyze request characteristics
-        complexity = self._analyze_complexity(user_query, context, files)
-        risk = self._assess_risk(user_query, context)
-        intent = self._extract_intent(user_query)
+        complexity_keywords, risk_keywords, intent, tool_keywords = self._analyze_query(user_query)
+        complexity = self._analyze_complexity(user_query, context, files, complexity_keywords)
+        risk = self._assess_risk(user_query, context, risk_keywords)
         
         logger.info(
             f"Routing analysis - Intent: {intent}, "
@@ -222,15 +259,13 @@ class IntelligentRouter:
             strategy = self._get_tool_strategy(tool, override_strategy)
             reasoning = f"Manual override to {tool}"
             confidence = 1.0
+            alternatives = self._get_alternative_tools(intent, complexity, risk, exclude=tool)
         else:
-            # Use intelligent routing
-            tool, strategy, reasoning, confidence = self._select_tool(
-                user_query, intent, complexity, risk
+            # Use intelligent routing; alternatives come from the same scoring pass
+            tool, strategy, reasoning, confidence, alternatives = self._select_tool(
+                user_query, intent, complexity, risk, tool_keywords
             )
         
-        # Get alternatives
-        alternatives = self._get_alternative_tools(intent, complexity, risk, exclude=tool)
-        
         # Create routing decision
         decision = RoutingDecision(
             tool=tool,
@@ -259,7 +294,8 @@ class IntelligentRouter:
         self,
         user_query: str,
         context: Dict,
-        files: List[str]
+        files: List[str],
+        keyword_score: Optional[int] = None,
     ) -> int:
         """
         Analyze task complexity (1-10 scale).
@@ -268,17 +304,17 @@ class IntelligentRouter:
             user_query: User's query
             context: Context dictionary
             files: List of files involved
+            keyword_score: Complexity indicator score from _score_query, computed if not given
             
         Returns:
             Complexity score (1-10)
         """
         complexity = 1  # Base complexity
-        query_lower = user_query.lower()
         
         # Check complexity indicators
-        for indicator, score in self.COMPLEXITY_INDICATORS.items():
-            if indicator.replace("_", " ") in query_lower:
-                complexity += score
+        if keyword_score is None:
+            keyword_score = self._score_query(user_query.lower())[0]
+        complexity += keyword_score
         
         # File count factor
         if len(files) > 10:
@@ -289,9 +325,10 @@ class IntelligentRouter:
             complexity += 1
         
         # Query length factor (longer queries often more complex)
-        if len(user_query) > 500:
+        query_length = len(user_query)
+        if query_length > 500:
             complexity += 2
-        elif len(user_query) > 200:
+        elif query_length > 200:
             complexity += 1
         
         # Context complexity
@@ -300,36 +337,39 @@ class IntelligentRouter:
         if context.get("dependencies"):
             complexity += 1
         
+        # One scan finds both question marks and numbered list items
+        hits = _Q_OR_NUMLIST.findall(user_query)
+        question_count = hits.count("?")
+        
         # Check for multiple questions
-        question_count = user_query.count("?")
         if question_count > 2:
             complexity += 1
         
         # Check for lists/enumerations (often indicates complexity)
-        if re.search(r"\d+\.", user_query):  # Numbered lists
+        if len(hits) != question_count:  # Numbered lists
             complexity += 1
         
         # Cap at 10
         return min(complexity, 10)
     
-    def _assess_risk(self, user_query: str, context: Dict) -> int:
+    def _assess_risk(self, user_query: str, context: Dict, keyword_score: Optional[int] = None) -> int:
         """
         Assess task risk level (1-10 scale).
         
         Args:
             user_query: User's query
             context: Context dictionary
+            keyword_score: Risk indicator, urgency and negation score from _score_query, computed if not given
             
         Returns:
             Risk score (1-10)
         """
         risk = 1  # Base risk
-        query_lower = user_query.lower()
         
-        # Check risk indicators
-        for indicator, score in self.RISK_INDICATORS.items():
-            if indicator.replace("_", " ") in query_lower:
-                risk += score
+        # Check risk indicators, urgency and negation words
+        if keyword_score is None:
+            keyword_score = self._score_query(user_query.lower())[1]
+        risk += keyword_score
         
         # Environment risk
         if context.get("environment") == "production":
@@ -337,44 +377,95 @@ class IntelligentRouter:
         elif context.get("environment") == "staging":
             risk += 1
         
-        # Urgency indicator
-        if any(word in query_lower for word in ["urgent", "critical", "asap", "emergency"]):
-            risk += 2
-        
-        # Negation words often indicate problems (higher risk)
-        if any(word in query_lower for word in ["don't", "doesn't", "won't", "can't", "not working"]):
-            risk += 1
-        
         # Cap at 10
         return min(risk, 10)
     
-    def _extract_intent(self, user_query: str) -> str:
+    def _analyze_query_uncached(self, user_query: str) -> Tuple[int, int, str, FrozenSet[str]]:
         """
-        Extract user intent from natural language query.
+        Keyword scores and intent for a query; memoized per router as _analyze_query.
         
         Args:
             user_query: User's query
             
         Returns:
-            Intent category (review, debug, design, implement, etc.)
+            Tuple of (complexity keyword score, risk keyword score, intent, tool keywords in the query)
         """
         query_lower = user_query.lower()
+        matched = self._match_keywords(query_lower)
+        complexity_keywords, risk_keywords = self._score_query(query_lower, matched)
+        tool_keywords = frozenset(keyword for bucket, keyword, _ in matched if bucket == "tool")
+        return complexity_keywords, risk_keywords, self._extract_intent(query_lower), tool_keywords
+    
+    def _match_keywords(self, query_lower: str) -> Set[Tuple[str, str, int]]:
+        """
+        Find every indicator and tool keyword in the query with one table-driven scan.
+        
+        Args:
+            query_lower: Lowercased user query
+            
+        Returns:
+            Set of matched (bucket, group, score) entries from _KEYWORD_ENTRIES
+        """
+        matched = set()
+        for keyword, entries in _KEYWORD_ENTRIES.items():
+            if keyword in query_lower:
+                matched.update(entries)
+        return matched
+    
+    def _score_query(
+        self,
+        query_lower: str,
+        matched: Optional[Set[Tuple[str, str, int]]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Score complexity and risk keywords from a single keyword-table scan of the query.
+        
+        Each indicator counts once however often it appears; the urgency and
+        negation word groups count once each (+2 and +1 risk), matched as
+        whole words against the query's tokens.
+        
+        Args:
+            query_lower: Lowercased user query
+            matched: Entries from _match_keywords, computed if not given
+            
+        Returns:
+            Tuple of (complexity keyword score, risk keyword score)
+        """
+        if matched is None:
+            matched = self._match_keywords(query_lower)
         
-        # Track matches for each intent
-        intent_scores: Dict[str, int] = {}
+        complexity = sum(score for bucket, _, score in matched if bucket == "complexity")
+        risk = sum(score for bucket, _, score in matched if bucket == "risk")
         
-        for intent, patterns in self.INTENT_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                matches = re.findall(pattern, query_lower, re.IGNORECASE)
-                score += len(matches)
+        # Tokenize once, then each word group is a set intersection instead of a substring scan per word
+        tokens = set(_WORD_RE.findall(query_lower))
+        if not tokens.isdisjoint(self.URGENCY_WORDS):
+            risk += 2
+        # Negation words often indicate problems (higher risk)
+        if not tokens.isdisjoint(self.NEGATION_WORDS) or "not working" in query_lower:
+            risk += 1
+        return complexity, risk
+    
+    def _extract_intent(self, user_query: str) -> str:
+        """
+        Extract user intent from natural language query.
+        
+        Args:
+            user_query: User's query
             
-            if score > 0:
-                intent_scores[intent] = score
+        Returns:
+            Intent category (review, debug, design, implement, etc.)
+        """
+        # Track matches for each intent in a single pass; the named group that
+        # matched ("<intent>__<n>") says which intent's pattern it was. The
+        # pattern is case-insensitive, so the query needn't be lowercased first.
+        intent_scores = Counter(
+            match.lastgroup.split("__", 1)[0] for match in _INTENT_RE.finditer(user_query)
+        )
         
-        # Return intent with highest score
+        # Return intent with highest score, ties going to the first in INTENT_PATTERNS
         if intent_scores:
-            return max(intent_scores.items(), key=lambda x: x[1])[0]
+            return max(self.INTENT_PATTERNS, key=intent_scores.__getitem__)
         
         # Default to general if no clear intent
         return "general"
@@ -384,8 +475,9 @@ class IntelligentRouter:
         user_query: str,
         intent: str,
         complexity: int,
-        risk: int
-    ) -> Tuple[str, RoutingStrategy, str, float]:
+        risk: int,
+        tool_keywords: Optional[FrozenSet[str]] = None,
+    ) -> Tuple[str, RoutingStrategy, str, float, List[str]]:
         """
         Select the best tool based on analysis.
         
@@ -394,9 +486,10 @@ class IntelligentRouter:
             intent: Extracted intent
             complexity: Complexity score
             risk: Risk score
+            tool_keywords: best_for keywords found in the query, computed if not given
             
         Returns:
-            Tuple of (tool, strategy, reasoning, confidence)
+            Tuple of (tool, strategy, reasoning, confidence, alternative tools)
         """
         # Priority 1: High risk -> Consensus
         if risk >= 8:
@@ -404,13 +497,15 @@ class IntelligentRouter:
                 "consensus",
                 RoutingStrategy.CONSENSUS,
                 f"High risk ({risk}/10) requires multi-model consensus",
-                0.95
+                0.95,
+                self._get_alternative_tools(intent, complexity, risk, exclude="consensus"),
             )
         
         # Priority 2: Check historical patterns
-        if self.analytics:
+        analytics = self.analytics
+        if analytics:
             try:
-                recommendation = self.analytics.get_best_tool_for(
+                recommendation = analytics.get_best_tool_for(
                     intent=intent,
                     complexity=complexity,
                     risk=risk,
@@ -426,26 +521,39 @@ class IntelligentRouter:
                         f"used {recommendation['usage_count']} times)"
                     )
                     confidence = recommendation["success_rate"]
+                    alternatives = self._get_alternative_tools(intent, complexity, risk, exclude=tool)
                     
-                    return (tool, strategy, reasoning, confidence)
+                    return (tool, strategy, reasoning, confidence, alternatives)
             except Exception as e:
                 logger.warning(f"Failed to get historical recommendation: {e}")
         
         # Priority 3: Match intent to tool capabilities
+        if tool_keywords is None:
+            tool_keywords = frozenset(
+                keyword for bucket, keyword, _ in self._match_keywords(user_query.lower()) if bucket == "tool"
+            )
+        
+        # Each best_for keyword found in the intent or query adds 5 to every tool listing it
+        intent_keywords = _intent_tool_keywords(intent)
+        keyword_scores = Counter()
+        for keyword in tool_keywords | intent_keywords:
+            for tool in _KEYWORD_TO_TOOLS[keyword]:
+                keyword_scores[tool] += 5
+        
         best_tool = None
         best_score = 0
+        # Tools matching the intent, gathered in the same pass to serve as alternatives
+        intent_matches = []
         
-        for tool, capabilities in self.TOOL_CAPABILITIES.items():
-            score = 0
-            
+        for tool, max_complexity, best_for in zip(_TOOL_NAMES, _TOOL_MAX_COMPLEXITY, _TOOL_BEST_FOR):
             # Check if tool can handle complexity
-            if complexity > capabilities["max_complexity"]:
+            if complexity > max_complexity:
                 continue
             
-            # Check intent match
-            for keyword in capabilities["best_for"]:
-                if keyword in intent or keyword in user_query.lower():
-                    score += 5
+            if not best_for.isdisjoint(intent_keywords):
+                intent_matches.append(tool)
+            
+            score = keyword_scores[tool]
             
             # Prefer simpler tools for simpler tasks
             if complexity <= 4 and tool == "chat":
@@ -473,8 +581,9 @@ class IntelligentRouter:
         confidence = 0.7 if best_score > 0 else 0.5
         
         reasoning = self._generate_reasoning(best_tool, intent, complexity, risk)
+        alternatives = [tool for tool in intent_matches if tool != best_tool][:3]
         
-        return (best_tool, strategy, reasoning, confidence)
+        return (best_tool, strategy, reasoning, confidence, alternatives)
     
     def _get_tool_strategy(
         self,
@@ -501,20 +610,19 @@ class IntelligentRouter:
     ) -> List[str]:
         """Get alternative tool suggestions"""
         alternatives = []
+        intent_keywords = _intent_tool_keywords(intent)
         
-        for tool, capabilities in self.TOOL_CAPABILITIES.items():
+        for tool, max_complexity, best_for in zip(_TOOL_NAMES, _TOOL_MAX_COMPLEXITY, _TOOL_BEST_FOR):
             if tool == exclude:
                 continue
             
             # Check if tool can handle the task
-            if complexity > capabilities["max_complexity"]:
+            if complexity > max_complexity:
                 continue
             
             # Check intent match
-            for keyword in capabilities["best_for"]:
-                if keyword in intent:
-                    alternatives.append(tool)
-                    break
+            if not best_for.isdisjoint(intent_keywords):
+                alternatives.append(tool)
         
         return alternatives[:3]  # Return top 3 alternatives
     
@@ -584,3 +692,62 @@ class IntelligentRouter:
         
         return suggestion.strip()
 
+
+# All INTENT_PATTERNS fused into one alternation, compiled once at import, so
+# the query is scanned once instead of once per pattern
+_INTENT_RE = re.compile(
+    "|".join(
+        f"(?P<{intent}__{index}>{pattern})"
+        for intent, patterns in IntelligentRouter.INTENT_PATTERNS.items()
+        for index, pattern in enumerate(patterns)
+    ),
+    re.IGNORECASE,
+)
+
+
+# TOOL_CAPABILITIES (the source of truth) as parallel tuples in the same order, so
+# the per-request loops read plain values instead of nested dict lookups
+_TOOL_NAMES = tuple(IntelligentRouter.TOOL_CAPABILITIES)
+_TOOL_MAX_COMPLEXITY = tuple(
+    capabilities["max_complexity"] for capabilities in IntelligentRouter.TOOL_CAPABILITIES.values()
+)
+_TOOL_BEST_FOR = tuple(
+    frozenset(capabilities["best_for"]) for capabilities in IntelligentRouter.TOOL_CAPABILITIES.values()
+)
+
+
+def _build_keyword_to_tools() -> Dict[str, Tuple[str, ...]]:
+    """Invert TOOL_CAPABILITIES best_for lists into keyword -> tools, in TOOL_CAPABILITIES order"""
+    keyword_to_tools: Dict[str, List[str]] = {}
+    for tool, capabilities in IntelligentRouter.TOOL_CAPABILITIES.items():
+        for keyword in capabilities["best_for"]:
+            keyword_to_tools.setdefault(keyword, []).append(tool)
+    return {keyword: tuple(tools) for keyword, tools in keyword_to_tools.items()}
+
+
+_KEYWORD_TO_TOOLS = _build_keyword_to_tools()
+
+
+@functools.lru_cache(maxsize=64)
+def _intent_tool_keywords(intent: str) -> FrozenSet[str]:
+    """best_for keywords contained in an intent name"""
+    return frozenset(keyword for keyword in _KEYWORD_TO_TOOLS if keyword in intent)
+
+
+def _build_keyword_entries() -> Dict[str, Tuple[Tuple[str, str, int], ...]]:
+    """Map each scored keyword to its (bucket, group, score) entries"""
+    entries: Dict[str, List[Tuple[str, str, int]]] = {}
+    for bucket, indicators in (
+        ("complexity", IntelligentRouter.COMPLEXITY_INDICATORS),
+        ("risk", IntelligentRouter.RISK_INDICATORS),
+    ):
+        for indicator, score in indicators.items():
+            # "security" is both a complexity and a risk indicator, so keywords can carry several entries
+            entries.setdefault(indicator.replace("_", " "), []).append((bucket, indicator, score))
+    # Tool keywords ride the same scan; _select_tool scores them per tool
+    for keyword in _KEYWORD_TO_TOOLS:
+        entries.setdefault(keyword, []).append(("tool", keyword, 5))
+    return {keyword: tuple(keyword_entries) for keyword, keyword_entries in entries.items()}
+
+
+_KEYWORD_ENTRIES = _build_keyword_entries()
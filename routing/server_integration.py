@@ -4,6 +4,7 @@ Provides routing suggestions and analytics logging for tool executions.
 """
 
 import logging
+import threading
 import time
 from typing import Any, Dict, Optional
 
@@ -30,20 +31,33 @@ class RouterIntegration:
         self.enable_analytics = enable_analytics
         self.enable_suggestions = enable_suggestions
         
-        # Initialize analytics if enabled
-        self.analytics = None
-        if self.enable_analytics:
-            try:
-                self.analytics = ZenAnalytics()
-                logger.info("Analytics enabled for router integration")
-            except Exception as e:
-                logger.warning(f"Failed to initialize analytics: {e}")
-                self.analytics = None
+        # Analytics opens its database on first use rather than at startup
+        self._analytics = None
+        self._analytics_initialized = not self.enable_analytics
+        self._analytics_lock = threading.Lock()
         
         # Initialize router
-        self.router = IntelligentRouter(analytics=self.analytics)
+        self.router = IntelligentRouter(analytics_provider=self._get_analytics)
         logger.info("Router integration initialized")
     
+    @property
+    def analytics(self) -> Optional[ZenAnalytics]:
+        """ZenAnalytics instance, created on first access; None if disabled or unavailable"""
+        return self._get_analytics()
+    
+    def _get_analytics(self) -> Optional[ZenAnalytics]:
+        """Create analytics once, on first use, if enabled"""
+        if not self._analytics_initialized:
+            with self._analytics_lock:
+                if not self._analytics_initialized:
+                    try:
+                        self._analytics = ZenAnalytics()
+                        logger.info("Analytics enabled for router integration")
+                    except Exception as e:
+                        logger.warning(f"Failed to initialize analytics: {e}")
+                    self._analytics_initialized = True
+        return self._analytics
+    
     def get_routing_suggestion(
         self,
         user_query: str,
@@ -151,10 +165,15 @@ class RouterIntegration:
         except Exception as e:
             logger.error(f"Failed to log routing decision: {e}")
     
+    def cache_clear(self):
+        """Drop the router's memoized query analysis"""
+        self.router.cache_clear()
+    
     def close(self):
         """Close analytics connection"""
-        if self.analytics:
-            self.analytics.close()
+        # Read the attribute directly so closing never opens analytics just to close it
+        if self._analytics:
+            self._analytics.close()
             logger.info("Router integration closed")
     
     def __enter__(self):
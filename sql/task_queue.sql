@@ -1,5 +1,6 @@
 -- Task Queue Schema for Postgres
 -- Used for persistent task management and multi-window coordination
+-- Apply task_queue_counts.sql after this file for the get_task_stats counters
 
 CREATE TABLE IF NOT EXISTS task_queue (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -19,6 +20,13 @@ CREATE INDEX IF NOT EXISTS idx_task_status ON task_queue(status);
 CREATE INDEX IF NOT EXISTS idx_task_assigned ON task_queue(assigned_to);
 CREATE INDEX IF NOT EXISTS idx_task_priority ON task_queue(priority DESC, created_at ASC);
 CREATE INDEX IF NOT EXISTS idx_task_created ON task_queue(created_at);
+-- Partial index serving dequeue: pending tasks already in priority order, so
+-- ORDER BY ... LIMIT reads only the rows it returns instead of sorting the backlog
+CREATE INDEX IF NOT EXISTS idx_task_pending_priority ON task_queue(priority DESC, created_at ASC)
+    WHERE status = 'pending';
+-- Shared (unassigned) pending tasks any window can pick up
+CREATE INDEX IF NOT EXISTS idx_task_pending_unassigned ON task_queue(priority DESC, created_at ASC)
+    WHERE status = 'pending' AND assigned_to IS NULL;
 
 -- Function to automatically update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_task_updated_at()
@@ -30,6 +38,7 @@ END;
 $$ LANGUAGE plpgsql;
 
 -- Trigger to automatically update updated_at
+DROP TRIGGER IF EXISTS task_queue_updated_at ON task_queue;
 CREATE TRIGGER task_queue_updated_at
     BEFORE UPDATE ON task_queue
     FOR EACH ROW
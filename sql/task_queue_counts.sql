@@ -0,0 +1,48 @@
+-- Incremental task statistics for task_queue (requires task_queue.sql)
+-- Safe to re-run: every statement is idempotent
+
+-- Running per-(status, task_type) counters kept current by triggers, so
+-- get_task_stats reads a handful of rows instead of scanning task_queue
+CREATE TABLE IF NOT EXISTS task_queue_counts (
+    status VARCHAR NOT NULL,
+    task_type VARCHAR NOT NULL,
+    task_count BIGINT NOT NULL DEFAULT 0,
+    created_epoch_sum DOUBLE PRECISION NOT NULL DEFAULT 0, -- SUM(EXTRACT(EPOCH FROM created_at))
+    PRIMARY KEY (status, task_type)
+);
+
+CREATE OR REPLACE FUNCTION update_task_queue_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE task_queue_counts
+        SET task_count = task_count - 1,
+            created_epoch_sum = created_epoch_sum - COALESCE(EXTRACT(EPOCH FROM OLD.created_at), 0)
+        WHERE status = OLD.status AND task_type = OLD.task_type;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_queue_counts (status, task_type, task_count, created_epoch_sum)
+        VALUES (NEW.status, NEW.task_type, 1, COALESCE(EXTRACT(EPOCH FROM NEW.created_at), 0))
+        ON CONFLICT (status, task_type) DO UPDATE
+        SET task_count = task_queue_counts.task_count + 1,
+            created_epoch_sum = task_queue_counts.created_epoch_sum + EXCLUDED.created_epoch_sum;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Dropped first so concurrent or repeated startups can re-run this file
+DROP TRIGGER IF EXISTS task_queue_counts_insert_delete ON task_queue;
+CREATE TRIGGER task_queue_counts_insert_delete
+    AFTER INSERT OR DELETE ON task_queue
+    FOR EACH ROW
+    EXECUTE FUNCTION update_task_queue_counts();
+
+DROP TRIGGER IF EXISTS task_queue_counts_update ON task_queue;
+CREATE TRIGGER task_queue_counts_update
+    AFTER UPDATE OF status, task_type, created_at ON task_queue
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status
+          OR OLD.task_type IS DISTINCT FROM NEW.task_type
+          OR OLD.created_at IS DISTINCT FROM NEW.created_at)
+    EXECUTE FUNCTION update_task_queue_counts();
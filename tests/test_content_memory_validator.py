@@ -0,0 +1,356 @@
+"""
+Tests for the Content Memory Validator
+"""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import types
+from datetime import datetime
+
+import pytest
+
+import content_memory_validator
+from content_memory_validator import ContentMemoryValidator
+from tools import memory_validator
+
+
+class TestContentMemoryValidator:
+    """Test Content Memory Validator storage and conflict detection"""
+
+    @pytest.fixture
+    def validator(self, tmp_path):
+        """Create a validator backed by a temporary database"""
+        validator = ContentMemoryValidator(str(tmp_path / "content_memory.db"))
+        yield validator
+        validator.close()
+
+    def test_uses_wal_journal(self, validator):
+        """Test the shared connection runs in WAL mode"""
+        mode = validator.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_store_and_retrieve(self, validator):
+        """Test a stored memory is returned on retrieve"""
+        validator.store_memory("TICKET-001", "Schema design", "content", session_id="s1")
+
+        memory, conflict = validator.retrieve_memory("TICKET-001")
+
+        assert memory.concept_summary == "Schema design"
+        assert memory.session_id == "s1"
+        assert conflict is None
+
+    def test_competing_concepts_detected(self, validator):
+        """Test competing concepts are logged and reported as a conflict"""
+        validator.store_memory("TICKET-030", "Concept A", "a")
+        validator.store_memory("TICKET-030", "Concept B", "b")
+        validator.store_memory("TICKET-030", "Concept C", "c")
+
+        memory, conflict = validator.retrieve_memory("TICKET-030")
+
+        assert memory.concept_summary == "Concept C"
+        assert conflict.severity == "critical"
+        assert len(conflict.competing_memories) == 3
+
+        health = validator.health_check()
+        assert health["total_memories"] == 3
+        assert health["conflicts_detected"] == 1
+        assert set(health["conflicts"][0]["concepts"]) == {"Concept A", "Concept B", "Concept C"}
+
+    def test_store_rolls_back_on_failure(self, validator, monkeypatch):
+        """Test a failed write leaves no partial rows behind"""
+        validator.store_memory("TICKET-002", "Original", "x")
+
+        def fail(*args, **kwargs):
+            raise sqlite3.OperationalError("simulated failure")
+
+        monkeypatch.setattr(validator, "_invalidate_stale_memories_tx", fail)
+
+        with pytest.raises(sqlite3.OperationalError):
+            validator.store_memory("TICKET-002", "Replacement", "y")
+
+        assert [m.concept_summary for m in validator.get_memories("TICKET-002")] == ["Original"]
+        assert validator.conn.execute("SELECT COUNT(*) FROM conflict_log").fetchone()[0] == 0
+
+    def test_store_memories_bulk(self, validator):
+        """Test bulk store inserts every item and invalidates older rows"""
+        validator.store_memory("TICKET-003", "Old", "old")
+
+        stored = validator.store_memories([
+            ("TICKET-003", "New", "new", None, "bulk"),
+            ("TICKET-004", "Other", "other"),
+        ])
+
+        assert [m.conflict_count for m in stored] == [1, 0]
+        memories = validator.get_memories("TICKET-003")
+        assert [(m.concept_summary, m.is_stale) for m in memories] == [("New", False), ("Old", True)]
+        assert memories[0].session_id == "bulk"
+        assert validator.get_memories("TICKET-004")[0].session_id == "default"
+
+    def test_unchanged_file_skips_hashing(self, validator, tmp_path, monkeypatch):
+        """Test an unmodified source file is not re-read on retrieve"""
+        source = tmp_path / "ticket.md"
+        source.write_text("original")
+        validator.store_memory("TICKET-005", "Ticket", "original", file_path=str(source))
+
+        def fail(path):
+            raise AssertionError("file should not be hashed")
+
+        monkeypatch.setattr(content_memory_validator, "_sha256_file", fail)
+        memory, conflict = validator.retrieve_memory("TICKET-005")
+
+        assert memory.is_stale is False
+        assert conflict is None
+
+    def test_modified_file_marks_memory_stale(self, validator, tmp_path):
+        """Test a file modified after storing produces a critical conflict"""
+        source = tmp_path / "ticket.md"
+        source.write_text("original")
+        validator.store_memory("TICKET-006", "Ticket", "original", file_path=str(source))
+
+        source.write_text("rewritten")
+        future = time.time() + 60
+        os.utime(source, (future, future))
+        memory, conflict = validator.retrieve_memory("TICKET-006")
+
+        assert memory.is_stale is True
+        assert conflict.recommended_action == "UPDATE_MEMORY_FROM_FILESYSTEM"
+        assert conflict.filesystem_state["content_hash"] == hashlib.sha256(b"rewritten").hexdigest()
+
+    def test_get_memories_cache_invalidated_on_write(self, validator):
+        """Test cached reads are refreshed after a store for the same identifier"""
+        validator.store_memory("TICKET-007", "First", "1")
+        assert len(validator.get_memories("TICKET-007")) == 1
+        assert "TICKET-007" in validator._mem_cache
+
+        validator.store_memory("TICKET-007", "Second", "2")
+
+        assert "TICKET-007" not in validator._mem_cache
+        assert [m.concept_summary for m in validator.get_memories("TICKET-007")] == ["Second", "First"]
+
+    def test_read_overlapping_write_not_cached(self, validator, monkeypatch):
+        """Test rows read before a concurrent write commits aren't cached after its invalidation"""
+        validator.store_memory("TICKET-016", "First", "1")
+        get_conn = validator._get_conn
+
+        @contextlib.contextmanager
+        def read_then_write():
+            with get_conn() as conn:
+                rows = conn.execute(content_memory_validator._SQL_GET_MEMORIES, ("TICKET-016",)).fetchall()
+            # The write commits (and invalidates) after this reader has its rows but before it caches them
+            monkeypatch.setattr(validator, "_get_conn", get_conn)
+            validator.store_memory("TICKET-016", "Second", "2")
+            yield types.SimpleNamespace(execute=lambda *args: types.SimpleNamespace(fetchall=lambda: rows))
+
+        monkeypatch.setattr(validator, "_get_conn", read_then_write)
+
+        assert len(validator.get_memories("TICKET-016")) == 1
+        assert "TICKET-016" not in validator._mem_cache
+        assert len(validator.get_memories("TICKET-016")) == 2
+
+    def test_get_memories_cache_bypass(self, validator):
+        """Test cache=False reads rows written outside the validator"""
+        validator.store_memory("TICKET-008", "Cached", "1")
+        validator.get_memories("TICKET-008")
+        validator.conn.execute("UPDATE content_memories SET concept_summary = 'Edited' WHERE identifier = 'TICKET-008'")
+
+        assert validator.get_memories("TICKET-008")[0].concept_summary == "Cached"
+        assert validator.get_memories("TICKET-008", cache=False)[0].concept_summary == "Edited"
+
+    def test_store_memory_accepts_bytes(self, validator):
+        """Test bytes and str content hash identically"""
+        from_bytes = validator.store_memory("TICKET-009", "Bytes", "é".encode())
+        from_str = validator.store_memory("TICKET-010", "Str", "é")
+
+        assert from_bytes.content_hash == from_str.content_hash
+
+    def test_bloom_skips_lookup_for_new_identifier(self, validator, monkeypatch):
+        """Test unseen identifiers do not query existing memories"""
+        calls = []
+        original = validator.get_memories
+        monkeypatch.setattr(validator, "get_memories", lambda *a, **kw: calls.append(a) or original(*a, **kw))
+
+        validator.store_memory("TICKET-011", "First", "1")
+        assert calls == []
+
+        validator.store_memory("TICKET-011", "Second", "2")
+        assert calls == [("TICKET-011",)]
+
+    def test_bloom_rebuilt_from_existing_rows(self, validator, tmp_path):
+        """Test a reopened validator still detects existing identifiers"""
+        validator.store_memory("TICKET-012", "First", "1")
+
+        with ContentMemoryValidator(validator.db_path) as reopened:
+            assert "TICKET-012" in reopened._id_bloom
+            assert reopened.store_memory("TICKET-012", "Second", "2").conflict_count == 1
+
+    def test_conflict_detected_across_validators(self, validator):
+        """Test identifiers written by another validator on the same db still conflict"""
+        with ContentMemoryValidator(validator.db_path) as other:
+            validator.store_memory("TICKET-014", "Concept A", "a")
+            assert other.store_memory("TICKET-014", "Concept B", "b").conflict_count == 1
+
+        assert validator.conn.execute("SELECT COUNT(*) FROM conflict_log").fetchone()[0] == 1
+
+    def test_tool_reuses_validator_per_database(self, tmp_path, monkeypatch):
+        """Test the memory validator tool keeps one validator per database across calls"""
+        monkeypatch.setattr(memory_validator, "_validators", {})
+        first = memory_validator._get_validator(str(tmp_path / "a.db"))
+        try:
+            assert memory_validator._get_validator(str(tmp_path / "a.db")) is first
+            other = memory_validator._get_validator(str(tmp_path / "b.db"))
+            assert other is not first
+            other.close()
+        finally:
+            first.close()
+
+    def test_returned_memories_are_caller_owned(self, validator):
+        """Test each read builds new instances, so callers may keep or mutate them"""
+        validator.store_memory("TICKET-013", "Owned", "1")
+        memories = validator.get_memories("TICKET-013")
+        memories[0].is_stale = True
+
+        reread = validator.get_memories("TICKET-013")
+
+        assert reread[0] is not memories[0]
+        assert reread[0].is_stale is False
+
+    def test_legacy_rows_backfilled_with_epoch_ns(self, tmp_path):
+        """Test databases without epoch columns are migrated on open"""
+        db_path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE content_memories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, identifier TEXT NOT NULL, concept_summary TEXT NOT NULL,
+                content_hash TEXT NOT NULL, file_path TEXT, file_mtime TEXT, memory_timestamp TEXT NOT NULL,
+                session_id TEXT NOT NULL, validated_at TEXT, is_stale INTEGER DEFAULT 0,
+                conflict_count INTEGER DEFAULT 0, metadata TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+            )
+        """)
+        conn.execute("""
+            INSERT INTO content_memories (identifier, concept_summary, content_hash, memory_timestamp,
+                                          session_id, created_at, updated_at)
+            VALUES ('TICKET-014', 'Legacy', 'hash', '2025-01-01T12:00:00', 's', 'now', 'now')
+        """)
+        conn.commit()
+        conn.close()
+
+        with ContentMemoryValidator(db_path) as validator:
+            memory = validator.get_memories("TICKET-014")[0]
+            assert memory.memory_timestamp_ns == int(datetime(2025, 1, 1, 12).timestamp() * 1e9)
+            assert validator.store_memory("TICKET-014", "Legacy", "new").conflict_count == 1
+            assert validator.get_memories("TICKET-014")[1].is_stale is True
+
+    def test_same_tick_log_events_all_kept(self, validator, monkeypatch):
+        """Test audit events sharing an identifier and timestamp are numbered, not dropped"""
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2026, 1, 1, 12)
+
+        monkeypatch.setattr(content_memory_validator, "datetime", FrozenDatetime)
+        for concept in ("Concept A", "Concept B", "Concept C"):
+            validator.store_memory("TICKET-016", concept, concept)
+        for memory in validator.get_memories("TICKET-016"):
+            validator._log_validation(memory)
+        validator.flush_validation_log()
+
+        conflicts = validator.conn.execute("SELECT seq FROM conflict_log ORDER BY seq").fetchall()
+        audits = validator.conn.execute("SELECT seq FROM validation_audit ORDER BY seq").fetchall()
+        assert conflicts == [(1,), (2,), (3,)]
+        assert audits == [(1,), (2,), (3,)]
+
+    def test_legacy_log_tables_rebuilt(self, tmp_path):
+        """Test rowid-era audit log tables are rebuilt WITHOUT ROWID with their rows numbered"""
+        db_path = str(tmp_path / "legacy_logs.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE conflict_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, identifier TEXT NOT NULL, detection_time TEXT NOT NULL,
+                conflict_type TEXT NOT NULL, competing_count INTEGER NOT NULL, filesystem_exists INTEGER NOT NULL,
+                resolution_action TEXT, severity TEXT NOT NULL, details TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO conflict_log (identifier, detection_time, conflict_type, competing_count, "
+            "filesystem_exists, severity) VALUES (?, '2025-01-01T12:00:00', 'MULTIPLE_CONCEPTS', 2, 0, 'medium')",
+            [("TICKET-017",), ("TICKET-017",), ("TICKET-018",)],
+        )
+        conn.commit()
+        conn.close()
+
+        with ContentMemoryValidator(db_path) as validator:
+            (ddl,) = validator.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'conflict_log'").fetchone()
+            rows = validator.conn.execute("SELECT identifier, seq FROM conflict_log ORDER BY identifier, seq")
+
+            assert "WITHOUT ROWID" in ddl
+            assert rows.fetchall() == [("TICKET-017", 1), ("TICKET-017", 2), ("TICKET-018", 1)]
+
+    def test_analyze_runs_after_insert_threshold(self, validator):
+        """Test planner statistics are gathered once enough rows are written"""
+        validator.ANALYZE_AFTER_INSERTS = 3
+        validator.store_memories([(f"TICKET-1{i:02d}", "Bulk", str(i)) for i in range(3)])
+
+        assert validator._analyzed is True
+        assert validator.conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+    def test_get_memories_soa_columns(self, validator):
+        """Test the column-wise view lines up with get_memories"""
+        validator.store_memory("TICKET-015", "First", "1")
+        validator.store_memory("TICKET-015", "Second", "2")
+
+        soa = validator.get_memories_soa("TICKET-015")
+
+        assert soa["concept_summary"] == [m.concept_summary for m in validator.get_memories("TICKET-015")]
+        assert soa["is_stale"] == [0, 1]
+        assert validator.get_memories_soa("MISSING")["identifier"] == []
+
+    def test_validation_log_buffered_until_flush(self, validator):
+        """Test reads do not write audit rows until the buffer is flushed"""
+        validator.store_memory("TICKET-016", "Audited", "1")
+        validator.retrieve_memory("TICKET-016")
+
+        count = "SELECT COUNT(*) FROM validation_audit"
+        assert validator.conn.execute(count).fetchone()[0] == 0
+
+        validator.flush_validation_log()
+        assert validator.conn.execute(count).fetchone()[0] == 1
+
+    def test_validation_log_flushes_when_full(self, validator):
+        """Test a full buffer is written in one batch"""
+        validator.VALIDATION_FLUSH_SIZE = 2
+        validator.store_memory("TICKET-017", "A", "1")
+        validator.store_memory("TICKET-018", "B", "2")
+
+        validator.retrieve_memory("TICKET-017")
+        validator.retrieve_memory("TICKET-018")
+
+        assert validator._validation_buffer == []
+        assert validator.conn.execute("SELECT COUNT(*) FROM validation_audit").fetchone()[0] == 2
+
+    def test_concurrent_reads_and_writes(self, validator):
+        """Test pooled readers and the serialized writer work across threads"""
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    validator.store_memory(f"TICKET-T{n}", f"Concept {i % 2}", str(i))
+                    validator.retrieve_memory(f"TICKET-T{n}")
+                    validator.health_check()
+            except Exception as e:  # pragma: no cover - surfaced by the assert below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert validator.health_check()["total_memories"] == 80
+        assert validator._read_conns_opened <= validator.READ_POOL_SIZE
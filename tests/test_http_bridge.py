@@ -0,0 +1,350 @@
+"""
+Tests for the HTTP bridge REST endpoints
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+
+import pytest
+from fastapi.testclient import TestClient
+from mcp.types import TextContent
+
+import http_bridge
+
+
+class EchoTool:
+    """Stand-in tool that echoes its prompt without calling a model"""
+
+    description = "Echo the prompt"
+
+    def __init__(self):
+        self.calls = []
+
+    async def execute(self, arguments):
+        self.calls.append(arguments)
+        return [TextContent(type="text", text=f"echo: {arguments['prompt']}")]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Bridge client with analytics disabled so tests never touch the DuckDB file"""
+
+    def no_analytics(*args, **kwargs):
+        raise RuntimeError("analytics disabled in tests")
+
+    monkeypatch.setattr(http_bridge, "ZenAnalytics", no_analytics)
+    monkeypatch.setattr(http_bridge, "tool_instances", {})
+    monkeypatch.setattr(http_bridge, "_CHAT_CACHE", OrderedDict())
+    monkeypatch.setattr(http_bridge, "_stats_cache", None)
+
+    with TestClient(http_bridge.app) as test_client:
+        yield test_client
+
+
+class TestHttpBridge:
+    """Test HTTP bridge tool setup and dispatch"""
+
+    def test_tools_instantiated_once_at_startup(self, client):
+        """Test /tools lists every registered tool with its description"""
+        response = client.get("/tools")
+
+        assert response.status_code == 200
+        tools = {tool["name"]: tool["description"] for tool in response.json()["tools"]}
+        assert set(tools) == set(http_bridge.TOOLS)
+        assert all(tools.values())
+        assert isinstance(http_bridge.tool_instances["chat"], http_bridge.ChatTool)
+
+    def test_chat_reuses_tool_instance(self, client, monkeypatch):
+        """Test repeated /chat calls go through the same tool instance"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+
+        for transcript in ("first", "second"):
+            response = client.post("/chat", json={"transcript": transcript, "tool_override": "chat"})
+            assert response.status_code == 200
+            assert response.json()["response"] == f"echo: {transcript}"
+
+        assert [call["prompt"] for call in echo.calls] == ["first", "second"]
+
+    def test_auto_route_uses_single_routing_pass(self, client, monkeypatch):
+        """Test auto-routing reports the decision's scores without re-analyzing the transcript"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "debug", echo)
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        monkeypatch.setitem(http_bridge.tool_instances, "thinkdeep", echo)
+        calls = []
+        analyze = http_bridge.router._analyze_complexity
+        monkeypatch.setattr(
+            http_bridge.router, "_analyze_complexity", lambda *a, **kw: calls.append(a) or analyze(*a, **kw)
+        )
+
+        response = client.post("/chat", json={"transcript": "Debug why the server crashes"})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["strategy"] in {"SOLO", "CONSENSUS", "SEQUENTIAL", "PARALLEL"}
+        assert body["complexity"] >= 1 and body["risk"] >= 1
+        assert len(calls) == 1
+
+    def test_count_tokens_uses_cached_encoder(self, monkeypatch):
+        """Test long responses are encoded with a per-model encoder built once, off the event loop"""
+        built = []
+
+        class FakeEncoding:
+            def encode_ordinary(self, text):
+                return text.split()
+
+        class FakeTiktoken:
+            @staticmethod
+            def encoding_for_model(model):
+                built.append((model, threading.current_thread() is threading.main_thread()))
+                return FakeEncoding()
+
+        monkeypatch.setattr(http_bridge, "tiktoken", FakeTiktoken)
+        http_bridge._get_encoder.cache_clear()
+        text = "word " * 100
+
+        try:
+            assert asyncio.run(http_bridge._count_tokens(text, "gpt-4o")) == 100
+            assert asyncio.run(http_bridge._count_tokens(text, "gpt-4o")) == 100
+            assert asyncio.run(http_bridge._count_tokens("short", "gpt-4o")) == len("short") // 4
+        finally:
+            http_bridge._get_encoder.cache_clear()
+        assert built == [("gpt-4o", False)]
+        assert http_bridge._get_encoder.cache_info().maxsize == http_bridge._ENCODER_CACHE_SIZE
+
+    def test_chat_logs_duration_on_success_and_failure(self, client, monkeypatch):
+        """Test analytics receives the measured duration and a failed run is logged too"""
+
+        class RecordingAnalytics:
+            def __init__(self):
+                self.calls = []
+
+            def log_tool_execution(self, **kwargs):
+                self.calls.append(kwargs)
+
+        class FailingTool(EchoTool):
+            async def execute(self, arguments):
+                raise RuntimeError("model unavailable")
+
+        recorder = RecordingAnalytics()
+        monkeypatch.setattr(http_bridge, "analytics", recorder)
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", EchoTool())
+        monkeypatch.setitem(http_bridge.tool_instances, "debug", FailingTool())
+
+        assert client.post("/chat", json={"transcript": "hi", "tool_override": "chat"}).status_code == 200
+        assert client.post("/chat", json={"transcript": "hi", "tool_override": "debug"}).status_code == 500
+
+        ok, failed = recorder.calls
+        assert ok["tool_name"] == "chat" and ok["success"] is True and ok["tokens_used"] == len("echo: hi") // 4
+        assert failed["tool_name"] == "debug" and failed["success"] is False
+        assert failed["error_message"] == "model unavailable" and failed["status"] == "failed"
+        durations = [call["execution_time_ms"] for call in recorder.calls]
+        assert all(isinstance(duration, int) and duration >= 0 for duration in durations)
+
+    def test_chat_cache_hit_expiry_and_clear(self, client, monkeypatch):
+        """Test repeated requests are served from cache until expired or cleared"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        payload = {"transcript": "summarize", "tool_override": "chat"}
+
+        first = client.post("/chat", json=payload).json()
+        second = client.post("/chat", json=payload).json()
+
+        assert len(echo.calls) == 1
+        assert second["response"] == first["response"]
+        assert second["metadata"]["cached"] is True and "cached" not in first["metadata"]
+
+        monkeypatch.setattr(http_bridge, "_CHAT_CACHE_TTL", -1)
+        client.post("/chat", json=payload)
+        assert len(echo.calls) == 2
+
+        monkeypatch.setattr(http_bridge, "_CHAT_CACHE_TTL", 300)
+        assert client.post("/chat/cache/clear").json() == {"cleared": 1}
+        client.post("/chat", json=payload)
+        assert len(echo.calls) == 3
+
+    def test_chat_cache_evicts_least_recently_used(self, client, monkeypatch):
+        """Test the cache holds at most _CHAT_CACHE_SIZE entries"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        monkeypatch.setattr(http_bridge, "_CHAT_CACHE_SIZE", 2)
+
+        for transcript in ("a", "b", "a", "c", "a", "b"):
+            client.post("/chat", json={"transcript": transcript, "tool_override": "chat"})
+
+        assert [call["prompt"] for call in echo.calls] == ["a", "b", "c", "b"]
+
+    def test_chat_ignores_unknown_fields(self, client, monkeypatch):
+        """Test extra request fields from newer clients are dropped rather than rejected"""
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", EchoTool())
+
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "chat", "client_version": "2.1"})
+
+        assert response.status_code == 200
+        parsed = http_bridge.ChatRequest.model_validate({"transcript": "hi", "client_version": "2.1"})
+        assert "client_version" not in parsed.model_dump()
+
+    def test_concurrent_identical_requests_share_one_execution(self, monkeypatch):
+        """Test requests arriving while an identical one runs wait for its result"""
+
+        class SlowEchoTool(EchoTool):
+            async def execute(self, arguments):
+                await asyncio.sleep(0.05)
+                return await super().execute(arguments)
+
+        slow = SlowEchoTool()
+        monkeypatch.setattr(http_bridge, "tool_instances", {"chat": slow})
+        monkeypatch.setattr(http_bridge, "analytics", None)
+        monkeypatch.setattr(http_bridge, "_CHAT_CACHE", OrderedDict())
+        monkeypatch.setattr(http_bridge, "_CHAT_INFLIGHT", {})
+        request = http_bridge.ChatRequest(transcript="read the last message", tool_override="chat")
+
+        async def burst():
+            return await asyncio.gather(*(http_bridge.chat(request) for _ in range(5)))
+
+        responses = asyncio.run(burst())
+
+        assert len(slow.calls) == 1
+        assert {response.response for response in responses} == {"echo: read the last message"}
+        assert http_bridge._CHAT_INFLIGHT == {}
+
+    def test_tool_at_capacity_returns_429(self, client, monkeypatch):
+        """Test a request that cannot get an execution slot in time is rejected with 429"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        monkeypatch.setitem(http_bridge.tool_semaphores, "chat", asyncio.Semaphore(0))
+        monkeypatch.setattr(http_bridge, "_TOOL_QUEUE_TIMEOUT", 0.01)
+
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "chat"})
+
+        assert response.status_code == 429
+        assert echo.calls == []
+
+    def test_unknown_tool_override_rejected_by_validation(self, client):
+        """Test an unknown tool override is a client error, not a server failure"""
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "missing"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "tool_override"]
+
+    def test_unavailable_routed_tool_returns_400(self, client, monkeypatch):
+        """Test a known tool that failed to initialize is reported as a 400"""
+        monkeypatch.delitem(http_bridge.tool_instances, "chat", raising=False)
+
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "chat"})
+
+        assert response.status_code == 400
+
+    def test_router_stats_cached_for_ttl(self, client, monkeypatch):
+        """Test repeated /router/stats calls reuse one analytics query until the TTL lapses"""
+
+        class StatsAnalytics:
+            def __init__(self):
+                self.queries = 0
+                self.threads = set()
+
+            def get_tool_performance(self, days):
+                self.queries += 1
+                self.threads.add(threading.current_thread().name)
+                return [{"tool_name": "chat", "total_executions": self.queries}]
+
+        stats = StatsAnalytics()
+        monkeypatch.setattr(http_bridge, "analytics", stats)
+
+        first = client.get("/router/stats").json()
+        second = client.get("/router/stats").json()
+        assert stats.queries == 1
+        assert first == second == {"stats": [{"tool_name": "chat", "total_executions": 1}]}
+        assert all(name.startswith("bridge-tool") for name in stats.threads)
+
+        monkeypatch.setattr(http_bridge, "_STATS_TTL", 0)
+        assert client.get("/router/stats").json()["stats"][0]["total_executions"] == 2
+
+    def test_access_log_batched_by_middleware(self, monkeypatch, caplog):
+        """Test requests are logged in batches by the writer task, flushed at shutdown"""
+        monkeypatch.setattr(http_bridge, "ZenAnalytics", None)
+        monkeypatch.setattr(http_bridge, "tool_instances", {})
+
+        with caplog.at_level("INFO", logger="http_bridge.access"):
+            with TestClient(http_bridge.app) as test_client:
+                test_client.get("/health")
+                test_client.get("/tools")
+
+        lines = "\n".join(record.getMessage() for record in caplog.records if record.name == "http_bridge.access")
+        assert "GET /health 200" in lines
+        assert "GET /tools 200" in lines
+        assert http_bridge._request_log is None
+
+    def test_context_cannot_override_core_tool_args(self, client, monkeypatch):
+        """Test context fields reach the tool but never replace prompt, model or files"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        context = {"prompt": "injected", "model": "other", "temperature": 0.2, "working_directory": "/tmp", "step": "1"}
+
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "chat", "context": context})
+
+        assert response.status_code == 200
+        (arguments,) = echo.calls
+        assert arguments["prompt"] == "hi" and arguments["model"] == "auto" and arguments["files"] == []
+        assert arguments["temperature"] == 0.2 and arguments["working_directory"] == "/tmp" and arguments["step"] == "1"
+        assert "continuation_id" not in arguments
+
+    def test_context_drops_unknown_keys_and_routing_hints(self, client, monkeypatch):
+        """Test undeclared context keys and router-only hints never reach the tool"""
+        echo = EchoTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", echo)
+        context = {"environment": "production", "multi_step": True, "secret_flag": 1, "thinking_mode": "low"}
+
+        response = client.post("/chat", json={"transcript": "hi", "tool_override": "chat", "context": context})
+
+        assert response.status_code == 200
+        (arguments,) = echo.calls
+        assert arguments["thinking_mode"] == "low"
+        assert not {"environment", "multi_step", "secret_flag"} & set(arguments)
+
+    def test_context_fields_validated(self, client):
+        """Test out-of-range context settings are rejected before dispatch"""
+        response = client.post("/chat", json={"transcript": "hi", "context": {"temperature": 3}})
+
+        assert response.status_code == 422
+
+    def test_stream_returns_ndjson_chunks(self, client, monkeypatch):
+        """Test stream=True yields a header line and one line per tool output item"""
+
+        class MultiPartTool(EchoTool):
+            async def execute(self, arguments):
+                self.calls.append(arguments)
+                return [TextContent(type="text", text="part one"), TextContent(type="text", text="part two")]
+
+        tool = MultiPartTool()
+        monkeypatch.setitem(http_bridge.tool_instances, "chat", tool)
+        payload = {"transcript": "hi", "tool_override": "chat", "stream": True}
+
+        for _ in range(2):
+            response = client.post("/chat", json=payload)
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            header, *chunks = [json.loads(line) for line in response.text.splitlines()]
+            assert header["tool_used"] == "chat" and header["strategy"] == "MANUAL"
+            assert [chunk["response"] for chunk in chunks] == ["part one", "part two"]
+
+        assert len(tool.calls) == 2
+
+    def test_health_etag_not_modified(self, client):
+        """Test /health serves a precomputed body and answers 304 to a matching ETag"""
+        response = client.get("/health")
+        etag = response.headers["etag"]
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "status": "healthy",
+            "router_available": True,
+            "analytics_available": False,
+            "tools_count": len(http_bridge.TOOLS),
+        }
+
+        cached = client.get("/health", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and cached.content == b""
+        assert client.get("/health", headers={"If-None-Match": '"stale"'}).status_code == 200
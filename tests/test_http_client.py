@@ -0,0 +1,59 @@
+"""
+Tests for the shared async HTTP client
+"""
+
+import asyncio
+
+from utils import http_client
+
+
+class TestSharedAsyncClient:
+    """Test the shared AsyncClient lifecycle"""
+
+    def test_client_reused_within_loop(self):
+        """Test repeated calls on one loop return the same client until closed"""
+
+        async def scenario():
+            first = http_client.get_async_client()
+            second = http_client.get_async_client()
+            await http_client.close_async_client()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first is second
+        assert first.is_closed
+        assert not http_client._clients
+
+    def test_new_loop_gets_new_client(self):
+        """Test a client built on one loop is not handed to another"""
+
+        async def build():
+            return http_client.get_async_client()
+
+        first = asyncio.run(build())
+        second = asyncio.run(build())
+
+        assert first is not second
+        asyncio.run(second.aclose())
+        asyncio.run(first.aclose())
+
+    def test_close_leaves_other_loops_clients(self):
+        """Test closing from one loop neither closes nor forgets another loop's client"""
+
+        async def build():
+            return http_client.get_async_client()
+
+        loop = asyncio.new_event_loop()
+        try:
+            client = loop.run_until_complete(build())
+            asyncio.run(http_client.close_async_client())
+
+            assert not client.is_closed
+            assert http_client._clients[loop] is client
+
+            loop.run_until_complete(http_client.close_async_client())
+            assert client.is_closed
+            assert loop not in http_client._clients
+        finally:
+            loop.close()
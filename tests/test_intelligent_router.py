@@ -0,0 +1,229 @@
+"""
+Tests for the IntelligentRouter routing engine
+"""
+
+import re
+
+import pytest
+
+from routing import intelligent_router, server_integration
+from routing.intelligent_router import IntelligentRouter, RoutingStrategy
+from routing.server_integration import RouterIntegration
+
+
+@pytest.fixture
+def router():
+    return IntelligentRouter()
+
+
+class TestIntelligentRouter:
+    """Test intent, complexity and risk analysis and the resulting tool choice"""
+
+    @pytest.mark.parametrize(
+        "query,intent",
+        [
+            ("Review my code for security vulnerabilities", "review"),
+            ("Debug a memory leak in our payment processing system", "debug"),
+            ("Investigate why the distributed database is slow", "investigate"),
+            ("Plan a new microservices architecture", "design"),
+            ("Explain the difference between threads and processes", "understand"),
+            ("Hello there", "general"),
+        ],
+    )
+    def test_extract_intent(self, router, query, intent):
+        """Test the intent with the most pattern matches wins"""
+        assert router._extract_intent(query) == intent
+
+    def test_intent_patterns_fused(self):
+        """Test every intent pattern is one named, case-insensitive branch of a single regex"""
+        fused = intelligent_router._INTENT_RE
+        expected = {
+            f"{intent}__{index}"
+            for intent, patterns in IntelligentRouter.INTENT_PATTERNS.items()
+            for index in range(len(patterns))
+        }
+        assert set(fused.groupindex) == expected
+        assert fused.flags & re.IGNORECASE
+
+    def test_overlapping_phrase_matches_once(self, router):
+        """Test a phrase matched by one pattern isn't also counted for a word inside it"""
+        matches = [match.lastgroup for match in intelligent_router._INTENT_RE.finditer("code review")]
+
+        # Not also "implement" for "code" or a second "review" for the bare word
+        assert matches == ["review__1"]
+        assert router._extract_intent("code review") == "review"
+
+    def test_intent_ties_follow_pattern_order(self, router):
+        """Test equal scores resolve to the intent listed first in INTENT_PATTERNS"""
+        assert router._extract_intent("optimize it, then review it") == "review"
+
+    def test_complexity_counts_indicators_files_and_lists(self, router):
+        """Test indicators, file count, numbered lists and context all raise complexity"""
+        assert router._analyze_complexity("What is Python?", {}, []) == 1
+        assert router._analyze_complexity("1. refactoring 2. database", {"multi_step": True}, ["a", "b"]) == 7
+
+    @pytest.mark.parametrize(
+        "query,complexity",
+        [
+            ("Why? How? When?", 2),
+            ("Why? How?", 1),
+            ("Steps: 1. install", 2),
+            ("Version 3 is out?", 1),
+        ],
+    )
+    def test_complexity_questions_and_numbered_lists(self, router, query, complexity):
+        """Test more than two question marks and a numbered list each add one"""
+        assert router._analyze_complexity(query, {}, []) == complexity
+
+    def test_risk_counts_indicators_environment_and_urgency(self, router):
+        """Test risk indicators, production context and urgency words raise risk"""
+        assert router._assess_risk("What is Python?", {}) == 1
+        assert router._assess_risk("urgent payment fix", {"environment": "production"}) == 10
+
+    def test_score_query_counts_each_keyword_once(self, router):
+        """Test repeated indicators and word groups add their score once, shared keywords to both buckets"""
+        # security: complexity 2 + risk 4; critical: risk 4 + urgency 2; urgent/asap: urgency (already counted)
+        assert router._score_query("security security critical urgent asap") == (2, 10)
+        assert router._score_query("nothing to see") == (0, 0)
+
+    @pytest.mark.parametrize(
+        "query,risk",
+        [
+            ("It's urgent!", 2),
+            ("ASAP, emergency", 2),
+            ("we urgently need docs", 0),
+            ("it doesn't build", 1),
+            ("login not working", 1),
+        ],
+    )
+    def test_urgency_and_negation_match_whole_words(self, router, query, risk):
+        """Test urgency and negation words are matched as tokens, not substrings"""
+        assert router._score_query(query.lower()) == (0, risk)
+
+    def test_score_query_mixed_indicators(self, router):
+        """Test a query combining indicators, urgency and negation scores each once"""
+        query = "the distributed database migration in production isn't working; don't panic, it's urgent"
+        assert router._score_query(query) == (3, 9)
+
+    @pytest.mark.parametrize(
+        "query,intent,tool",
+        [
+            ("validate this", "review", "codereview"),
+            ("validate the git commit changes", "general", "precommit"),
+            ("a complex bug", "implement", "thinkdeep"),
+            ("a complex bug", "general", "chat"),
+            ("hello", "general", "chat"),
+        ],
+    )
+    def test_select_tool_scores_keywords_per_tool(self, router, query, intent, tool):
+        """Test best_for keywords in the query or intent score every tool listing them, ties to the first tool"""
+        assert router._select_tool(query, intent, 3, 1)[0] == tool
+
+    def test_keyword_to_tools_inverts_best_for(self):
+        """Test the inverted index lists every tool for a shared keyword, in TOOL_CAPABILITIES order"""
+        assert intelligent_router._KEYWORD_TO_TOOLS["validate"] == ("codereview", "precommit")
+        assert intelligent_router._TOOL_NAMES == tuple(IntelligentRouter.TOOL_CAPABILITIES)
+        assert intelligent_router._TOOL_MAX_COMPLEXITY[intelligent_router._TOOL_NAMES.index("chat")] == 6
+        assert intelligent_router._intent_tool_keywords("investigate") == frozenset()
+        assert intelligent_router._intent_tool_keywords("debug") == {"bug"}
+        assert intelligent_router._intent_tool_keywords("review") == {"review"}
+
+    @pytest.mark.parametrize(
+        "query,context",
+        [
+            ("Review this pull request", {}),
+            ("Debug the crash", {"multi_step": True, "dependencies": True}),
+            ("Plan the architecture", {"environment": "production"}),
+            ("Critical decision: deploy now?", {"environment": "production"}),
+        ],
+    )
+    def test_alternatives_match_get_alternative_tools(self, router, query, context):
+        """Test alternatives gathered while selecting equal a separate _get_alternative_tools pass"""
+        decision = router.route_request(query, context)
+
+        expected = router._get_alternative_tools(decision.intent, decision.complexity, decision.risk, decision.tool)
+        assert decision.alternative_tools == expected
+
+    def test_high_risk_routes_to_consensus(self, router):
+        """Test risk of 8 or more always selects consensus"""
+        decision = router.route_request("Critical decision: Should we deploy to production now?")
+
+        assert decision.tool == "consensus"
+        assert decision.strategy is RoutingStrategy.CONSENSUS
+        assert decision.risk >= 8
+
+    def test_simple_query_routes_to_chat(self, router):
+        """Test a simple question goes to chat with alternatives excluding it"""
+        decision = router.route_request("What is Python?")
+
+        assert (decision.tool, decision.complexity, decision.risk) == ("chat", 1, 1)
+        assert "chat" not in decision.alternative_tools
+
+    def test_override_tool(self, router):
+        """Test a manual override wins with full confidence"""
+        decision = router.route_request("What is Python?", override_tool="debug", override_strategy="solo")
+
+        assert (decision.tool, decision.strategy, decision.confidence) == ("debug", RoutingStrategy.SOLO, 1.0)
+
+    def test_repeat_query_analysis_memoized(self, router, monkeypatch):
+        """Test a repeated query reuses its keyword analysis while context still applies"""
+        first = router.route_request("Debug the database crash")
+
+        monkeypatch.setattr(router, "_score_query", lambda query_lower: pytest.fail("query rescanned"))
+        second = router.route_request("Debug the database crash", {"environment": "production"})
+
+        assert (second.intent, second.complexity) == (first.intent, first.complexity)
+        assert second.risk == first.risk + 3
+        assert second is not first
+        assert router._analyze_query.cache_info().hits == 1
+
+        router.cache_clear()
+        assert router._analyze_query.cache_info().currsize == 0
+
+
+class TestRouterIntegration:
+    """Test the integration opens analytics lazily and only once"""
+
+    @pytest.fixture
+    def created(self, monkeypatch):
+        created = []
+
+        class FakeAnalytics:
+            def __init__(self):
+                self.closed = False
+                created.append(self)
+
+            def get_best_tool_for(self, intent, complexity, risk):
+                return None
+
+            def close(self):
+                self.closed = True
+
+        monkeypatch.setattr(server_integration, "ZenAnalytics", FakeAnalytics)
+        return created
+
+    def test_analytics_created_on_first_use(self, created):
+        """Test construction leaves analytics closed until routing consults it"""
+        integration = RouterIntegration()
+        assert created == []
+
+        integration.router.route_request("What is Python?")
+        integration.router.route_request("Explain decorators")
+        assert len(created) == 1
+        assert integration.analytics is created[0]
+
+        integration.close()
+        assert created[0].closed
+
+    def test_close_without_use_skips_analytics(self, created):
+        """Test closing an unused integration doesn't create analytics just to close it"""
+        RouterIntegration().close()
+        assert created == []
+
+    def test_disabled_analytics_never_created(self, created):
+        """Test analytics stays None when disabled"""
+        integration = RouterIntegration(enable_analytics=False)
+
+        assert integration.analytics is None
+        assert integration.router.analytics is None
+        assert created == []
@@ -0,0 +1,410 @@
+"""
+Tests for the Persistent Memory Manager
+"""
+
+import dataclasses
+import logging
+import signal
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from persistent_memory_manager import _EXECUTION_FIELDS, PersistentExecution, PersistentMemoryManager
+
+
+class TestPersistentMemoryManager:
+    """Test persistent execution tracking and its SQLite storage"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a manager on a temporary database, restoring the signal handlers it installs"""
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        manager = PersistentMemoryManager(str(tmp_path / "executions.db"))
+        yield manager
+        manager._cleanup()
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    @staticmethod
+    def _rows(manager, sql, params=()):
+        conn = sqlite3.connect(manager.db_path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def test_uses_wal_journal(self, manager):
+        """Test the database is switched to WAL mode"""
+        assert self._rows(manager, "PRAGMA journal_mode") == [("wal",)]
+
+    def test_execution_lifecycle_persisted(self, manager):
+        """Test start, update and complete are written through to the database"""
+        session_id = manager.start_execution("todo_001", "Write tests", "cursor", "dev", "gpt-5")
+        manager.update_execution(session_id, 40, "Writing", "halfway")
+        manager.complete_execution(session_id, "done")
+
+        ((status, progress, context, duration),) = self._rows(
+            manager,
+            "SELECT status, progress_percent, context, duration_seconds "
+            "FROM persistent_executions WHERE session_id = ?",
+            (session_id,),
+        )
+        assert (status, progress, context) == ("completed", 100, "done")
+        assert duration >= 0
+        assert manager.get_persistent_executions() == []
+
+    def test_checkpoint_records_active_sessions(self, manager):
+        """Test a checkpoint writes one row per active session"""
+        first = manager.start_execution("todo_002", "First", "cursor", "dev", "gpt-5")
+        second = manager.start_execution("todo_003", "Second", "cursor", "dev", "gpt-5")
+
+        manager._create_checkpoint()
+
+        rows = self._rows(manager, "SELECT session_id FROM execution_checkpoints ORDER BY session_id")
+        assert rows == sorted([(first,), (second,)])
+
+    def test_single_connection_reused(self, manager, monkeypatch):
+        """Test saves go through the shared connection instead of reconnecting"""
+
+        def fail():
+            raise AssertionError("should not reconnect")
+
+        monkeypatch.setattr(manager, "_connect", fail)
+        session_id = manager.start_execution("todo_004", "Reuse", "cursor", "dev", "gpt-5")
+        manager.update_execution(session_id, 10)
+        manager._create_checkpoint()
+
+        assert self._rows(manager, "SELECT progress_percent FROM persistent_executions") == [(10,)]
+
+    def test_cleanup_pauses_sessions_and_closes_connection(self, manager):
+        """Test shutdown marks active sessions paused and releases the connection"""
+        session_id = manager.start_execution("todo_005", "Shutdown", "cursor", "dev", "gpt-5")
+
+        manager._cleanup()
+
+        assert self._rows(manager, "SELECT status FROM persistent_executions WHERE session_id = ?", (session_id,)) == [
+            ("paused",)
+        ]
+        with pytest.raises(sqlite3.ProgrammingError):
+            manager._conn.execute("SELECT 1")
+
+    def test_save_upserts_and_keeps_created_at(self, manager):
+        """Test re-saving a session updates its single row and preserves created_at"""
+        session_id = manager.start_execution("todo_006", "Upsert", "cursor", "dev", "gpt-5")
+        ((created_at,),) = self._rows(manager, "SELECT created_at FROM persistent_executions")
+
+        manager.update_execution(session_id, 70, "Almost there")
+        manager._create_checkpoint()
+
+        rows = self._rows(manager, "SELECT created_at, progress_percent, current_action FROM persistent_executions")
+        assert rows == [(created_at, 70, "Almost there")]
+
+    def test_write_transaction_rolls_back_on_error(self, manager):
+        """Test a failed write leaves no partial rows and releases the write lock"""
+        with pytest.raises(RuntimeError):
+            with manager._write_transaction() as cursor:
+                cursor.execute(
+                    "INSERT INTO execution_checkpoints (session_id, checkpoint_time, progress_percent, last_activity) "
+                    "VALUES (?, ?, ?, ?)",
+                    ("session", "now", 0, "now"),
+                )
+                raise RuntimeError("boom")
+
+        assert self._rows(manager, "SELECT COUNT(*) FROM execution_checkpoints") == [(0,)]
+        assert not manager._conn.in_transaction
+        manager.start_execution("todo_007", "After rollback", "cursor", "dev", "gpt-5")
+
+    def test_read_connection_is_read_only(self, manager):
+        """Test the read connection sees committed rows but rejects writes"""
+        session_id = manager.start_execution("todo_008", "Read only", "cursor", "dev", "gpt-5")
+
+        with manager._read_cursor() as cursor:
+            cursor.execute("SELECT session_id FROM persistent_executions")
+            assert [row["session_id"] for row in cursor.fetchall()] == [session_id]
+            with pytest.raises(sqlite3.OperationalError):
+                cursor.execute("DELETE FROM persistent_executions")
+
+    def test_crash_recovery_reloads_stale_sessions(self, manager):
+        """Test a restart pauses stale executions and loads them back into memory"""
+        session_id = manager.start_execution("todo_009", "Recover", "cursor", "dev", "gpt-5", "ctx")
+        conn = sqlite3.connect(manager.db_path)
+        with conn:
+            conn.execute("UPDATE persistent_executions SET last_checkpoint = '2000-01-01T00:00:00'")
+        conn.close()
+
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        restarted = PersistentMemoryManager(manager.db_path)
+        try:
+            info = restarted.get_crash_recovery_info()
+            assert (info.active_executions, info.recovered_executions) == (1, 1)
+            (execution,) = restarted.get_persistent_executions()
+            assert (execution.session_id, execution.status, execution.crash_recovery_count) == (session_id, "paused", 1)
+            assert execution.context.startswith("ctx [CRASH RECOVERY")
+            assert execution.started_at_epoch == datetime.fromisoformat(execution.started_at).timestamp()
+        finally:
+            restarted._cleanup()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def test_updates_coalesced_until_checkpoint(self, manager):
+        """Test updates and pauses stay in memory until the checkpoint flushes them in one batch"""
+        session_id = manager.start_execution("todo_010", "Coalesce", "cursor", "dev", "gpt-5")
+        for percent in (10, 20, 30):
+            manager.update_execution(session_id, percent)
+        manager.pause_execution(session_id, "waiting")
+
+        sql = "SELECT status, progress_percent, context FROM persistent_executions"
+        assert self._rows(manager, sql) == [("executing", 0, "")]
+        assert manager._dirty == {session_id}
+
+        manager._create_checkpoint()
+
+        assert self._rows(manager, sql) == [("paused", 30, "waiting")]
+        assert manager._dirty == set()
+
+    def test_checkpoint_does_not_overwrite_completion(self, manager, monkeypatch):
+        """Test a completion committed just before the checkpoint's transaction isn't reverted by it"""
+        session_id = manager.start_execution("todo_022", "Race", "cursor", "dev", "gpt-5")
+        manager.update_execution(session_id, 50)
+        write_transaction = manager._write_transaction
+
+        def complete_first():
+            # Let the completion commit in the gap before the checkpoint takes the lock
+            monkeypatch.setattr(manager, "_write_transaction", write_transaction)
+            manager.complete_execution(session_id, "done")
+            return write_transaction()
+
+        monkeypatch.setattr(manager, "_write_transaction", complete_first)
+        manager._create_checkpoint()
+
+        sql = "SELECT status, progress_percent FROM persistent_executions"
+        assert self._rows(manager, sql) == [("completed", 100)]
+
+    def test_cleanup_stops_checkpoint_thread_promptly(self, manager):
+        """Test shutdown wakes the checkpoint thread instead of waiting out its interval"""
+        start = time.monotonic()
+        manager._cleanup()
+
+        assert not manager.checkpoint_thread.is_alive()
+        assert time.monotonic() - start < manager.checkpoint_interval
+
+    def test_migrates_rowid_table(self, tmp_path):
+        """Test a database with the old rowid layout is rebuilt WITHOUT ROWID and keeps its rows"""
+        db_path = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE persistent_executions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, todo_id TEXT NOT NULL, todo_text TEXT NOT NULL,
+                    status TEXT NOT NULL, platform TEXT NOT NULL, agent TEXT NOT NULL, provider TEXT NOT NULL,
+                    started_at TEXT NOT NULL, last_activity TEXT NOT NULL, progress_percent INTEGER DEFAULT 0,
+                    current_action TEXT, context TEXT, session_id TEXT NOT NULL UNIQUE, completed_at TEXT,
+                    duration_seconds INTEGER, crash_recovery_count INTEGER DEFAULT 0, last_checkpoint TEXT NOT NULL,
+                    created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX idx_session_id ON persistent_executions(session_id)")
+            conn.execute(
+                "INSERT INTO persistent_executions (todo_id, todo_text, status, platform, agent, provider, started_at, "
+                "last_activity, session_id, last_checkpoint, created_at, updated_at) "
+                "VALUES ('t', 'text', 'completed', 'p', 'a', 'pr', 's', 'l', 'legacy_1', 'c', 'created', 'updated')"
+            )
+        conn.close()
+
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        manager = PersistentMemoryManager(db_path)
+        try:
+            ((sql,),) = self._rows(manager, "SELECT sql FROM sqlite_master WHERE name = 'persistent_executions'")
+            assert "WITHOUT ROWID" in sql
+            assert self._rows(manager, "SELECT name FROM sqlite_master WHERE name = 'idx_session_id'") == []
+            assert self._rows(manager, "SELECT session_id, created_at FROM persistent_executions") == [
+                ("legacy_1", "created")
+            ]
+        finally:
+            manager._cleanup()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def test_wal_checkpoint_folds_log_into_database(self, manager):
+        """Test the passive WAL checkpoint copies committed frames back into the database"""
+        manager.start_execution("todo_011", "WAL", "cursor", "dev", "gpt-5")
+
+        manager._checkpoint_wal()
+
+        with manager._db_lock:
+            busy, log_frames, checkpointed = manager._conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        assert busy == 0
+        assert checkpointed == log_frames
+
+    def test_complete_uses_one_timestamp(self, manager):
+        """Test completion stamps last_activity, completed_at and updated_at with the same time"""
+        session_id = manager.start_execution("todo_012", "Timestamps", "cursor", "dev", "gpt-5")
+        manager.complete_execution(session_id)
+
+        ((last_activity, completed_at, updated_at),) = self._rows(
+            manager, "SELECT last_activity, completed_at, updated_at FROM persistent_executions"
+        )
+        assert last_activity == completed_at == updated_at
+
+    def test_stale_scan_uses_status_checkpoint_index(self, manager):
+        """Test the crash recovery scan is served by the composite (status, last_checkpoint) index"""
+        plan = self._rows(
+            manager,
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM persistent_executions "
+            "WHERE status IN ('executing', 'paused') AND last_checkpoint < datetime('now', '-5 minutes')",
+        )
+        assert any("idx_status_checkpoint" in detail for *_, detail in plan)
+        assert self._rows(manager, "SELECT name FROM sqlite_master WHERE name = 'idx_status'") == []
+
+    def test_execution_fields_match_dataclass(self):
+        """Test the column list used for upserts and recovery tracks PersistentExecution's stored fields"""
+        fields = dataclasses.fields(PersistentExecution)
+        stored = tuple(field.name for field in fields if field.name != "started_at_epoch")
+        assert _EXECUTION_FIELDS == stored
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10")
+    def test_execution_has_no_instance_dict(self, manager):
+        """Test sessions are slotted so each one carries no per-instance __dict__"""
+        session_id = manager.start_execution("todo_013", "Slots", "cursor", "dev", "gpt-5")
+
+        execution = manager.active_sessions[session_id]
+        assert not hasattr(execution, "__dict__")
+        assert dataclasses.asdict(execution)["session_id"] == session_id
+
+    def test_repeated_recovery_appends_marker_once(self, manager):
+        """Test a session recovered across several restarts carries the crash marker only once"""
+        session_id = manager.start_execution("todo_014", "Restarts", "cursor", "dev", "gpt-5", "ctx")
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+
+        try:
+            for _ in range(2):
+                conn = sqlite3.connect(manager.db_path)
+                with conn:
+                    conn.execute("UPDATE persistent_executions SET last_checkpoint = '2000-01-01T00:00:00'")
+                conn.close()
+                # Release the connections without the shutdown pass, which would add its own marker
+                restarted = PersistentMemoryManager(manager.db_path)
+                restarted._cleaned_up = True
+                restarted._stop_event.set()
+                restarted._conn.close()
+                restarted._read_conn.close()
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+        ((context, count),) = self._rows(
+            manager,
+            "SELECT context, crash_recovery_count FROM persistent_executions WHERE session_id = ?",
+            (session_id,),
+        )
+        assert context == "ctx [CRASH RECOVERY - Auto-paused due to server restart]"
+        assert count == 2
+
+    def test_in_memory_database(self):
+        """Test ":memory:" runs the full lifecycle without touching disk"""
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        manager = PersistentMemoryManager(":memory:")
+        try:
+            session_id = manager.start_execution("todo_015", "Ephemeral", "cursor", "dev", "gpt-5")
+            manager.update_execution(session_id, 50)
+            manager._create_checkpoint()
+
+            with manager._read_cursor() as cursor:
+                cursor.execute("SELECT progress_percent FROM persistent_executions WHERE session_id = ?", (session_id,))
+                assert cursor.fetchone()["progress_percent"] == 50
+
+            manager._cleanup()
+            with pytest.raises(sqlite3.ProgrammingError):
+                manager._conn.execute("SELECT 1")
+        finally:
+            manager._cleanup()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def test_cleanup_pauses_every_session_in_one_batch(self, manager):
+        """Test shutdown marks all active sessions paused with the shutdown marker"""
+        first = manager.start_execution("todo_016", "First", "cursor", "dev", "gpt-5", "a")
+        second = manager.start_execution("todo_017", "Second", "cursor", "dev", "gpt-5", "b")
+
+        manager._cleanup()
+
+        rows = self._rows(manager, "SELECT session_id, status, context FROM persistent_executions ORDER BY todo_id")
+        marker = " [SHUTDOWN - Auto-paused due to server shutdown]"
+        assert rows == [(first, "paused", "a" + marker), (second, "paused", "b" + marker)]
+
+    def test_recovery_cutoff_matches_stored_timestamps(self, manager):
+        """Test an hour-old isoformat checkpoint counts as stale while a fresh one does not"""
+        stale = manager.start_execution("todo_018", "Stale", "cursor", "dev", "gpt-5")
+        fresh = manager.start_execution("todo_019", "Fresh", "cursor", "dev", "gpt-5")
+        conn = sqlite3.connect(manager.db_path)
+        with conn:
+            conn.execute(
+                "UPDATE persistent_executions SET last_checkpoint = ? WHERE session_id = ?",
+                ((datetime.now() - timedelta(hours=1)).isoformat(), stale),
+            )
+        conn.close()
+
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM)}
+        restarted = PersistentMemoryManager(manager.db_path)
+        try:
+            assert restarted.get_crash_recovery_info().recovered_executions == 1
+            assert list(restarted.active_sessions) == [stale]
+            rows = self._rows(manager, "SELECT session_id, status FROM persistent_executions ORDER BY todo_id")
+            assert rows == [(stale, "paused"), (fresh, "executing")]
+        finally:
+            restarted._cleanup()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def test_checkpoint_prunes_rows_past_retention(self, manager):
+        """Test each checkpoint deletes checkpoint rows older than the retention window"""
+        session_id = manager.start_execution("todo_020", "Prune", "cursor", "dev", "gpt-5")
+        old = (datetime.now() - timedelta(hours=25)).isoformat()
+        conn = sqlite3.connect(manager.db_path)
+        with conn:
+            conn.execute(
+                "INSERT INTO execution_checkpoints (session_id, checkpoint_time, progress_percent, last_activity) "
+                "VALUES (?, ?, 0, ?)",
+                (session_id, old, old),
+            )
+        conn.close()
+
+        manager._create_checkpoint()
+
+        rows = self._rows(manager, "SELECT checkpoint_time FROM execution_checkpoints")
+        assert len(rows) == 1
+        assert rows[0][0] > old
+
+    def test_signal_handler_defers_cleanup_to_exit(self, manager):
+        """Test the signal handler waits for locks to unwind instead of cleaning up in place"""
+        session_id = manager.start_execution("todo_023", "Signal", "cursor", "dev", "gpt-5")
+
+        # A signal landing mid-write must not block on the lock its own thread holds
+        with pytest.raises(SystemExit):
+            with manager._write_transaction() as cursor:
+                cursor.execute("UPDATE persistent_executions SET progress_percent = 99")
+                manager._signal_handler(signal.SIGTERM, None)
+
+        assert manager._stop_event.is_set()
+        assert not manager._cleaned_up
+
+        manager._cleanup()
+        # The interrupted write rolled back and cleanup still paused the session
+        sql = "SELECT status, progress_percent FROM persistent_executions WHERE session_id = ?"
+        assert self._rows(manager, sql, (session_id,)) == [("paused", 0)]
+
+    def test_cleanup_runs_once(self, manager, caplog):
+        """Test a second cleanup, as atexit does after an earlier direct call, is a no-op"""
+        manager.start_execution("todo_021", "Twice", "cursor", "dev", "gpt-5")
+        manager._cleanup()
+        caplog.clear()
+
+        with caplog.at_level(logging.INFO, logger="persistent_memory_manager"):
+            manager._cleanup()
+
+        assert caplog.records == []
@@ -0,0 +1,213 @@
+"""
+Tests for the pipelined AsyncTaskQueue writer
+"""
+
+import contextlib
+import json
+import threading
+import uuid
+
+import psycopg2
+import pytest
+
+from utils import task_queue
+from utils.db_config import DatabaseConfig
+from utils.task_queue import AsyncTaskQueue
+
+
+class RecordingQueue:
+    """Minimal TaskQueue stand-in that records enqueue_many batches"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.closed = False
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+
+    def enqueue_many(self, tasks):
+        self.release.wait()
+        if self.fail:
+            raise RuntimeError("insert failed")
+        self.batches.append(tasks)
+        return [task["id"] for task in tasks]
+
+    def close(self):
+        self.closed = True
+
+
+class TestAsyncTaskQueue:
+    """Test batching and future resolution in AsyncTaskQueue"""
+
+    def test_futures_resolve_to_client_ids(self):
+        """Test each future resolves to the id its task was inserted with"""
+        recorder = RecordingQueue()
+
+        with AsyncTaskQueue(task_queue=recorder) as async_queue:
+            futures = [async_queue.enqueue("chat", {"n": i}) for i in range(5)]
+            task_ids = [future.result(timeout=5) for future in futures]
+
+        inserted = [task for batch in recorder.batches for task in batch]
+        assert task_ids == [task["id"] for task in inserted]
+        assert [task["data"]["n"] for task in inserted] == list(range(5))
+        assert recorder.closed is True
+
+    def test_pending_enqueues_share_a_batch(self):
+        """Test enqueues queued behind a slow commit are written together, capped at MAX_BATCH"""
+        recorder = RecordingQueue()
+        recorder.release.clear()
+
+        with AsyncTaskQueue(task_queue=recorder) as async_queue:
+            async_queue.MAX_BATCH = 4
+            first = async_queue.enqueue("chat", {})
+            futures = [async_queue.enqueue("chat", {}) for _ in range(6)]
+            recorder.release.set()
+            for future in [first] + futures:
+                future.result(timeout=5)
+
+        assert sum(len(batch) for batch in recorder.batches) == 7
+        assert max(len(batch) for batch in recorder.batches) <= 4
+        assert len(recorder.batches) < 7
+
+    def test_failed_batch_sets_exception(self):
+        """Test a failed insert surfaces on every future in the batch"""
+        with AsyncTaskQueue(task_queue=RecordingQueue(fail=True)) as async_queue:
+            future = async_queue.enqueue("chat", {})
+
+            with pytest.raises(RuntimeError, match="insert failed"):
+                future.result(timeout=5)
+
+
+class FakeConnection:
+    """psycopg2 connection stand-in whose cursors record nothing and return no rows"""
+
+    def __init__(self):
+        self.commits = 0
+
+    def cursor(self):
+        return contextlib.nullcontext(object())
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class TestEnqueueMany:
+    """Test TaskQueue.enqueue_many id handling without a database"""
+
+    def test_returns_client_ids_in_input_order(self, monkeypatch):
+        """Test ids come from the inserted rows, not from RETURNING order"""
+        inserted = []
+        monkeypatch.setattr(task_queue, "execute_values", lambda cursor, sql, rows, **kw: inserted.extend(rows))
+        queue = task_queue.TaskQueue.__new__(task_queue.TaskQueue)
+        queue.conn = FakeConnection()
+        given = uuid.uuid4()
+
+        task_ids = queue.enqueue_many([
+            {"task_type": "chat", "data": {"n": 0}},
+            {"task_type": "debug", "data": {"n": 1}, "id": given.hex},
+        ])
+
+        assert task_ids == [row[0] for row in inserted]
+        assert task_ids[1] == str(given)
+        assert [row[1] for row in inserted] == ["chat", "debug"]
+        assert queue.conn.commits == 1
+
+
+class TestPreparedStatements:
+    """Test server-side prepared statement setup"""
+
+    def test_every_connection_prepares_statements(self, monkeypatch):
+        """Test _connect re-runs schema checks and PREPAREs, since both belong to the session"""
+        calls = []
+        monkeypatch.setattr(task_queue.psycopg2, "connect", lambda **kwargs: FakeConnection())
+        monkeypatch.setattr(task_queue, "register_default_jsonb", lambda *args, **kwargs: None)
+        monkeypatch.setattr(task_queue.TaskQueue, "_ensure_schema", lambda self: calls.append("schema"))
+        monkeypatch.setattr(task_queue.TaskQueue, "_prepare_statements", lambda self: calls.append("prepare"))
+
+        queue = task_queue.TaskQueue(connection_params={"dbname": "unused"})
+        queue._connect()
+
+        assert calls == ["schema", "prepare", "schema", "prepare"]
+
+    def test_prepared_select_lists_columns(self):
+        """Test no prepared statement selects *, which would break after ALTER TABLE"""
+        assert not any("SELECT *" in sql for sql in task_queue._SQL_PREPARE_STATEMENTS)
+
+
+class TestJsonEncoding:
+    """Test JSONB parameter serialization"""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_json_dumps_round_trips(self, monkeypatch, use_orjson):
+        """Test orjson and stdlib json encode task data to the same document"""
+        if not use_orjson:
+            monkeypatch.setattr(task_queue, "orjson", None)
+        elif task_queue.orjson is None:
+            pytest.skip("orjson not installed")
+
+        data = {"prompt": "caf\u00e9", "files": ["a.py"], "limits": {"tokens": 1.5, "retries": None}}
+
+        assert json.loads(task_queue._json_dumps(data)) == data
+
+
+class TestTaskCountsPostgres:
+    """Test the task_queue_counts schema and stats query against a real Postgres"""
+
+    @pytest.fixture
+    def cursor(self):
+        """Cursor in a throwaway schema on the configured Postgres; everything is rolled back"""
+        try:
+            conn = psycopg2.connect(connect_timeout=3, **DatabaseConfig.get_postgres_dsn())
+        except psycopg2.OperationalError as e:
+            pytest.skip(f"Postgres not available: {e}")
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("CREATE SCHEMA tq_counts_test")
+                cursor.execute("SET LOCAL search_path TO tq_counts_test, public")
+                cursor.execute(task_queue._read_schema_file("task_queue.sql"))
+                yield cursor
+        finally:
+            conn.rollback()
+            conn.close()
+
+    def _insert(self, cursor, status, task_type, age_seconds):
+        cursor.execute(
+            """
+            INSERT INTO task_queue (task_type, status, data, created_at)
+            VALUES (%s, %s, '{}', LOCALTIMESTAMP - make_interval(secs => %s))
+            """,
+            (task_type, status, age_seconds),
+        )
+
+    def _stats(self, cursor):
+        cursor.execute(task_queue._SQL_TASK_COUNTS)
+        return {(status, task_type): (count, wait) for status, task_type, count, wait in cursor.fetchall()}
+
+    def test_wait_seconds_independent_of_time_zone(self, cursor):
+        """Test summed wait matches LOCALTIMESTAMP - created_at outside UTC"""
+        cursor.execute(task_queue._read_schema_file("task_queue_counts.sql"))
+        cursor.execute("SET LOCAL TIME ZONE 'Pacific/Auckland'")
+        self._insert(cursor, "pending", "chat", 30)
+        self._insert(cursor, "pending", "chat", 90)
+
+        ((count, wait),) = self._stats(cursor).values()
+
+        assert count == 2
+        assert wait == pytest.approx(120, abs=1)
+
+    def test_counts_schema_reruns_and_backfills(self, cursor):
+        """Test the counts schema is idempotent and the backfill seeds rows written before it"""
+        self._insert(cursor, "pending", "chat", 10)
+        self._insert(cursor, "completed", "debug", 10)
+
+        for _ in range(2):
+            cursor.execute(task_queue._read_schema_file("task_queue_counts.sql"))
+        cursor.execute(task_queue._SQL_TASK_COUNTS_BACKFILL)
+        self._insert(cursor, "pending", "chat", 10)
+        cursor.execute("UPDATE task_queue SET status = 'running' WHERE task_type = 'debug'")
+
+        counts = {key: count for key, (count, _) in self._stats(cursor).items()}
+        assert counts == {("pending", "chat"): 2, ("running", "debug"): 1}
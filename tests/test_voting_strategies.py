@@ -0,0 +1,99 @@
+"""
+Tests for consensus voting strategies
+"""
+
+import pytest
+
+from utils.voting_strategies import BaseVotingStrategy, ConsensusVoter, VotingStrategy, _score_verdict
+
+
+class TestConsensusVoter:
+    """Test ConsensusVoter strategy comparison"""
+
+    @pytest.fixture
+    def responses(self):
+        """Model responses split between approve and reject"""
+        return [
+            {
+                "model": "gpt-5",
+                "stance": "for",
+                "verdict": (
+                    "I recommend this. First, the evidence shows a 40% gain. However, the risk is migration cost."
+                ),
+                "tokens_used": 120,
+            },
+            {"model": "gemini-pro", "stance": "against", "verdict": "Reject: too expensive.", "tokens_used": 20},
+            {"model": "o3", "stance": "for", "verdict": "Proceed with caution."},
+        ]
+
+    def test_compare_matches_individual_votes(self, responses):
+        """Test shared scoring gives the same results as voting per strategy"""
+        voter = ConsensusVoter()
+
+        compared = voter.compare_strategies(responses)
+
+        for strategy in VotingStrategy:
+            assert compared[strategy.value].to_dict() == voter.vote(responses, strategy).to_dict()
+
+    def test_compare_batch_matches_per_scenario(self, responses):
+        """Test batch comparison slices scores back to the right scenario"""
+        voter = ConsensusVoter()
+        scenarios = [responses, responses[:1], responses[1:]]
+
+        batch = voter.compare_strategies_batch(scenarios)
+
+        assert len(batch) == 3
+        for responses_set, results in zip(scenarios, batch):
+            expected = voter.compare_strategies(responses_set)
+            assert {k: v.to_dict() for k, v in results.items()} == {k: v.to_dict() for k, v in expected.items()}
+
+    def test_compare_scores_each_response_once(self, responses, monkeypatch):
+        """Test comparing three strategies assesses each verdict a single time"""
+        calls = []
+        original = BaseVotingStrategy._assess_reasoning_quality
+        monkeypatch.setattr(
+            BaseVotingStrategy,
+            "_assess_reasoning_quality",
+            lambda self, verdict: calls.append(verdict) or original(self, verdict),
+        )
+
+        ConsensusVoter().compare_strategies(responses)
+
+        assert len(calls) == len(responses)
+
+
+class TestReasoningQuality:
+    """Test the regex-based reasoning quality scorer"""
+
+    @pytest.fixture
+    def strategy(self):
+        return ConsensusVoter().strategies[VotingStrategy.DEMOCRATIC]
+
+    def test_overlapping_indicators_each_count(self, strategy):
+        """Test an indicator nested inside another still counts, as substring checks did"""
+        # "disadvantages:" and "advantages:" are two structure indicators, plus one action and one risk;
+        # "disadvantages" alone also satisfies the balanced-analysis check
+        score = strategy._assess_reasoning_quality("Disadvantages: we recommend caution, the risk is real.")
+
+        assert score == pytest.approx(0.06 + 0.05 + 0.05 + 0.10)
+
+    def test_indicators_counted_once_each(self, strategy):
+        """Test repeated indicators do not inflate a category score"""
+        once = strategy._assess_reasoning_quality("We recommend it despite the risk and one concern.")
+        repeated = strategy._assess_reasoning_quality("RISK, risk, Risk: we Recommend it despite one concern.")
+
+        assert once == repeated == pytest.approx(0.05 + 0.10)
+
+    def test_scores_cached_across_separate_votes(self):
+        """Test voting with each strategy separately reuses the verdict scores"""
+        responses = [
+            {"model": "a", "stance": "for", "verdict": "We recommend it; the evidence is clear.", "tokens_used": 40},
+            {"model": "b", "stance": "against", "verdict": "Reject, the risk is too high.", "tokens_used": 30},
+        ]
+        voter = ConsensusVoter()
+        _score_verdict.cache_clear()
+
+        for strategy in VotingStrategy:
+            voter.vote(responses, strategy)
+
+        assert _score_verdict.cache_info().misses == len(responses)
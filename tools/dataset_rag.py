@@ -12,6 +12,7 @@ from pydantic import Field
 
 from tools.shared.base_models import ToolRequest
 from tools.simple.base import SimpleTool
+from utils.http_client import get_async_client
 
 logger = logging.getLogger(__name__)
 
@@ -146,44 +147,44 @@ Note: Failed to retrieve dataset context ({str(e)}). Please answer based on your
             Dict with vector_results, combined_context
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Query smartmemoryapi /search endpoint (Mem0-compatible)
-                response = await client.post(
-                    f"{self.smartmemory_url}/search",
-                    json={
-                        "query": query,
-                        "limit": 10,
-                        "user_id": "datasets",  # Namespace for HF datasets
-                        "categories": None  # Search all categories
+            client = get_async_client()
+            # Query smartmemoryapi /search endpoint (Mem0-compatible)
+            response = await client.post(
+                f"{self.smartmemory_url}/search",
+                json={
+                    "query": query,
+                    "limit": 10,
+                    "user_id": "datasets",  # Namespace for HF datasets
+                    "categories": None  # Search all categories
+                }
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                memories = data.get("memories", [])
+
+                # Format results for compatibility with GraphRAG format
+                vector_results = [
+                    {
+                        "content": mem.get("content", ""),
+                        "metadata": mem.get("metadata", {}),
+                        "score": mem.get("score", 0.0)
                     }
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    memories = data.get("memories", [])
-
-                    # Format results for compatibility with GraphRAG format
-                    vector_results = [
-                        {
-                            "content": mem.get("content", ""),
-                            "metadata": mem.get("metadata", {}),
-                            "score": mem.get("score", 0.0)
-                        }
-                        for mem in memories
-                    ]
-
-                    # Combine into context text
-                    combined_context = self._format_context(vector_results)
-
-                    return {
-                        "success": True,
-                        "vector_results": vector_results,
-                        "graph_paths": [],  # Empty for Phase 1, will add Memgraph in Phase 2
-                        "combined_context": combined_context
-                    }
-                else:
-                    logger.error(f"SmartMemoryAPI error: {response.status_code}")
-                    return {"success": False, "error": f"API returned {response.status_code}"}
+                    for mem in memories
+                ]
+
+                # Combine into context text
+                combined_context = self._format_context(vector_results)
+
+                return {
+                    "success": True,
+                    "vector_results": vector_results,
+                    "graph_paths": [],  # Empty for Phase 1, will add Memgraph in Phase 2
+                    "combined_context": combined_context
+                }
+            else:
+                logger.error(f"SmartMemoryAPI error: {response.status_code}")
+                return {"success": False, "error": f"API returned {response.status_code}"}
 
         except httpx.ConnectError:
             logger.error("Failed to connect to smartmemoryapi (is it running on port 8099?)")
@@ -4,8 +4,10 @@ Validates content memory against filesystem truth to prevent contamination
 Fixes TICKET-030 triple collision bug
 """
 
+import atexit
 import os
 import sys
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional
 from pydantic import Field
@@ -18,6 +20,23 @@ from .simple.base import SimpleTool
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from content_memory_validator import ContentMemoryValidator, MemoryConflict
 
+# One long-lived validator per database, so its Bloom filter, row cache, reader
+# connections and buffered audit rows carry over between tool calls
+_validators: Dict[str, ContentMemoryValidator] = {}
+_validators_lock = threading.Lock()
+
+
+def _get_validator(db_path: str) -> ContentMemoryValidator:
+    """Return the shared validator for db_path, opening it on first use and closing it at exit"""
+    with _validators_lock:
+        validator = _validators.get(db_path)
+        if validator is None:
+            validator = ContentMemoryValidator(db_path)
+            # Closing flushes buffered audit rows and runs PRAGMA optimize
+            atexit.register(validator.close)
+            _validators[db_path] = validator
+        return validator
+
 FIELD_DESCRIPTIONS = {
     "action": "Action: store, retrieve, validate, health_check, resolve_conflict",
     "identifier": "Identifier to validate (e.g., TICKET-030, ISSUE-123)",
@@ -210,7 +229,7 @@ Execute conflict resolution."""
             db_path = os.path.join(os.path.expanduser("~"), ".zen-mcp", "content_memory.db")
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-            validator = ContentMemoryValidator(db_path)
+            validator = _get_validator(db_path)
 
             # Execute based on action
             if request.action == "store":
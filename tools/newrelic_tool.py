@@ -19,9 +19,10 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
-import httpx
 from mcp.types import TextContent
 
+from utils.http_client import get_async_client
+
 from .shared.base_tool import BaseTool
 from .shared.base_models import ToolRequest
 from .models import ToolModelCategory, ToolOutput
@@ -237,10 +238,10 @@ class NewRelicTool(BaseTool):
             }
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            return json.dumps(response.json(), indent=2)
+        client = get_async_client()
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        return json.dumps(response.json(), indent=2)
 
     async def _execute_graphql_query(self, api_key: str, query: str) -> str:
         """Execute a GraphQL query against New Relic's API."""
@@ -255,10 +256,10 @@ class NewRelicTool(BaseTool):
             "query": query
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            return json.dumps(response.json(), indent=2)
+        client = get_async_client()
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        return json.dumps(response.json(), indent=2)
 
     async def _execute_rest_query(self, api_key: str, endpoint: str) -> str:
         """Execute a REST API query against New Relic's API."""
@@ -271,10 +272,10 @@ class NewRelicTool(BaseTool):
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(endpoint, headers=headers)
-            response.raise_for_status()
-            return json.dumps(response.json(), indent=2)
+        client = get_async_client()
+        response = await client.get(endpoint, headers=headers)
+        response.raise_for_status()
+        return json.dumps(response.json(), indent=2)
 
     async def _get_server_metrics(self, api_key: str, account_id: str, time_range: str, hostname: Optional[str] = None) -> str:
         """Get server performance metrics."""
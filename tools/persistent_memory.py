@@ -7,6 +7,7 @@ import os
 import json
 import time
 import sys
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 from pydantic import Field
@@ -338,8 +339,8 @@ Please specify a valid action."""
             "action": "status",
             "todo_id": request.todo_id,
             "active_executions": len(executions),
-            "executions": [execution.__dict__ for execution in executions],
-            "crash_recovery_info": recovery_info.__dict__ if recovery_info else None,
+            "executions": [asdict(execution) for execution in executions],
+            "crash_recovery_info": asdict(recovery_info) if recovery_info else None,
             "message": f"Found {len(executions)} persistent executions"
         }
 
@@ -441,7 +442,7 @@ Please specify a valid action."""
             return {
                 "success": True,
                 "action": "recovery_info",
-                "crash_recovery_info": recovery_info.__dict__,
+                "crash_recovery_info": asdict(recovery_info),
                 "message": "Crash recovery information retrieved"
             }
         else:
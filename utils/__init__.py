@@ -7,12 +7,13 @@ from .db_config import DatabaseConfig
 from .file_types import CODE_EXTENSIONS, FILE_CATEGORIES, PROGRAMMING_EXTENSIONS, TEXT_EXTENSIONS
 from .file_utils import expand_paths, read_file_content, read_files
 from .security_config import EXCLUDED_DIRS
-from .task_queue import Task, TaskQueue, TaskStatus, TaskType
+from .task_queue import AsyncTaskQueue, Task, TaskQueue, TaskStatus, TaskType
 from .token_utils import check_token_limit, estimate_tokens
 from .voting_strategies import (
     ConsensusVoter,
     DemocraticVoting,
     QualityWeightedVoting,
+    ScoredResponse,
     TokenOptimizedVoting,
     VotingResult,
     VotingStrategy,
@@ -32,12 +33,14 @@ __all__ = [
     "ZenAnalytics",
     "DatabaseConfig",
     "TaskQueue",
+    "AsyncTaskQueue",
     "Task",
     "TaskStatus",
     "TaskType",
     "ConsensusVoter",
     "DemocraticVoting",
     "QualityWeightedVoting",
+    "ScoredResponse",
     "TokenOptimizedVoting",
     "VotingResult",
     "VotingStrategy",
@@ -0,0 +1,45 @@
+"""
+Shared async HTTP client for tools that call external APIs
+
+Creating an httpx.AsyncClient per call opens a fresh TCP connection and TLS
+handshake every time. Tools use get_async_client() instead, so keep-alive
+connections are pooled across calls. The HTTP bridge closes the client on
+shutdown via close_async_client().
+"""
+
+import asyncio
+import weakref
+
+import httpx
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# One client per event loop; an entry goes away with its loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the running loop's shared AsyncClient, creating it on first use.
+
+    httpx connection pools belong to the event loop that opened them, so each
+    loop gets its own client. Clients on other loops are left alone rather
+    than replaced, so none is dropped while its loop can still close it.
+
+    Returns:
+        Shared httpx.AsyncClient with a 30s timeout and pooled connections
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the running loop's shared client, if any; other loops keep theirs"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
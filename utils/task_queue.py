@@ -7,20 +7,124 @@ task persistence across restarts, and priority-based task selection.
 
 import json
 import logging
+import queue
+import threading
 import uuid
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import psycopg2
-from psycopg2.extras import DictCursor, Json
+from psycopg2.extras import DictCursor, Json, execute_values, register_default_jsonb
 
 from utils.db_config import DatabaseConfig
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(value: Any) -> str:
+    """Serialize task data/result for a JSONB parameter, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def _jsonb(value: Any) -> Json:
+    """Adapt a dict for a JSONB parameter"""
+    return Json(value, dumps=_json_dumps)
+
+# Kept in sync with sql/task_queue.sql; applied on startup so existing databases gain them too
+_SQL_STARTUP_INDEXES = (
+    """
+    CREATE INDEX IF NOT EXISTS idx_task_pending_priority ON task_queue(priority DESC, created_at ASC)
+    WHERE status = 'pending'
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_task_pending_unassigned ON task_queue(priority DESC, created_at ASC)
+    WHERE status = 'pending' AND assigned_to IS NULL
+    """,
+)
+
+# Schema files: task_queue.sql creates the table, task_queue_counts.sql (idempotent, safe to
+# re-run) adds the trigger-maintained counters get_task_stats reads
+_SQL_DIR = Path(__file__).parent.parent / "sql"
+
+
+def _read_schema_file(name: str) -> str:
+    """Read a schema file from the sql directory"""
+    schema_file = _SQL_DIR / name
+    if not schema_file.exists():
+        logger.error(f"Schema file not found: {schema_file}")
+        raise FileNotFoundError(f"Schema file not found: {schema_file}")
+    return schema_file.read_text()
+
+
+# Seeds task_queue_counts from existing rows when it is first created on an older database
+_SQL_TASK_COUNTS_BACKFILL = """
+    INSERT INTO task_queue_counts (status, task_type, task_count, created_epoch_sum)
+    SELECT status, task_type, COUNT(*), COALESCE(SUM(EXTRACT(EPOCH FROM created_at)), 0)
+    FROM task_queue
+    GROUP BY status, task_type
+"""
+
+# Per-bucket counts plus total seconds waited (now - created_at summed over the bucket). created_at
+# is a TIMESTAMP without time zone, so created_epoch_sum holds nominal local epochs; LOCALTIMESTAMP
+# is read on the same clock, whereas NOW() is a true UTC epoch and would skew by the UTC offset
+_SQL_TASK_COUNTS = """
+    SELECT status, task_type, task_count,
+           EXTRACT(EPOCH FROM LOCALTIMESTAMP) * task_count - created_epoch_sum AS wait_seconds_sum
+    FROM task_queue_counts
+    WHERE task_count > 0
+"""
+
+# Task.from_db_row fields, in table order
+_TASK_COLUMNS = "id, task_type, status, assigned_to, priority, created_at, updated_at, completed_at, data, result"
+
+# Server-side prepared statements for the per-task hot paths. They live only as long as the
+# session, so _connect() prepares them on every connection; behind pgbouncer this needs
+# session pooling, not transaction pooling.
+_SQL_PREPARE_STATEMENTS = (
+    """
+    PREPARE tq_enqueue (varchar, varchar, varchar, integer, jsonb) AS
+    INSERT INTO task_queue (task_type, status, assigned_to, priority, data)
+    VALUES ($1, $2, $3, $4, $5)
+    RETURNING id
+    """,
+    """
+    PREPARE tq_claim (varchar, varchar, uuid, varchar) AS
+    UPDATE task_queue
+    SET status = $1, assigned_to = $2
+    WHERE id = $3 AND status = $4
+    RETURNING id
+    """,
+    """
+    PREPARE tq_update_status (varchar, jsonb, uuid) AS
+    UPDATE task_queue
+    SET status = $1, result = $2
+    WHERE id = $3
+    """,
+    """
+    PREPARE tq_complete (varchar, jsonb, uuid) AS
+    UPDATE task_queue
+    SET status = $1, result = $2, completed_at = NOW()
+    WHERE id = $3
+    """,
+    # Columns listed so an ALTER TABLE cannot change the prepared result type
+    f"""
+    PREPARE tq_get_task (uuid) AS
+    SELECT {_TASK_COLUMNS} FROM task_queue WHERE id = $1
+    """,
+)
+
+
 class TaskStatus(Enum):
     """Task status enumeration"""
     PENDING = "pending"
@@ -47,6 +151,11 @@ class TaskType(Enum):
 @dataclass
 class Task:
     """Task data structure"""
+    __slots__ = (
+        "id", "task_type", "status", "assigned_to", "priority",
+        "created_at", "updated_at", "completed_at", "data", "result",
+    )
+    
     id: str
     task_type: str
     status: str
@@ -113,17 +222,22 @@ class TaskQueue:
         self.connection_params = connection_params or DatabaseConfig.get_postgres_dsn()
         self.conn = None
         self._connect()
-        self._ensure_schema()
     
     def _connect(self):
-        """Connect to Postgres database"""
+        """Connect to Postgres, ensure the schema and prepare this session's statements"""
         try:
             self.conn = psycopg2.connect(**self.connection_params)
             self.conn.autocommit = False  # Use transactions
+            if orjson is not None:
+                # Decode JSONB columns (data, result) with orjson instead of json.loads
+                register_default_jsonb(self.conn, loads=orjson.loads)
             logger.info("Task queue connected to Postgres")
         except Exception as e:
             logger.error(f"Failed to connect to Postgres: {e}")
             raise
+        
+        self._ensure_schema()
+        self._prepare_statements()
     
     def _ensure_schema(self):
         """Ensure task_queue table exists"""
@@ -143,26 +257,47 @@ class TaskQueue:
                 if not exists:
                     logger.warning("task_queue table does not exist, creating...")
                     # Read schema from file
-                    from pathlib import Path
-                    schema_file = Path(__file__).parent.parent / "sql" / "task_queue.sql"
-                    
-                    if schema_file.exists():
-                        with open(schema_file, 'r') as f:
-                            schema_sql = f.read()
-                        cursor.execute(schema_sql)
-                        self.conn.commit()
-                        logger.info("task_queue table created successfully")
-                    else:
-                        logger.error(f"Schema file not found: {schema_file}")
-                        raise FileNotFoundError(f"Schema file not found: {schema_file}")
+                    cursor.execute(_read_schema_file("task_queue.sql"))
+                    cursor.execute(_read_schema_file("task_queue_counts.sql"))
+                    self.conn.commit()
+                    logger.info("task_queue table created successfully")
                 else:
                     logger.debug("task_queue table exists")
+                    for index_sql in _SQL_STARTUP_INDEXES:
+                        cursor.execute(index_sql)
+                    
+                    cursor.execute("SELECT to_regclass('public.task_queue_counts')")
+                    if cursor.fetchone()[0] is None:
+                        # Block writers so the backfill and the new triggers see the same rows. The
+                        # lock conflicts with itself, so a second process starting at the same time
+                        # waits here, then finds the table and skips the backfill.
+                        cursor.execute("LOCK TABLE task_queue IN SHARE ROW EXCLUSIVE MODE")
+                        cursor.execute("SELECT to_regclass('public.task_queue_counts')")
+                        if cursor.fetchone()[0] is None:
+                            logger.info("Creating task_queue_counts and backfilling from task_queue")
+                            cursor.execute(_read_schema_file("task_queue_counts.sql"))
+                            cursor.execute(_SQL_TASK_COUNTS_BACKFILL)
+                    
+                    self.conn.commit()
         
         except Exception as e:
             self.conn.rollback()
             logger.error(f"Failed to ensure schema: {e}")
             raise
     
+    def _prepare_statements(self):
+        """Prepare hot-path statements once so repeated calls skip parsing and planning"""
+        try:
+            with self.conn.cursor() as cursor:
+                for prepare_sql in _SQL_PREPARE_STATEMENTS:
+                    cursor.execute(prepare_sql)
+            self.conn.commit()
+        
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to prepare statements: {e}")
+            raise
+    
     def enqueue(
         self,
         task_type: str,
@@ -185,12 +320,8 @@ class TaskQueue:
         try:
             with self.conn.cursor() as cursor:
                 cursor.execute(
-                    """
-                    INSERT INTO task_queue (task_type, status, assigned_to, priority, data)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id
-                    """,
-                    [task_type, TaskStatus.PENDING.value, assigned_to, priority, Json(data)]
+                    "EXECUTE tq_enqueue (%s, %s, %s, %s, %s)",
+                    [task_type, TaskStatus.PENDING.value, assigned_to, priority, _jsonb(data)]
                 )
                 
                 task_id = cursor.fetchone()[0]
@@ -208,6 +339,56 @@ class TaskQueue:
             logger.error(f"Failed to enqueue task: {e}")
             raise
     
+    def enqueue_many(self, tasks: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several tasks to the queue in a single transaction.
+        
+        Args:
+            tasks: List of keyword dicts accepted by enqueue()
+                   (task_type, data, and optional assigned_to/priority/id)
+            
+        Returns:
+            Task IDs (UUIDs) in the same order as tasks
+        """
+        if not tasks:
+            return []
+        
+        # Ids are fixed client-side, so they map back to tasks without relying on RETURNING order
+        task_ids = [str(uuid.UUID(task["id"])) if task.get("id") else str(uuid.uuid4()) for task in tasks]
+        rows = [
+            (
+                task_id,
+                task["task_type"],
+                TaskStatus.PENDING.value,
+                task.get("assigned_to"),
+                task.get("priority", 5),
+                _jsonb(task["data"]),
+            )
+            for task_id, task in zip(task_ids, tasks)
+        ]
+        
+        try:
+            with self.conn.cursor() as cursor:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO task_queue (id, task_type, status, assigned_to, priority, data)
+                    VALUES %s
+                    """,
+                    rows,
+                    page_size=len(rows),
+                )
+                self.conn.commit()
+            
+            logger.info(f"Enqueued {len(task_ids)} tasks in one transaction")
+            
+            return task_ids
+        
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to enqueue tasks: {e}")
+            raise
+    
     def dequeue(self, agent_id: Optional[str] = None, limit: int = 1) -> List[Task]:
         """
         Get pending tasks from queue.
@@ -271,12 +452,7 @@ class TaskQueue:
             with self.conn.cursor() as cursor:
                 # Atomically update task to RUNNING only if it's PENDING
                 cursor.execute(
-                    """
-                    UPDATE task_queue
-                    SET status = %s, assigned_to = %s
-                    WHERE id = %s AND status = %s
-                    RETURNING id
-                    """,
+                    "EXECUTE tq_claim (%s, %s, %s, %s)",
                     [TaskStatus.RUNNING.value, agent_id, task_id, TaskStatus.PENDING.value]
                 )
                 
@@ -314,21 +490,13 @@ class TaskQueue:
                 if status in [TaskStatus.COMPLETED.value, TaskStatus.FAILED.value]:
                     # Set completed_at timestamp
                     cursor.execute(
-                        """
-                        UPDATE task_queue
-                        SET status = %s, result = %s, completed_at = NOW()
-                        WHERE id = %s
-                        """,
-                        [status, Json(result) if result else None, task_id]
+                        "EXECUTE tq_complete (%s, %s, %s)",
+                        [status, _jsonb(result) if result else None, task_id]
                     )
                 else:
                     cursor.execute(
-                        """
-                        UPDATE task_queue
-                        SET status = %s, result = %s
-                        WHERE id = %s
-                        """,
-                        [status, Json(result) if result else None, task_id]
+                        "EXECUTE tq_update_status (%s, %s, %s)",
+                        [status, _jsonb(result) if result else None, task_id]
                     )
                 
                 self.conn.commit()
@@ -351,10 +519,7 @@ class TaskQueue:
         """
         try:
             with self.conn.cursor(cursor_factory=DictCursor) as cursor:
-                cursor.execute(
-                    "SELECT * FROM task_queue WHERE id = %s",
-                    [task_id]
-                )
+                cursor.execute("EXECUTE tq_get_task (%s)", [task_id])
                 
                 row = cursor.fetchone()
                 
@@ -371,6 +536,7 @@ class TaskQueue:
         self,
         agent_id: Optional[str] = None,
         task_type: Optional[str] = None,
+        unassigned_only: bool = False,
     ) -> List[Task]:
         """
         Get all pending tasks, optionally filtered.
@@ -378,6 +544,7 @@ class TaskQueue:
         Args:
             agent_id: Optional filter by assigned agent
             task_type: Optional filter by task type
+            unassigned_only: Only return shared tasks not assigned to any agent
             
         Returns:
             List of pending Task objects
@@ -387,7 +554,9 @@ class TaskQueue:
                 query = "SELECT * FROM task_queue WHERE status = %s"
                 params = [TaskStatus.PENDING.value]
                 
-                if agent_id:
+                if unassigned_only:
+                    query += " AND assigned_to IS NULL"
+                elif agent_id:
                     query += " AND (assigned_to = %s OR assigned_to IS NULL)"
                     params.append(agent_id)
                 
@@ -453,6 +622,41 @@ class TaskQueue:
         """
         self.update_task_status(task_id, TaskStatus.CANCELLED.value)
     
+    def cancel_many(self, task_ids: List[str]) -> int:
+        """
+        Cancel several tasks in a single statement.
+        
+        Args:
+            task_ids: Task IDs to cancel
+            
+        Returns:
+            Number of tasks cancelled
+        """
+        if not task_ids:
+            return 0
+        
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE task_queue
+                    SET status = %s, result = NULL
+                    WHERE id = ANY(%s::uuid[])
+                    """,
+                    [TaskStatus.CANCELLED.value, list(task_ids)]
+                )
+                
+                cancelled = cursor.rowcount
+                self.conn.commit()
+                logger.info(f"Cancelled {cancelled} tasks")
+                
+                return cancelled
+        
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Failed to cancel tasks: {e}")
+            raise
+    
     def get_task_stats(self) -> Dict[str, Any]:
         """
         Get task queue statistics.
@@ -462,39 +666,28 @@ class TaskQueue:
         """
         try:
             with self.conn.cursor(cursor_factory=DictCursor) as cursor:
-                # Count by status
-                cursor.execute("""
-                    SELECT status, COUNT(*) as count
-                    FROM task_queue
-                    GROUP BY status
-                """)
-                
-                status_counts = {row["status"]: row["count"] for row in cursor.fetchall()}
-                
-                # Count by type
-                cursor.execute("""
-                    SELECT task_type, COUNT(*) as count
-                    FROM task_queue
-                    WHERE status = %s
-                    GROUP BY task_type
-                """, [TaskStatus.PENDING.value])
+                # Counters are maintained by triggers, so this reads one row per (status, type)
+                cursor.execute(_SQL_TASK_COUNTS)
                 
-                type_counts = {row["task_type"]: row["count"] for row in cursor.fetchall()}
+                status_counts: Dict[str, int] = {}
+                type_counts: Dict[str, int] = {}
+                pending_wait_sum = 0.0
                 
-                # Average wait time for pending tasks
-                cursor.execute("""
-                    SELECT AVG(EXTRACT(EPOCH FROM (NOW() - created_at))) as avg_wait_seconds
-                    FROM task_queue
-                    WHERE status = %s
-                """, [TaskStatus.PENDING.value])
+                for row in cursor.fetchall():
+                    status_counts[row["status"]] = status_counts.get(row["status"], 0) + row["task_count"]
+                    
+                    if row["status"] == TaskStatus.PENDING.value:
+                        type_counts[row["task_type"]] = row["task_count"]
+                        pending_wait_sum += float(row["wait_seconds_sum"])
                 
-                avg_wait = cursor.fetchone()["avg_wait_seconds"]
+                total_pending = status_counts.get(TaskStatus.PENDING.value, 0)
+                avg_wait = pending_wait_sum / total_pending if total_pending else 0.0
                 
                 return {
                     "status_counts": status_counts,
                     "type_counts": type_counts,
-                    "avg_wait_seconds": float(avg_wait) if avg_wait else 0.0,
-                    "total_pending": status_counts.get(TaskStatus.PENDING.value, 0),
+                    "avg_wait_seconds": avg_wait,
+                    "total_pending": total_pending,
                     "total_running": status_counts.get(TaskStatus.RUNNING.value, 0),
                     "total_completed": status_counts.get(TaskStatus.COMPLETED.value, 0),
                     "total_failed": status_counts.get(TaskStatus.FAILED.value, 0),
@@ -552,3 +745,94 @@ class TaskQueue:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+
+class AsyncTaskQueue:
+    """
+    Pipelined enqueue on top of TaskQueue.
+    
+    enqueue() hands the task to a background writer thread and returns a Future
+    immediately. The writer drains pending enqueues in batches of up to MAX_BATCH
+    and commits each batch with a single enqueue_many() transaction, resolving
+    the futures with the task IDs once the batch is durable.
+    """
+    
+    MAX_BATCH = 32
+    
+    def __init__(self, connection_params: Optional[Dict] = None, task_queue: Optional[TaskQueue] = None):
+        """
+        Initialize the async task queue.
+        
+        Args:
+            connection_params: Optional Postgres connection parameters for a new TaskQueue
+            task_queue: Optional existing TaskQueue for the writer thread to own
+        """
+        self.queue = task_queue or TaskQueue(connection_params)
+        self._ops: "queue.SimpleQueue[Optional[tuple]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="task-queue-writer", daemon=True)
+        self._writer.start()
+    
+    def enqueue(
+        self,
+        task_type: str,
+        data: Dict[str, Any],
+        assigned_to: Optional[str] = None,
+        priority: int = 5,
+    ) -> "Future[str]":
+        """
+        Submit a task to the writer thread.
+        
+        Returns:
+            Future resolving to the task ID once the task is committed
+        """
+        future: "Future[str]" = Future()
+        task = {
+            "id": uuid.uuid4().hex,
+            "task_type": task_type,
+            "data": data,
+            "assigned_to": assigned_to,
+            "priority": priority,
+        }
+        self._ops.put((task, future))
+        return future
+    
+    def _write_loop(self):
+        """Drain submitted enqueues into batched transactions until closed"""
+        stopping = False
+        
+        while not stopping:
+            op = self._ops.get()
+            if op is None:
+                break
+            
+            batch = [op]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    op = self._ops.get_nowait()
+                except queue.Empty:
+                    break
+                if op is None:
+                    stopping = True
+                    break
+                batch.append(op)
+            
+            try:
+                task_ids = self.queue.enqueue_many([task for task, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), task_id in zip(batch, task_ids):
+                    future.set_result(task_id)
+    
+    def close(self):
+        """Flush pending enqueues, stop the writer and close the connection"""
+        if self._writer.is_alive():
+            self._ops.put(None)
+            self._writer.join()
+        self.queue.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
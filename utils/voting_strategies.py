@@ -9,6 +9,7 @@ Provides multiple voting strategies to determine the final decision from multipl
 Voting results are logged to analytics for comparison and optimization.
 """
 
+import functools
 import logging
 import re
 from abc import ABC, abstractmethod
@@ -19,6 +20,100 @@ from typing import Any, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 
+# Reasoning-quality indicators by category (matched as lowercase substrings)
+_QUALITY_INDICATOR_GROUPS = {
+    "structure": (
+        "first", "second", "third",  # Numbered points
+        "however", "therefore", "consequently",  # Logical connectors
+        "because", "since", "as a result",  # Causal reasoning
+        "pros:", "cons:", "advantages:", "disadvantages:",  # Structured analysis
+    ),
+    "evidence": (
+        "data shows", "research indicates", "studies suggest",
+        "evidence", "according to", "measured", "tested",
+        "example", "case study", "benchmark",
+    ),
+    "risk": (
+        "risk", "potential issue", "concern", "caveat",
+        "trade-off", "downside", "limitation", "challenge",
+    ),
+    "action": (
+        "recommend", "suggest", "should", "propose",
+        "next steps", "action items", "implementation",
+    ),
+    "specificity": ("specifically", "precisely", "exactly"),
+}
+
+# (points per distinct indicator, category cap); specificity is scored with its numeric patterns
+_QUALITY_CATEGORY_LIMITS = {
+    "structure": (0.03, 0.15),
+    "evidence": (0.05, 0.20),
+    "risk": (0.05, 0.15),
+    "action": (0.05, 0.15),
+}
+
+_QUALITY_INDICATORS = {
+    indicator: category for category, indicators in _QUALITY_INDICATOR_GROUPS.items() for indicator in indicators
+}
+
+# Zero-width lookahead so overlapping indicators ("advantages:" inside "disadvantages:") all match
+_QUALITY_PATTERN = re.compile(
+    "(?=(%s))" % "|".join(re.escape(indicator) for indicator in sorted(_QUALITY_INDICATORS, key=len, reverse=True))
+)
+
+_SPECIFICITY_PATTERNS = (
+    re.compile(r"\d+%"),
+    re.compile(r"\d+ (days|weeks|months)"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _score_verdict(verdict: str) -> float:
+    """
+    Assess the quality of reasoning in a verdict.
+    
+    Returns a score from 0.0 to 1.0 based on various quality indicators.
+    Cached by verdict text: the same response is often scored by several strategies.
+    """
+    if not verdict:
+        return 0.1
+    
+    verdict_lower = verdict.lower()
+    quality_score = 0.0
+    
+    # 1. Length factor (but with diminishing returns)
+    word_count = len(verdict.split())
+    if word_count >= 200:
+        quality_score += 0.15
+    elif word_count >= 100:
+        quality_score += 0.10
+    elif word_count >= 50:
+        quality_score += 0.05
+    
+    # Distinct indicators present per category, found in one regex pass
+    found: Dict[str, set] = {category: set() for category in _QUALITY_INDICATOR_GROUPS}
+    for indicator in _QUALITY_PATTERN.findall(verdict_lower):
+        found[_QUALITY_INDICATORS[indicator]].add(indicator)
+    
+    # 2-5. Structure, evidence, risk analysis and actionable recommendations
+    for category, (weight, cap) in _QUALITY_CATEGORY_LIMITS.items():
+        quality_score += min(cap, len(found[category]) * weight)
+    
+    # 6. Specificity indicators, including numeric specifics
+    specificity_count = len(found["specificity"]) + sum(
+        1 for pattern in _SPECIFICITY_PATTERNS if pattern.search(verdict)
+    )
+    quality_score += min(0.10, specificity_count * 0.03)
+    
+    # 7. Balanced analysis indicator
+    if ("pros" in verdict_lower or "advantages" in verdict_lower) and \
+       ("cons" in verdict_lower or "disadvantages" in verdict_lower):
+        quality_score += 0.10
+    
+    # Normalize to 0.0 - 1.0 range
+    return min(1.0, max(0.1, quality_score))
+
+
 class VotingStrategy(Enum):
     """Voting strategy enumeration"""
     DEMOCRATIC = "democratic"
@@ -48,22 +143,61 @@ class VotingResult:
         }
 
 
+@dataclass
+class ScoredResponse:
+    """Per-response features shared by all voting strategies"""
+    model: str
+    decision: str
+    quality: float
+    tokens: int
+
+
 class BaseVotingStrategy(ABC):
     """Base class for voting strategies"""
     
     @abstractmethod
-    def vote(self, model_responses: List[Dict[str, Any]]) -> VotingResult:
+    def vote(
+        self,
+        model_responses: List[Dict[str, Any]],
+        scored: Optional[List[ScoredResponse]] = None,
+    ) -> VotingResult:
         """
         Determine the winning decision from model responses.
         
         Args:
             model_responses: List of model response dictionaries
+            scored: Optional precomputed score_responses() output for model_responses
             
         Returns:
             VotingResult with winning decision and metadata
         """
         pass
     
+    def score_responses(self, model_responses: List[Dict[str, Any]]) -> List[ScoredResponse]:
+        """
+        Extract decision, reasoning quality and token cost for each response in one pass.
+        
+        Strategies share this so comparing them scores every verdict once.
+        """
+        scored = []
+        
+        for response in model_responses:
+            verdict = response.get("verdict", "")
+            
+            # Estimate tokens (rough approximation: 1 token ≈ 0.75 words)
+            tokens = response.get("tokens_used")
+            if tokens is None:
+                tokens = int(len(verdict.split()) / 0.75)
+            
+            scored.append(ScoredResponse(
+                model=response.get("model", "unknown"),
+                decision=self._extract_decision(response),
+                quality=self._assess_reasoning_quality(verdict),
+                tokens=tokens,
+            ))
+        
+        return scored
+    
     def _extract_decision(self, response: Dict[str, Any]) -> str:
         """
         Extract the decision from a model response.
@@ -101,75 +235,7 @@ class BaseVotingStrategy(ABC):
         
         Returns a score from 0.0 to 1.0 based on various quality indicators.
         """
-        if not verdict:
-            return 0.1
-        
-        quality_score = 0.0
-        
-        # 1. Length factor (but with diminishing returns)
-        word_count = len(verdict.split())
-        if word_count >= 200:
-            quality_score += 0.15
-        elif word_count >= 100:
-            quality_score += 0.10
-        elif word_count >= 50:
-            quality_score += 0.05
-        
-        # 2. Structure indicators
-        structure_indicators = [
-            "first", "second", "third",  # Numbered points
-            "however", "therefore", "consequently",  # Logical connectors
-            "because", "since", "as a result",  # Causal reasoning
-            "pros:", "cons:", "advantages:", "disadvantages:",  # Structured analysis
-        ]
-        structure_count = sum(1 for indicator in structure_indicators if indicator.lower() in verdict.lower())
-        quality_score += min(0.15, structure_count * 0.03)
-        
-        # 3. Evidence indicators
-        evidence_indicators = [
-            "data shows", "research indicates", "studies suggest",
-            "evidence", "according to", "measured", "tested",
-            "example", "case study", "benchmark",
-        ]
-        evidence_count = sum(1 for indicator in evidence_indicators if indicator.lower() in verdict.lower())
-        quality_score += min(0.20, evidence_count * 0.05)
-        
-        # 4. Risk analysis indicators
-        risk_indicators = [
-            "risk", "potential issue", "concern", "caveat",
-            "trade-off", "downside", "limitation", "challenge",
-        ]
-        risk_count = sum(1 for indicator in risk_indicators if indicator.lower() in verdict.lower())
-        quality_score += min(0.15, risk_count * 0.05)
-        
-        # 5. Actionable recommendations
-        action_indicators = [
-            "recommend", "suggest", "should", "propose",
-            "next steps", "action items", "implementation",
-        ]
-        action_count = sum(1 for indicator in action_indicators if indicator.lower() in verdict.lower())
-        quality_score += min(0.15, action_count * 0.05)
-        
-        # 6. Specificity indicators
-        specificity_indicators = [
-            "specifically", "precisely", "exactly",
-            r"\d+%", r"\d+ (days|weeks|months)",  # Numeric specifics
-            r"\$\d+",  # Cost specifics
-        ]
-        specificity_count = sum(
-            1 for indicator in specificity_indicators
-            if (indicator.startswith(r"\d") and re.search(indicator, verdict))
-            or indicator.lower() in verdict.lower()
-        )
-        quality_score += min(0.10, specificity_count * 0.03)
-        
-        # 7. Balanced analysis indicator
-        if ("pros" in verdict.lower() or "advantages" in verdict.lower()) and \
-           ("cons" in verdict.lower() or "disadvantages" in verdict.lower()):
-            quality_score += 0.10
-        
-        # Normalize to 0.0 - 1.0 range
-        return min(1.0, max(0.1, quality_score))
+        return _score_verdict(verdict)
 
 
 class DemocraticVoting(BaseVotingStrategy):
@@ -179,7 +245,11 @@ class DemocraticVoting(BaseVotingStrategy):
     Simple majority wins. If tie, defaults to "conditional".
     """
     
-    def vote(self, model_responses: List[Dict[str, Any]]) -> VotingResult:
+    def vote(
+        self,
+        model_responses: List[Dict[str, Any]],
+        scored: Optional[List[ScoredResponse]] = None,
+    ) -> VotingResult:
         """Implement democratic voting"""
         if not model_responses:
             return VotingResult(
@@ -195,9 +265,9 @@ class DemocraticVoting(BaseVotingStrategy):
         votes: Dict[str, int] = {}
         decision_models: Dict[str, List[str]] = {}
         
-        for response in model_responses:
-            decision = self._extract_decision(response)
-            model_name = response.get("model", "unknown")
+        for response in scored or self.score_responses(model_responses):
+            decision = response.decision
+            model_name = response.model
             
             votes[decision] = votes.get(decision, 0) + 1
             
@@ -267,7 +337,11 @@ class QualityWeightedVoting(BaseVotingStrategy):
     - Specificity
     """
     
-    def vote(self, model_responses: List[Dict[str, Any]]) -> VotingResult:
+    def vote(
+        self,
+        model_responses: List[Dict[str, Any]],
+        scored: Optional[List[ScoredResponse]] = None,
+    ) -> VotingResult:
         """Implement quality-weighted voting"""
         if not model_responses:
             return VotingResult(
@@ -286,13 +360,10 @@ class QualityWeightedVoting(BaseVotingStrategy):
         
         total_quality = 0.0
         
-        for response in model_responses:
-            decision = self._extract_decision(response)
-            model_name = response.get("model", "unknown")
-            verdict = response.get("verdict", "")
-            
-            # Assess quality
-            quality = self._assess_reasoning_quality(verdict)
+        for response in scored or self.score_responses(model_responses):
+            decision = response.decision
+            model_name = response.model
+            quality = response.quality
             total_quality += quality
             
             # Weight vote by quality
@@ -368,7 +439,11 @@ class TokenOptimizedVoting(BaseVotingStrategy):
     Higher score = better value (more quality per 1K tokens)
     """
     
-    def vote(self, model_responses: List[Dict[str, Any]]) -> VotingResult:
+    def vote(
+        self,
+        model_responses: List[Dict[str, Any]],
+        scored: Optional[List[ScoredResponse]] = None,
+    ) -> VotingResult:
         """Implement token-optimized voting"""
         if not model_responses:
             return VotingResult(
@@ -387,23 +462,13 @@ class TokenOptimizedVoting(BaseVotingStrategy):
         
         total_efficiency = 0.0
         
-        for response in model_responses:
-            decision = self._extract_decision(response)
-            model_name = response.get("model", "unknown")
-            verdict = response.get("verdict", "")
-            
-            # Assess quality
-            quality = self._assess_reasoning_quality(verdict)
-            
-            # Estimate tokens (rough approximation: 1 token ≈ 0.75 words)
-            tokens = response.get("tokens_used")
-            if tokens is None:
-                # Estimate from verdict length
-                word_count = len(verdict.split())
-                tokens = int(word_count / 0.75)
+        for response in scored or self.score_responses(model_responses):
+            decision = response.decision
+            model_name = response.model
+            quality = response.quality
             
             # Avoid division by zero
-            tokens = max(tokens, 10)
+            tokens = max(response.tokens, 10)
             
             # Calculate efficiency: quality per 1K tokens
             efficiency = quality / (tokens / 1000)
@@ -506,7 +571,8 @@ class ConsensusVoter:
     def vote(
         self,
         model_responses: List[Dict[str, Any]],
-        strategy: VotingStrategy = VotingStrategy.DEMOCRATIC
+        strategy: VotingStrategy = VotingStrategy.DEMOCRATIC,
+        scored: Optional[List[ScoredResponse]] = None,
     ) -> VotingResult:
         """
         Apply a voting strategy to determine the consensus decision.
@@ -514,6 +580,7 @@ class ConsensusVoter:
         Args:
             model_responses: List of model response dictionaries
             strategy: Voting strategy to use
+            scored: Optional precomputed per-response scores
             
         Returns:
             VotingResult with winning decision and metadata
@@ -522,7 +589,7 @@ class ConsensusVoter:
             logger.warning(f"Unknown strategy {strategy}, defaulting to democratic")
             strategy = VotingStrategy.DEMOCRATIC
         
-        result = self.strategies[strategy].vote(model_responses)
+        result = self.strategies[strategy].vote(model_responses, scored)
         
         # Log to analytics if available
         if self.analytics:
@@ -548,8 +615,11 @@ class ConsensusVoter:
         """
         results = {}
         
+        # Score each response once and share it across strategies
+        scored = self.strategies[VotingStrategy.DEMOCRATIC].score_responses(model_responses)
+        
         for strategy in VotingStrategy:
-            results[strategy.value] = self.vote(model_responses, strategy)
+            results[strategy.value] = self.vote(model_responses, strategy, scored)
         
         # Log comparison if analytics available
         if self.analytics:
@@ -560,6 +630,47 @@ class ConsensusVoter:
         
         return results
     
+    def compare_strategies_batch(
+        self,
+        scenarios: List[List[Dict[str, Any]]]
+    ) -> List[Dict[str, VotingResult]]:
+        """
+        Compare all voting strategies for several independent sets of responses.
+        
+        Every response across all scenarios is scored in a single pass; the scores
+        are then sliced back per scenario and shared by all strategies.
+        
+        Args:
+            scenarios: List of model response lists, one per decision
+            
+        Returns:
+            List of compare_strategies() results, in scenario order
+        """
+        flat = [response for responses in scenarios for response in responses]
+        scored = self.strategies[VotingStrategy.DEMOCRATIC].score_responses(flat)
+        
+        batch_results = []
+        offset = 0
+        
+        for responses in scenarios:
+            scenario_scored = scored[offset:offset + len(responses)]
+            offset += len(responses)
+            
+            results = {
+                strategy.value: self.vote(responses, strategy, scenario_scored)
+                for strategy in VotingStrategy
+            }
+            
+            if self.analytics:
+                try:
+                    self._log_strategy_comparison(results, responses)
+                except Exception as e:
+                    logger.warning(f"Failed to log strategy comparison: {e}")
+            
+            batch_results.append(results)
+        
+        return batch_results
+    
     def _log_to_analytics(self, result: VotingResult, model_responses: List[Dict[str, Any]]):
         """Log voting result to analytics"""
         if not self.analytics: